@@ -1,18 +1,23 @@
+import asyncio
 import json
 import logging
 
+from pydantic import ValidationError
+
 from app.agents.memory_agent import MemoryAgent
+from app.core.budget import BudgetExceeded
 from app.core.llm_provider import llm_provider
 from app.config.settings import settings
 from app.models.analysis_models import AnalysisResult
+from app.models.research_models import CollectedDataItem
 from app.agents.utils import extract_json_from_response
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
 class AnalysisAgent:
     def __init__(self):
-        self.model = llm_provider.get_model(settings.models.analysis_agent)
+        self.model = llm_provider.get_model(settings.models.analysis_agent, agent_name="analysis_agent")
         self.memory = MemoryAgent(agent_id="analysis_agent")
 
     async def classify_evidence(self, text: str, source_identifier: str) -> AnalysisResult:
@@ -26,6 +31,9 @@ class AnalysisAgent:
 
         Returns:
             AnalysisResult: Um objeto Pydantic contendo os dados da análise.
+
+        Raises:
+            BudgetExceeded: Se o orçamento de LLM da execução corrente estiver esgotado.
         """
         # Usa o source_identifier como chave de cache, que é mais estável e eficiente.
         recalled_data_str = await self.memory.recall(key=source_identifier)
@@ -49,6 +57,8 @@ class AnalysisAgent:
             await self.memory.remember(key=source_identifier, value=classification_data.model_dump_json())
 
             return classification_data
+        except BudgetExceeded:
+            raise
         except ValueError as e: # Captura o erro do extract_json_from_response
             logger.error(
                 f"Falha ao extrair JSON da resposta do LLM para a fonte '{source_identifier}': {e}",
@@ -58,3 +68,145 @@ class AnalysisAgent:
         except Exception as e:
             logger.error(f"Erro inesperado durante a classificação para a fonte '{source_identifier}': {e}", exc_info=True)
             return AnalysisResult(summary="Ocorreu um erro inesperado.", evidence_level="E", justification=f"Erro inesperado: {str(e)}", keywords=[])
+
+    async def classify_evidence_batch(self, items: List[CollectedDataItem]) -> List[Optional[AnalysisResult]]:
+        """
+        Classifica várias fontes agrupando-as em poucos prompts, limitados por um orçamento de tokens.
+
+        Fontes já presentes na memória não são reenviadas ao LLM. Cada lote é analisado
+        em uma única chamada e os resultados são associados pelo `source_identifier`;
+        itens ausentes ou inválidos na resposta do lote são reclassificados individualmente
+        com `classify_evidence`.
+
+        Quando o orçamento de LLM da execução (`app.core.budget`) se esgota, as fontes
+        ainda não classificadas ficam sem resultado (None) em vez de interromper o lote.
+
+        Args:
+            items (List[CollectedDataItem]): As fontes a classificar.
+
+        Returns:
+            List[Optional[AnalysisResult]]: Os resultados, na mesma ordem de `items`;
+            None para fontes não classificadas por falta de orçamento.
+        """
+        results: Dict[str, AnalysisResult] = {}
+
+        recalled = await self.memory.recall_many([item.source_identifier for item in items])
+        pending: List[CollectedDataItem] = []
+        pending_ids = set()
+        for item in items:
+            cached = self._parse_recalled(item.source_identifier, recalled.get(item.source_identifier))
+            if cached is not None:
+                results[item.source_identifier] = cached
+            elif item.source_identifier not in pending_ids:
+                pending_ids.add(item.source_identifier)
+                pending.append(item)
+
+        batches = self._pack_batches(pending)
+        batch_results = await asyncio.gather(*(self._classify_batch(batch) for batch in batches), return_exceptions=True)
+        fallback: List[CollectedDataItem] = []
+        skipped = 0
+        for batch, parsed in zip(batches, batch_results):
+            if isinstance(parsed, BudgetExceeded):
+                skipped += len(batch)
+                continue
+            if isinstance(parsed, BaseException):
+                raise parsed
+            for item in batch:
+                if item.source_identifier in parsed:
+                    results[item.source_identifier] = parsed[item.source_identifier]
+                else:
+                    fallback.append(item)
+
+        if fallback:
+            logger.info(f"{len(fallback)} fontes serão reclassificadas individualmente após falha no lote.")
+            single_results = await asyncio.gather(
+                *(self.classify_evidence(text=item.content, source_identifier=item.source_identifier) for item in fallback),
+                return_exceptions=True,
+            )
+            for item, result in zip(fallback, single_results):
+                if isinstance(result, BudgetExceeded):
+                    skipped += 1
+                    continue
+                if isinstance(result, BaseException):
+                    raise result
+                results[item.source_identifier] = result
+
+        if skipped:
+            logger.warning(f"Orçamento de LLM esgotado: {skipped} fontes ficaram sem análise.")
+        return [results.get(item.source_identifier) for item in items]
+
+    def _parse_recalled(self, source_identifier: str, recalled_data_str: Optional[str]) -> Optional[AnalysisResult]:
+        if not recalled_data_str:
+            return None
+        try:
+            logger.info(f"Análise para a fonte '{source_identifier}' recuperada da memória.")
+            return AnalysisResult(**json.loads(recalled_data_str))
+        except (json.JSONDecodeError, ValidationError):
+            logger.warning(f"Falha ao decodificar memória para a fonte '{source_identifier}'. Reanalisando.")
+            return None
+
+    def _pack_batches(self, items: List[CollectedDataItem]) -> List[List[CollectedDataItem]]:
+        """Agrupa os itens em lotes cujo tamanho estimado (~4 caracteres por token) cabe no orçamento."""
+        if not settings.analysis.batch_enabled:
+            return [[item] for item in items]
+
+        budget = settings.analysis.batch_token_budget
+        batches: List[List[CollectedDataItem]] = []
+        current: List[CollectedDataItem] = []
+        current_tokens = 0
+        for item in items:
+            item_tokens = len(item.content) // 4 + 1
+            if current and (current_tokens + item_tokens > budget or len(current) >= settings.analysis.max_batch_size):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += item_tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _classify_batch(self, batch: List[CollectedDataItem]) -> Dict[str, AnalysisResult]:
+        """
+        Classifica um lote em uma única chamada ao LLM.
+
+        Returns:
+            Dict[str, AnalysisResult]: Os resultados válidos, indexados por `source_identifier`.
+            Itens ausentes devem ser reprocessados pelo chamador.
+        """
+        if len(batch) == 1:
+            item = batch[0]
+            return {item.source_identifier: await self.classify_evidence(text=item.content, source_identifier=item.source_identifier)}
+
+        from app.prompts.llm_prompts import ANALYSIS_AGENT_BATCH_PROMPT, ANALYSIS_BATCH_DOCUMENT_TEMPLATE
+        documents = "\n".join(
+            ANALYSIS_BATCH_DOCUMENT_TEMPLATE.format(source_identifier=item.source_identifier, text=item.content)
+            for item in batch
+        )
+        prompt = ANALYSIS_AGENT_BATCH_PROMPT.format(documents=documents)
+        expected_ids = {item.source_identifier for item in batch}
+
+        try:
+            response = await self.model.generate_content_async(prompt)
+            raw_results = extract_json_from_response(response.text).get("results", [])
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"Falha na classificação em lote de {len(batch)} fontes: {e}", exc_info=True)
+            return {}
+
+        parsed: Dict[str, AnalysisResult] = {}
+        for raw in raw_results if isinstance(raw_results, list) else []:
+            if not isinstance(raw, dict):
+                continue
+            source_identifier = raw.pop("source_identifier", None)
+            if source_identifier not in expected_ids:
+                continue
+            try:
+                parsed[source_identifier] = AnalysisResult(**raw)
+            except (ValidationError, TypeError) as e:
+                logger.warning(f"Resultado em lote inválido para a fonte '{source_identifier}': {e}")
+
+        await asyncio.gather(
+            *(self.memory.remember(key=source_identifier, value=result.model_dump_json()) for source_identifier, result in parsed.items())
+        )
+        return parsed
@@ -16,7 +16,7 @@ class ClaimExtractionAgent:
     """
 
     def __init__(self):
-        self.model = llm_provider.get_model(settings.models.claim_extraction_agent)
+        self.model = llm_provider.get_model(settings.models.claim_extraction_agent, agent_name="claim_extraction_agent")
 
     async def extract_claims(self, text: str) -> List[Claim]: # Alterar tipo de retorno
         """
@@ -1,10 +1,14 @@
 import asyncio
 import logging
-from typing import List, Dict, Any, Coroutine
+from typing import List, Dict, Any, Coroutine, AsyncIterator, Awaitable, Callable, Optional
 
+from app.config.settings import settings
+from app.core.budget import current_budget
+from app.core.ranking import reciprocal_rank_fusion
+from app.core.source_dedup import SourceDeduplicator, canonical_key
 from app.models.research_models import CollectedDataItem
-from app.tools.brave_search import BraveSearchTool
-from app.tools.pubmed_search import PubMedSearchTool
+from app.tools.brave_search import BRAVE_KEYWORDS, BraveSearchTool
+from app.tools.pubmed_search import PUBMED_KEYWORDS, PubMedSearchTool
 from app.agents.routing_agent import RoutingAgent
 
 logger = logging.getLogger(__name__)
@@ -23,8 +27,8 @@ class DataCollectionAgent:
         }
         # Descrições das ferramentas para o RoutingAgent
         tool_descriptions = [
-            {"name": "brave_search", "description": "Uma ferramenta de busca geral para responder a uma ampla variedade de perguntas. Use para notícias, eventos atuais, informações gerais, etc."},
-            {"name": "pubmed_search", "description": "Uma ferramenta de busca especializada para encontrar pesquisas biomédicas e artigos científicos no campo da medicina e ciências da vida. Use para perguntas sobre condições médicas, tratamentos, biologia, etc."},
+            {"name": "brave_search", "description": "Uma ferramenta de busca geral para responder a uma ampla variedade de perguntas. Use para notícias, eventos atuais, informações gerais, etc.", "keywords": BRAVE_KEYWORDS},
+            {"name": "pubmed_search", "description": "Uma ferramenta de busca especializada para encontrar pesquisas biomédicas e artigos científicos no campo da medicina e ciências da vida. Use para perguntas sobre condições médicas, tratamentos, biologia, etc.", "keywords": PUBMED_KEYWORDS},
         ]
         self.routing_agent = RoutingAgent(tools=tool_descriptions)
 
@@ -43,28 +47,188 @@ class DataCollectionAgent:
             logger.warning("Plano de pesquisa inválido ou vazio. Nenhum dado será coletado.")
             return []
 
-        # Cria uma tarefa de busca para cada pergunta no plano
-        tasks: List[Coroutine] = [
-            self._route_and_search(question["query"])
-            for question in research_plan["research_questions"]
-        ]
+        # Cria uma tarefa de busca para cada pergunta que cabe no orçamento da execução
+        queries = self._budgeted_queries(research_plan)
+        tasks: List[Coroutine] = [self._search(query) for query in queries]
 
         search_results_list = await asyncio.gather(*tasks)
 
-        # Achatando a lista de listas de resultados
-        flat_results = [item for sublist in search_results_list for item in sublist]
+        # Achatando a lista de listas de resultados e unindo fontes repetidas entre as perguntas
+        deduplicator = self._new_deduplicator()
+        for query, results in zip(queries, search_results_list):
+            for item in self._to_collected_items(results, query):
+                deduplicator.add(item)
+        collected_data = deduplicator.items
+
+        logger.info(
+            f"{len(collected_data)} itens de dados coletados de {len(tasks)} consultas "
+            f"({deduplicator.duplicates} duplicatas removidas)."
+        )
+        return collected_data
+
+    async def iter_collected_data(
+        self,
+        research_plan: Dict[str, Any],
+        completed_searches: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        on_search: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[None]]] = None,
+    ) -> AsyncIterator[CollectedDataItem]:
+        """
+        Versão em streaming de `collect_data`: dispara todas as buscas do plano em paralelo
+        e produz os itens de cada busca assim que ela termina, sem esperar pelas demais.
+
+        Args:
+            research_plan (Dict[str, Any]): O plano de pesquisa gerado pelo PlanningAgent.
+            completed_searches (Optional[Dict[str, List[Dict[str, Any]]]]): Resultados de buscas
+                já concluídas (por consulta), reaproveitados sem nova busca nem gasto de orçamento.
+            on_search (Optional[Callable]): Chamado com a consulta e seus resultados assim que
+                uma nova busca com resultados termina, para que possa ser salva em checkpoint.
+
+        Yields:
+            CollectedDataItem: Cada item coletado, na ordem de conclusão das buscas.
+        """
+        if not research_plan or "research_questions" not in research_plan:
+            logger.warning("Plano de pesquisa inválido ou vazio. Nenhum dado será coletado.")
+            return
+
+        completed_searches = completed_searches or {}
+
+        async def search(query: str):
+            if query in completed_searches:
+                return query, completed_searches[query]
+            results = await self._search(query)
+            # Buscas vazias (inclusive as que falharam) não são salvas e serão refeitas ao retomar.
+            if results and on_search is not None:
+                await on_search(query, results)
+            return query, results
+
+        questions = research_plan["research_questions"]
+        replayed = [question["query"] for question in questions if question["query"] in completed_searches]
+        pending_plan = {
+            **research_plan,
+            "research_questions": [question for question in questions if question["query"] not in completed_searches],
+        }
+        if replayed:
+            logger.info(f"{len(replayed)} buscas já concluídas recuperadas do checkpoint.")
+
+        queries = replayed + self._budgeted_queries(pending_plan)
+        tasks = [asyncio.ensure_future(search(query)) for query in queries]
+        deduplicator = self._new_deduplicator()
+        total = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                query, results = await finished
+                for item in self._to_collected_items(results, query):
+                    # Fontes já produzidas apenas acumulam a pergunta; não são reenviadas à análise.
+                    if deduplicator.add(item) is not None:
+                        total += 1
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+        logger.info(
+            f"{total} itens de dados coletados em streaming de {len(tasks)} consultas "
+            f"({deduplicator.duplicates} duplicatas removidas)."
+        )
+
+    def _budgeted_queries(self, research_plan: Dict[str, Any]) -> List[str]:
+        """
+        Retorna as consultas do plano que cabem no orçamento de buscas da execução corrente.
+
+        As perguntas são consideradas na ordem do PlanningAgent, que é a ordem de
+        prioridade: as buscas são reservadas antes de qualquer tarefa ser criada, de modo
+        que, com o orçamento esgotado, são as últimas perguntas do plano que ficam de fora.
+        """
+        queries = [question["query"] for question in research_plan["research_questions"]]
+        budget = current_budget.get()
+        if budget is None:
+            return queries
+
+        # No modo fan_out cada pergunta consulta todas as ferramentas.
+        cost = len(self.tools) if settings.research.search_mode == "fan_out" else 1
+        allowed = []
+        for query in queries:
+            if not budget.try_spend_searches(cost):
+                break
+            allowed.append(query)
+        if len(allowed) < len(queries):
+            logger.warning(
+                f"Orçamento de buscas esgotado ({budget.searches}/{budget.max_searches}): "
+                f"{len(queries) - len(allowed)} de {len(queries)} perguntas do plano não serão pesquisadas."
+            )
+        return allowed
 
-        # Converte os resultados brutos para o formato CollectedDataItem
-        collected_data = [
+    @staticmethod
+    def _to_collected_items(results: List[Dict[str, Any]], query: str) -> List[CollectedDataItem]:
+        """Converte os resultados brutos das ferramentas para o formato CollectedDataItem."""
+        return [
             CollectedDataItem(
                 source_identifier=result.get("url") or result.get("title", "N/A"),
                 content=result.get("content") or result.get("snippet", ""),
+                questions=[query],
             )
-            for result in flat_results
+            for result in results
         ]
 
-        logger.info(f"{len(collected_data)} itens de dados coletados de {len(tasks)} consultas.")
-        return collected_data
+    @staticmethod
+    def _new_deduplicator() -> SourceDeduplicator:
+        dedup_settings = settings.source_dedup
+        return SourceDeduplicator(
+            near_duplicates=dedup_settings.near_duplicates,
+            similarity_threshold=dedup_settings.similarity_threshold,
+            num_perm=dedup_settings.minhash_permutations,
+            min_content_chars=dedup_settings.min_content_chars,
+        )
+
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
+        """Busca a consulta no modo configurado em `settings.research.search_mode`."""
+        if settings.research.search_mode == "fan_out":
+            return await self._fan_out_search(query)
+        return await self._route_and_search(query)
+
+    async def _fan_out_search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Consulta todas as ferramentas em paralelo e funde os resultados com Reciprocal Rank Fusion.
+
+        Cada ferramenta tem seu próprio prazo (`settings.research.provider_deadlines`); uma
+        resposta que chega depois dele é descartada, então a latência total é limitada pela
+        ferramenta mais lenta dentro do prazo, não pela soma. Resultados que apontam para a
+        mesma fonte (mesma chave canônica) em ferramentas diferentes são unidos.
+        """
+        research_settings = settings.research
+
+        async def run_tool(name: str, tool: Any) -> List[Dict[str, Any]]:
+            deadline = research_settings.provider_deadlines.get(name, research_settings.default_deadline)
+            try:
+                return await asyncio.wait_for(tool.run(query), timeout=deadline) or []
+            except asyncio.TimeoutError:
+                logger.warning(f"Ferramenta '{name}' excedeu o prazo de {deadline}s para a consulta: '{query}'")
+            except Exception as e:
+                logger.error(f"Erro na ferramenta '{name}' para a consulta '{query}': {e}", exc_info=True)
+            return []
+
+        names = list(self.tools)
+        responses = await asyncio.gather(*(run_tool(name, self.tools[name]) for name in names))
+
+        rankings: List[List[str]] = []
+        results_by_key: Dict[str, Dict[str, Any]] = {}
+        for results in responses:
+            ranking = []
+            for result in results:
+                key = canonical_key(result.get("url") or result.get("title", "N/A"))
+                ranking.append(key)
+                kept = results_by_key.get(key)
+                content = result.get("content") or result.get("snippet", "")
+                if kept is None or len(content) > len(kept.get("content") or kept.get("snippet", "")):
+                    results_by_key[key] = result
+            rankings.append(ranking)
+
+        fused = reciprocal_rank_fusion(rankings, k=research_settings.rrf_k)
+        logger.info(
+            f"Fan-out para '{query[:50]}': "
+            + ", ".join(f"{name}={len(results)}" for name, results in zip(names, responses))
+            + f" -> {len(fused)} resultados fundidos."
+        )
+        return [results_by_key[key] for key, _ in fused]
 
     async def _route_and_search(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -15,7 +15,7 @@ class FeedbackAgent:
     """
 
     def __init__(self):
-        self.model = llm_provider.get_model(settings.models.rag_agent) # Using a general LLM for feedback processing
+        self.model = llm_provider.get_model(settings.models.rag_agent, agent_name="feedback_agent") # Using a general LLM for feedback processing
         self.memory = MemoryAgent(agent_id="feedback_agent")
         logger.info("FeedbackAgent initialized.")
 
@@ -45,6 +45,8 @@ class FeedbackAgent:
             # Store feedback in memory
             feedback_id = f"feedback_{datetime.now().timestamp()}"
             await self.memory.remember(feedback_id, structured_feedback.model_dump_json())
+            # O feedback costuma ser a última ação da CLI; grava já, sem esperar o flush adiado.
+            await self.memory.flush_all()
             logger.info(f"Feedback {feedback_id} coletado e armazenado.")
 
             return structured_feedback
@@ -5,10 +5,13 @@ from datetime import datetime
 
 from app.config.settings import settings
 from app.core.llm_provider import llm_provider
+from app.core.rate_limiting import Priority, with_priority
+from app.core.registry import get_agent
 from app.agents.memory_agent import MemoryAgent
 from app.agents.knowledge_graph_agent import KnowledgeGraphAgent
 from app.agents.analysis_agent import AnalysisAgent
-from app.agents.research_agent import ResearchAgent 
+from app.models.research_models import AnalyzedDataItem, CollectedDataItem
+from app.tools.pubmed_search import PubMedSearch
 
 logger = logging.getLogger(__name__)
 system_logger = logging.getLogger('system_log') # Get the specific system_log logger
@@ -19,16 +22,17 @@ class KnowledgeCurationAgent:
     """
 
     def __init__(self):
-        self.llm_flash = llm_provider.get_model(settings.models.rag_agent) # Using Flash for general tasks/searches
-        self.llm_pro = llm_provider.get_model(settings.models.analysis_agent) # Using Pro for deeper analysis/decision-making
+        self.llm_flash = llm_provider.get_model(settings.models.rag_agent, agent_name="knowledge_curation_agent") # Using Flash for general tasks/searches
+        self.llm_pro = llm_provider.get_model(settings.models.analysis_agent, agent_name="knowledge_curation_agent") # Using Pro for deeper analysis/decision-making
 
         self.memory = MemoryAgent(agent_id="knowledge_curation_agent")
-        self.kg_agent = KnowledgeGraphAgent()
-        self.analysis_agent = AnalysisAgent()
-        self.research_agent = ResearchAgent() 
+        self.kg_agent = get_agent(KnowledgeGraphAgent)
+        self.analysis_agent = get_agent(AnalysisAgent)
 
         logger.info("KnowledgeCurationAgent initialized.")
 
+    # Buscas da curadoria cedem a vez às consultas interativas no limite de taxa.
+    @with_priority(Priority.BACKGROUND)
     async def perform_daily_update(self):
         """
         Executa a rotina diária de atualização do conhecimento.
@@ -38,38 +42,21 @@ class KnowledgeCurationAgent:
         """
         system_logger.info("Iniciando atualização diária do conhecimento...")
         
-        # 1. Buscar novas publicações relevantes usando o ResearchAgent
-        # NOTA: O método search do ResearchAgent (e suas ferramentas subjacentes) DEVE ser assíncrono.
-        # A Task 8.8.2 em TASK.md aborda a refatoração de src/app/tools/web_search.py para assincronicidade.
+        # 1. Buscar novas publicações relevantes em lotes pelo history server do PubMed
         search_query = "novas publicações sobre cirurgia bariátrica OR avanços em tratamento de obesidade"
-        new_articles = await self.research_agent.search(search_query, search_type="academic")
+        research_topic = "Atualização de Conhecimento Geral"
 
-        if not new_articles:
-            system_logger.info("Nenhuma nova publicação relevante encontrada pelo ResearchAgent.")
+        # 2. Analisar e 3. atualizar o grafo lote a lote, à medida que os artigos chegam
+        processed = await self._curate_pubmed(search_query, research_topic)
+        if not processed:
+            system_logger.info("Nenhuma nova publicação relevante encontrada no PubMed.")
             return
 
-        for article in new_articles:
-            source_id = article["source_identifier"]
-            content = article["content"]
-            research_topic = "Atualização de Conhecimento Geral"
-
-            system_logger.info(f"Processando artigo: {source_id}")
-            
-            try:
-                # 2. Analyze evidence
-                analysis_data = await self.analysis_agent.classify_evidence(content)
-                system_logger.info(f"Análise para {source_id}: Nível de Evidência {analysis_data.get('evidence_level')}")
-
-                # 3. Update Knowledge Graph
-                await self.kg_agent.update_graph_with_analysis(source_id, analysis_data, research_topic)
-                system_logger.info(f"Grafo de conhecimento atualizado com sucesso para {source_id}.")
-
-            except Exception as e:
-                system_logger.error(f"Erro ao processar artigo {source_id}: {e}", exc_info=True)
-
         await self.memory.remember("last_daily_update", str(datetime.now()))
+        await self.memory.flush_all()
         system_logger.info("Atualização diária do conhecimento concluída.")
 
+    @with_priority(Priority.BACKGROUND)
     async def perform_quarterly_review(self):
         """
         Executa a revisão trimestral de conflitos no grafo de conhecimento.
@@ -83,39 +70,22 @@ class KnowledgeCurationAgent:
 
         for topic in conflicting_topics:
             system_logger.info(f"Buscando novas publicações para resolver conflitos em: {topic}")
-            # 2. Use ResearchAgent for targeted searches
-            new_articles = await self.research_agent.search(f"novas evidências sobre {topic}", search_type="academic")
-
-            if not new_articles:
+            # 2. Targeted bulk search, 3. re-analysis and 4. KG update, using the conflicting topic as research topic
+            processed = await self._curate_pubmed(f"novas evidências sobre {topic}", topic)
+            if not processed:
                 system_logger.info(f"Nenhuma nova publicação encontrada para {topic}.")
-                continue
-
-            for article in new_articles:
-                source_id = article["source_identifier"]
-                content = article["content"]
-                research_topic = topic # Use the conflicting topic as research topic
-
-                system_logger.info(f"Processando artigo para resolução de conflito: {source_id}")
-                try:
-                    # 3. Re-analyze and resolve conflicts
-                    analysis_data = await self.analysis_agent.classify_evidence(content)
-                    system_logger.info(f"Análise para {source_id}: Nível de Evidência {analysis_data.get('evidence_level')}")
-
-                    # 4. Update KG
-                    await self.kg_agent.update_graph_with_analysis(source_id, analysis_data, research_topic)
-                    system_logger.info(f"Grafo de conhecimento atualizado para resolução de conflito: {source_id}.")
-
-                except Exception as e:
-                    system_logger.error(f"Erro ao processar artigo {source_id} para resolução de conflito: {e}", exc_info=True)
 
         await self.memory.remember("last_quarterly_review", str(datetime.now()))
+        await self.memory.flush_all()
         system_logger.info("Revisão trimestral de conflitos concluída.")
 
+    @with_priority(Priority.BACKGROUND)
     async def bootstrap_knowledge(self, initial_articles: List[Dict[str, Any]]):
         """
         Realiza o bootstrapping inicial do grafo de conhecimento com artigos seminais.
         """
         system_logger.info("Iniciando bootstrapping do conhecimento...")
+        analyzed_by_topic: Dict[str, List[AnalyzedDataItem]] = {}
         for article in initial_articles:
             source_id = article.get("source_identifier", f"bootstrap_article_{datetime.now().timestamp()}")
             content = article.get("content", "")
@@ -129,17 +99,80 @@ class KnowledgeCurationAgent:
             try:
                 # 1. Extract text (already provided in initial_articles)
                 # 2. Analyze evidence
-                analysis_data = await self.analysis_agent.classify_evidence(content)
+                analysis_data = await self.analysis_agent.classify_evidence(text=content, source_identifier=source_id)
                 system_logger.info(f"Análise para {source_id}: Nível de Evidência {analysis_data.evidence_level}")
-
-                # 3. Update KG
-                await self.kg_agent.update_graph_with_analysis(source_id, analysis_data, research_topic)
-                system_logger.info(f"Grafo de conhecimento atualizado com sucesso para bootstrapping: {source_id}.")
+                analyzed_by_topic.setdefault(research_topic, []).append(
+                    AnalyzedDataItem(source_identifier=source_id, analysis=analysis_data.model_dump())
+                )
 
             except Exception as e:
                 system_logger.error(f"Erro ao processar artigo {source_id} para bootstrapping: {e}", exc_info=True)
+
+        # 3. Update KG with one bulk write per research topic
+        for research_topic, analyzed_items in analyzed_by_topic.items():
+            await self._write_analyses(research_topic, analyzed_items)
         system_logger.info(f"Bootstrapping concluído para {len(initial_articles)} artigos.")
 
+    async def _curate_pubmed(self, query: str, research_topic: str) -> int:
+        """
+        Baixa os artigos da consulta em lotes (`PubMedSearch.iter_articles`), classifica cada
+        lote com `classify_evidence_batch` e grava as análises no grafo, sem manter todos os
+        artigos em memória. Se o download falhar no meio, os artigos já recebidos ainda são
+        processados.
+
+        Returns:
+            int: O número de artigos processados.
+        """
+        try:
+            articles = PubMedSearch().iter_articles(query, max_results=settings.pubmed.curation_max_results)
+        except ValueError as e:
+            system_logger.error(f"PubMed indisponível para a curadoria: {e}")
+            return 0
+
+        processed = 0
+        batch: List[CollectedDataItem] = []
+        try:
+            async for article in articles:
+                batch.append(
+                    CollectedDataItem(source_identifier=article["url"], content=f"{article['title']}\n\n{article['abstract']}")
+                )
+                if len(batch) >= settings.pubmed.batch_size:
+                    processed += await self._analyze_and_write(research_topic, batch)
+                    batch = []
+        except Exception as e:
+            # A busca é preguiçosa: falhas de rede ou do Entrez surgem durante a iteração.
+            system_logger.error(f"Erro ao baixar artigos do PubMed para '{query}': {e}", exc_info=True)
+        if batch:
+            processed += await self._analyze_and_write(research_topic, batch)
+        return processed
+
+    async def _analyze_and_write(self, research_topic: str, batch: List[CollectedDataItem]) -> int:
+        system_logger.info(f"Processando {len(batch)} artigos para o tópico '{research_topic}'.")
+        try:
+            results = await self.analysis_agent.classify_evidence_batch(batch)
+        except Exception as e:
+            system_logger.error(f"Erro ao analisar {len(batch)} artigos do tópico '{research_topic}': {e}", exc_info=True)
+            return 0
+        analyzed_items = [
+            AnalyzedDataItem(source_identifier=item.source_identifier, analysis=result.model_dump())
+            for item, result in zip(batch, results)
+            if result is not None
+        ]
+        await self._write_analyses(research_topic, analyzed_items)
+        return len(analyzed_items)
+
+    async def _write_analyses(self, research_topic: str, analyzed_items: List[AnalyzedDataItem]):
+        """
+        Grava as análises no grafo de conhecimento em uma única escrita em lote.
+        """
+        if not analyzed_items:
+            return
+        try:
+            written = await self.kg_agent.update_graph_with_analyses_bulk(research_topic, analyzed_items)
+            system_logger.info(f"Grafo de conhecimento atualizado com sucesso para {written} artigos do tópico '{research_topic}'.")
+        except Exception as e:
+            system_logger.error(f"Erro ao atualizar o grafo de conhecimento para o tópico '{research_topic}': {e}", exc_info=True)
+
 # Example usage (for testing purposes, not part of the main application flow)
 async def main():
     curation_agent = KnowledgeCurationAgent()
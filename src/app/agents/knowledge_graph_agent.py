@@ -1,13 +1,43 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from pydantic import ValidationError
 
 from app.config.settings import settings
-from app.core.db.neo4j_manager import execute_query, get_neo4j_driver
+from app.core.db.neo4j_manager import execute_query
+from app.core.registry import get_shared_neo4j_driver
 from app.models.agent_models import AnalysisResult
+from app.models.research_models import AnalyzedDataItem
 
 logger = logging.getLogger(__name__)
 
 
+# Versão em lote da consulta de `update_graph_with_analysis`: uma linha de $items por fonte.
+# Todos os nós recebem a propriedade normalizada `lookup` (minúsculas), indexada para a
+# verificação de alegações; nós nomeados também recebem o rótulo :Entity.
+BULK_UPDATE_QUERY = """
+MERGE (topic:Topic {name: $research_topic})
+  ON CREATE SET topic:Entity, topic.lookup = toLower($research_topic)
+WITH topic
+UNWIND $items AS item
+MERGE (source:Source {identifier: item.source_identifier})
+  ON CREATE SET source:Entity, source.lookup = toLower(item.source_identifier)
+MERGE (evidence:EvidenceLevel {level: item.evidence_level})
+  ON CREATE SET evidence:Entity, evidence.lookup = toLower(item.evidence_level)
+MERGE (source)-[:RELATED_TO]->(topic)
+MERGE (summary:Summary {text: item.summary, source_identifier: item.source_identifier})
+  ON CREATE SET summary.lookup = toLower(item.summary)
+MERGE (source)-[:CONTAINS]->(summary)
+MERGE (topic)-[:HAS_SUMMARY]->(summary)
+MERGE (summary)-[:HAS_EVIDENCE]->(evidence)
+WITH summary, item
+UNWIND item.keywords AS keyword_name
+MERGE (kw:Keyword {name: keyword_name})
+  ON CREATE SET kw:Entity, kw.lookup = toLower(keyword_name)
+MERGE (summary)-[:MENTIONS]->(kw)
+"""
+
+
 class KnowledgeGraphAgent:
     """
     Agente responsável por interagir com o grafo de conhecimento no Neo4j.
@@ -20,7 +50,7 @@ class KnowledgeGraphAgent:
             )
 
         self.db_settings = settings.database.neo4j_knowledge
-        self.driver = get_neo4j_driver(self.db_settings)
+        self.driver = get_shared_neo4j_driver(self.db_settings)
 
     async def update_graph_with_analysis(
         self,
@@ -39,9 +69,13 @@ class KnowledgeGraphAgent:
 
         query = """
         // 1. Encontra ou cria os nós principais: Tópico, Fonte e Nível de Evidência.
+        //    `lookup` guarda o valor normalizado (minúsculas) usado na verificação de alegações.
         MERGE (topic:Topic {name: $research_topic})
+          ON CREATE SET topic:Entity, topic.lookup = toLower($research_topic)
         MERGE (source:Source {identifier: $source_identifier})
+          ON CREATE SET source:Entity, source.lookup = toLower($source_identifier)
         MERGE (evidence:EvidenceLevel {level: $evidence_level})
+          ON CREATE SET evidence:Entity, evidence.lookup = toLower($evidence_level)
 
         // 2. Garante que a Fonte esteja relacionada ao Tópico.
         MERGE (source)-[:RELATED_TO]->(topic)
@@ -51,6 +85,7 @@ class KnowledgeGraphAgent:
         //    ON CREATE define as propriedades apenas se o nó for criado.
         //    ON MATCH pode ser usado para atualizar propriedades se o nó já existir.
         MERGE (summary:Summary {text: $summary, source_identifier: $source_identifier})
+          ON CREATE SET summary.lookup = toLower($summary)
 
         // 4. Garante que as conexões do Resumo com a Fonte, Tópico e Evidência existam.
         MERGE (source)-[:CONTAINS]->(summary)
@@ -63,6 +98,7 @@ class KnowledgeGraphAgent:
         WITH summary
         UNWIND $keywords as keyword_name
         MERGE (kw:Keyword {name: keyword_name})
+          ON CREATE SET kw:Entity, kw.lookup = toLower(keyword_name)
         MERGE (summary)-[:MENTIONS]->(kw)
         """
         parameters = {
@@ -78,4 +114,54 @@ class KnowledgeGraphAgent:
             logger.info(f"Grafo de conhecimento atualizado para a fonte '{source_identifier}'.")
         except Exception as e:
             logger.error(f"Falha ao atualizar o grafo de conhecimento para a fonte '{source_identifier}': {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def update_graph_with_analyses_bulk(self, research_topic: str, items: List[AnalyzedDataItem]) -> int:
+        """
+        Atualiza o grafo de conhecimento com as análises de várias fontes de uma só vez.
+
+        Todas as fontes são enviadas em consultas UNWIND parametrizadas, divididas em
+        blocos de `settings.knowledge_graph.bulk_chunk_size`, dentro de uma única
+        transação de escrita. Itens que não passam na validação são ignorados.
+
+        Args:
+            research_topic (str): O tópico ao qual as fontes são relacionadas.
+            items (List[AnalyzedDataItem]): As fontes e suas análises.
+
+        Returns:
+            int: O número de fontes gravadas.
+        """
+        rows = []
+        for item in items:
+            try:
+                analysis_result = AnalysisResult.model_validate(item.analysis)
+            except ValidationError as e:
+                logger.warning(f"Análise inválida para a fonte '{item.source_identifier}'; ignorada na escrita em lote: {e}")
+                continue
+            rows.append({
+                "source_identifier": item.source_identifier,
+                "summary": analysis_result.summary,
+                "evidence_level": analysis_result.evidence_level,
+                "keywords": analysis_result.keywords,
+            })
+        if not rows:
+            return 0
+
+        chunk_size = settings.knowledge_graph.bulk_chunk_size
+
+        async def write_chunks(tx):
+            for start in range(0, len(rows), chunk_size):
+                result = await tx.run(
+                    BULK_UPDATE_QUERY,
+                    {"research_topic": research_topic, "items": rows[start:start + chunk_size]},
+                )
+                await result.consume()
+
+        try:
+            async with self.driver.session(database=self.db_settings.database) as session:
+                await session.execute_write(write_chunks)
+            logger.info(f"Grafo de conhecimento atualizado em lote com {len(rows)} fontes para o tópico '{research_topic}'.")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Falha ao atualizar o grafo de conhecimento em lote para o tópico '{research_topic}': {e}")
+            raise
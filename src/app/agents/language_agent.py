@@ -8,7 +8,7 @@ logger = logging.getLogger(__name__)
 
 class LanguageAgent:
     def __init__(self):
-        self.model = llm_provider.get_model(settings.models.language_agent) # Assuming a language_agent model is defined in settings
+        self.model = llm_provider.get_model(settings.models.language_agent, agent_name="language_agent") # Assuming a language_agent model is defined in settings
 
     async def detect_and_translate(self, text: str, target_language: str = "portuguese") -> Dict[str, Any]:
         """
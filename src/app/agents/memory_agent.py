@@ -1,61 +1,185 @@
+import asyncio
 import logging
+from typing import Dict, List, Optional, Tuple
 
 from app.config.settings import settings
-from app.core.db.neo4j_manager import execute_query, get_neo4j_driver
+from app.core.cache import LRUCache
+from app.core.db.neo4j_manager import execute_query
+from app.core.registry import get_shared_neo4j_driver
 
 logger = logging.getLogger(__name__)
 
+REMEMBER_MANY_QUERY = """
+UNWIND $memories AS memory
+MERGE (a:Agent {id: memory.agent_id})
+MERGE (m:Memory {key: memory.key, agent_id: memory.agent_id})
+SET m.value = memory.value, m.timestamp = timestamp()
+MERGE (a)-[:HAS_MEMORY]->(m)
+"""
+
+RECALL_MANY_QUERY = """
+UNWIND $keys AS key
+MATCH (:Agent {id: $agent_id})-[:HAS_MEMORY]->(m:Memory {key: key})
+WITH key, m
+ORDER BY m.timestamp DESC
+RETURN key, collect(m.value)[0] AS value
+"""
+
+# Marca no cache negativo uma chave sabidamente ausente no grafo, evitando consultá-la de novo.
+_MISSING = object()
+
 
 class MemoryAgent:
+    """
+    Memória persistente de um agente no grafo de memória (Neo4j).
+
+    As leituras passam por um cache LRU em processo compartilhado por todas as instâncias
+    (`settings.memory.cache_max_entries`). Chaves ausentes no grafo ficam em um cache
+    separado, com validade curta (`settings.memory.negative_cache_ttl_seconds`), para que
+    uma memória gravada por outro processo passe a ser vista logo. Com `settings.memory.write_behind`, as escritas
+    atualizam o cache imediatamente e são gravadas no grafo em lotes: ao atingir
+    `flush_batch_size` memórias pendentes, após `flush_interval_seconds` ou em `flush_all()`.
+    """
+
+    _cache: Optional[LRUCache] = None
+    _negative_cache: Optional[LRUCache] = None
+    _pending: Dict[Tuple[str, str], str] = {}
+    _flush_task: Optional[asyncio.Task] = None
+
     def __init__(self, agent_id: str):
         if not settings.database.neo4j_memory_agents:
             raise ValueError("Configurações do Neo4j para memória de agentes não definidas.")
 
         self.agent_id = agent_id
         self.db_settings = settings.database.neo4j_memory_agents
-        self.driver = get_neo4j_driver(self.db_settings)
+        self.driver = get_shared_neo4j_driver(self.db_settings)
+        if MemoryAgent._cache is None:
+            MemoryAgent._cache = LRUCache(
+                max_entries=settings.memory.cache_max_entries, ttl_seconds=settings.memory.cache_ttl_seconds
+            )
+            MemoryAgent._negative_cache = LRUCache(
+                max_entries=settings.memory.cache_max_entries,
+                ttl_seconds=settings.memory.negative_cache_ttl_seconds,
+            )
+
+    def _cache_key(self, key: str) -> str:
+        return f"{self.agent_id}\x1f{key}"
 
     async def remember(self, key: str, value: str):
         """
         Armazena uma memória para o agente no grafo de memória.
         Cada agente tem seu próprio nó, e as memórias são conectadas a ele.
+
+        Com escrita adiada habilitada, a memória fica disponível para `recall`
+        imediatamente e é gravada no grafo no próximo flush.
         """
-        query = """
-        MERGE (a:Agent {id: $agent_id})
-        MERGE (m:Memory {key: $key, agent_id: $agent_id})
-        SET m.value = $value, m.timestamp = timestamp()
-        MERGE (a)-[:HAS_MEMORY]->(m)
-        RETURN a.id as agentId, m.key as memoryKey
-        """
-        parameters = {"agent_id": self.agent_id, "key": key, "value": value}
+        MemoryAgent._cache.set(self._cache_key(key), value)
+        MemoryAgent._negative_cache.delete(self._cache_key(key))
+        if not settings.memory.write_behind:
+            return await self._write([{"agent_id": self.agent_id, "key": key, "value": value}])
 
-        try:
-            result = await execute_query(
-                self.driver, self.db_settings.database, query, parameters
-            )
-            logger.info(f"Memória '{key}' salva para o agente '{self.agent_id}'.")
-            return result
-        except Exception as e:
-            logger.error(f"Falha ao salvar memória para o agente '{self.agent_id}': {e}")
-            return None
+        MemoryAgent._pending[(self.agent_id, key)] = value
+        if len(MemoryAgent._pending) >= settings.memory.flush_batch_size:
+            await self.flush_all()
+        else:
+            self._schedule_flush()
+        return None
 
     async def recall(self, key: str) -> str | None:
         """
         Recupera uma memória para o agente.
         """
-        query = """
-        MATCH (:Agent {id: $agent_id})-[:HAS_MEMORY]->(m:Memory {key: $key})
-        RETURN m.value as value
-        ORDER BY m.timestamp DESC
-        LIMIT 1
+        return (await self.recall_many([key])).get(key)
+
+    async def recall_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
         """
-        parameters = {"agent_id": self.agent_id, "key": key}
+        Recupera várias memórias do agente. Chaves fora do cache são buscadas no grafo
+        em uma única consulta, e o resultado é guardado no cache (ausências, no cache negativo).
 
+        Args:
+            keys (List[str]): As chaves a recuperar.
+
+        Returns:
+            Dict[str, Optional[str]]: O valor de cada chave, ou None se não houver memória.
+        """
+        values: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            pending_value = MemoryAgent._pending.get((self.agent_id, key))
+            cache_key = self._cache_key(key)
+            cached = pending_value if pending_value is not None else MemoryAgent._cache.get(cache_key)
+            if cached is None:
+                cached = MemoryAgent._negative_cache.get(cache_key)
+            if cached is None:
+                missing.append(key)
+            else:
+                values[key] = None if cached is _MISSING else cached
+        if not missing:
+            return values
+
+        parameters = {"agent_id": self.agent_id, "keys": missing}
+        try:
+            result = await execute_query(self.driver, self.db_settings.database, RECALL_MANY_QUERY, parameters)
+        except Exception as e:
+            logger.error(f"Falha ao recuperar memória para o agente '{self.agent_id}': {e}")
+            values.update({key: None for key in missing})
+            return values
+
+        found = {record.get("key"): record.get("value") for record in result or []}
+        for key in missing:
+            value = found.get(key)
+            values[key] = value
+            if value is None:
+                MemoryAgent._negative_cache.set(self._cache_key(key), _MISSING)
+            else:
+                MemoryAgent._cache.set(self._cache_key(key), value)
+        return values
+
+    @staticmethod
+    async def _write(memories: List[Dict[str, str]]):
+        db_settings = settings.database.neo4j_memory_agents
         try:
             result = await execute_query(
-                self.driver, self.db_settings.database, query, parameters
+                get_shared_neo4j_driver(db_settings), db_settings.database, REMEMBER_MANY_QUERY, {"memories": memories}
             )
-            return result[0].get("value") if result else None
+            logger.info(f"{len(memories)} memórias salvas no grafo de memória.")
+            return result
         except Exception as e:
-            logger.error(f"Falha ao recuperar memória para o agente '{self.agent_id}': {e}")
-            return None
\ No newline at end of file
+            logger.error(f"Falha ao salvar {len(memories)} memórias no grafo de memória: {e}")
+            return None
+
+    @classmethod
+    def _schedule_flush(cls) -> None:
+        task = cls._flush_task
+        loop = asyncio.get_running_loop()
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        cls._flush_task = loop.create_task(cls._flush_later())
+
+    @classmethod
+    async def _flush_later(cls) -> None:
+        await asyncio.sleep(settings.memory.flush_interval_seconds)
+        await cls.flush_all()
+
+    @classmethod
+    async def flush_all(cls) -> int:
+        """
+        Grava no grafo todas as memórias pendentes, de todos os agentes, em uma única consulta.
+        Deve ser chamado ao final de execuções curtas (CLI, tarefas agendadas), antes que o
+        event loop seja encerrado.
+
+        Returns:
+            int: O número de memórias gravadas.
+        """
+        if not cls._pending:
+            return 0
+        pending, cls._pending = cls._pending, {}
+        memories = [
+            {"agent_id": agent_id, "key": key, "value": value} for (agent_id, key), value in pending.items()
+        ]
+        if await cls._write(memories) is None:
+            # Devolve à fila o que falhou, sem sobrescrever valores mais novos.
+            for memory_key, value in pending.items():
+                cls._pending.setdefault(memory_key, value)
+            return 0
+        return len(memories)
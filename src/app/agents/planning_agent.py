@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 class PlanningAgent:
     def __init__(self):
-        self.model = llm_provider.get_model(settings.models.planning_agent)
+        self.model = llm_provider.get_model(settings.models.planning_agent, agent_name="planning_agent")
 
     async def generate_research_plan(self, topic: str) -> Dict[str, Any]:
         """Gera um plano de pesquisa detalhado e estima os recursos.
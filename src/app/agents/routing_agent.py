@@ -1,23 +1,123 @@
+import asyncio
 import logging
-from typing import List, Dict, Any
+import math
+import re
+import unicodedata
+from typing import List, Dict, Any, Optional, Tuple
 
+from app.core.cache import LRUCache
 from app.core.llm_provider import llm_provider
 from app.config.settings import settings
 from app.prompts.llm_prompts import ROUTING_AGENT_PROMPT
 
 logger = logging.getLogger(__name__)
 
+
+def _normalize(text: str) -> str:
+    """Minúsculas, sem acentos e com espaços colapsados."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class KeywordRouter:
+    """
+    Classificador local por palavras-chave: cada ferramenta pode declarar `keywords`
+    (termos, frases, prefixos terminados em `*`, ex: `cirurg*`, ou expressões regulares
+    já compiladas, aplicadas à consulta normalizada). A pontuação de uma ferramenta é o
+    número de termos distintos encontrados na consulta, e a confiança é a fração da
+    pontuação total que coube à ferramenta vencedora.
+    """
+
+    def __init__(self, tools: List[Dict[str, Any]]):
+        self._patterns: Dict[str, List[re.Pattern]] = {}
+        for tool in tools:
+            patterns = []
+            for keyword in tool.get("keywords", []):
+                if isinstance(keyword, re.Pattern):
+                    patterns.append(keyword)
+                    continue
+                term = _normalize(keyword)
+                if term.endswith("*"):
+                    patterns.append(re.compile(rf"\b{re.escape(term[:-1])}\w*"))
+                else:
+                    patterns.append(re.compile(rf"\b{re.escape(term)}\b"))
+            if patterns:
+                self._patterns[tool["name"]] = patterns
+
+    def classify(self, query: str) -> Tuple[Optional[str], float]:
+        normalized = _normalize(query)
+        scores = sorted(
+            ((sum(1 for pattern in patterns if pattern.search(normalized)), name) for name, patterns in self._patterns.items()),
+            reverse=True,
+        )
+        if not scores or scores[0][0] == 0:
+            return None, 0.0
+        total = sum(score for score, _ in scores)
+        return scores[0][1], scores[0][0] / total
+
+
+class EmbeddingRouter:
+    """
+    Classificador por similaridade de embeddings entre a consulta e a descrição de cada
+    ferramenta. A confiança é a margem de similaridade de cosseno entre a melhor e a
+    segunda melhor ferramenta.
+    """
+
+    def __init__(self, tools: List[Dict[str, Any]]):
+        from app.core.vector_db import get_embedding_function  # dependência opcional (chromadb)
+
+        self._embed = get_embedding_function(cached=False)
+        self._names = [tool["name"] for tool in tools]
+        self._tool_vectors = self._embed([tool["description"] for tool in tools])
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+    def classify(self, query: str) -> Tuple[Optional[str], float]:
+        (query_vector,) = self._embed([query])
+        scores = sorted(
+            ((self._cosine(query_vector, vector), name) for name, vector in zip(self._names, self._tool_vectors)),
+            reverse=True,
+        )
+        if len(scores) < 2:
+            return (scores[0][1], 1.0) if scores else (None, 0.0)
+        return scores[0][1], scores[0][0] - scores[1][0]
+
+
 class RoutingAgent:
+    # Decisões compartilhadas entre instâncias, por conjunto de ferramentas e consulta normalizada.
+    _decisions: Optional[LRUCache] = None
+
     def __init__(self, tools: List[Dict[str, Any]]):
         """
         Inicializa o RoutingAgent.
 
         Args:
             tools (List[Dict[str, Any]]): Uma lista de dicionários, onde cada dicionário
-                                          descreve uma ferramenta (nome e descrição).
+                                          descreve uma ferramenta (nome e descrição) e,
+                                          opcionalmente, suas palavras-chave (`keywords`).
         """
-        self.model = llm_provider.get_model(settings.models.routing_agent)
+        self.model = llm_provider.get_model(settings.models.routing_agent, agent_name="routing_agent")
         self.tools_description = self._format_tools_for_prompt(tools)
+        self.tool_names = [tool["name"] for tool in tools]
+        self.keyword_router = KeywordRouter(tools)
+        self.embedding_router = self._build_embedding_router(tools)
+        self.stats = {"cache": 0, "keywords": 0, "embeddings": 0, "llm": 0}
+        if RoutingAgent._decisions is None:
+            RoutingAgent._decisions = LRUCache(max_entries=settings.routing.cache_max_entries)
+
+    @staticmethod
+    def _build_embedding_router(tools: List[Dict[str, Any]]) -> Optional[EmbeddingRouter]:
+        if not settings.routing.embeddings_enabled:
+            return None
+        try:
+            return EmbeddingRouter(tools)
+        except Exception as e:
+            logger.warning(f"Roteamento por embeddings indisponível; usando palavras-chave e LLM: {e}")
+            return None
 
     def _format_tools_for_prompt(self, tools: List[Dict[str, Any]]) -> str:
         """Formata a lista de ferramentas em uma string para o prompt."""
@@ -30,12 +130,58 @@ class RoutingAgent:
         """
         Escolhe a melhor ferramenta para uma determinada consulta.
 
+        Tenta, em ordem: o cache de decisões, as palavras-chave das ferramentas e, se
+        habilitado, a similaridade de embeddings. O LLM só é consultado quando nenhum
+        classificador local atinge a confiança mínima (`settings.routing`).
+
         Args:
             query (str): A consulta ou pergunta de pesquisa.
 
         Returns:
             str: O nome da ferramenta escolhida.
         """
+        cache_key = f"{'|'.join(self.tool_names)}\x1f{_normalize(query)}"
+        cached = RoutingAgent._decisions.get(cache_key)
+        if cached is not None:
+            self.stats["cache"] += 1
+            return cached
+
+        tool_name = None
+        if settings.routing.local_enabled:
+            tool_name, tier = self._choose_locally(query)
+            if tool_name is None and self.embedding_router is not None:
+                tool_name, tier = await self._choose_by_embeddings(query)
+            if tool_name is not None:
+                self.stats[tier] += 1
+                logger.debug(f"Consulta: '{query[:50]}...' -> Ferramenta escolhida localmente ({tier}): {tool_name}")
+
+        if tool_name is None:
+            tool_name = await self._choose_with_llm(query)
+            if tool_name is None:
+                # Fallback para uma ferramenta padrão em caso de erro; não é cacheado.
+                return "default_search"
+            self.stats["llm"] += 1
+
+        RoutingAgent._decisions.set(cache_key, tool_name)
+        return tool_name
+
+    def _choose_locally(self, query: str) -> Tuple[Optional[str], str]:
+        tool_name, confidence = self.keyword_router.classify(query)
+        if tool_name is not None and confidence >= settings.routing.min_keyword_confidence:
+            return tool_name, "keywords"
+        return None, "keywords"
+
+    async def _choose_by_embeddings(self, query: str) -> Tuple[Optional[str], str]:
+        try:
+            tool_name, margin = await asyncio.to_thread(self.embedding_router.classify, query)
+        except Exception as e:
+            logger.warning(f"Falha no roteamento por embeddings para '{query[:50]}': {e}")
+            return None, "embeddings"
+        if tool_name is not None and margin >= settings.routing.min_embedding_margin:
+            return tool_name, "embeddings"
+        return None, "embeddings"
+
+    async def _choose_with_llm(self, query: str) -> Optional[str]:
         prompt = ROUTING_AGENT_PROMPT.format(
             tools_description=self.tools_description,
             query=query
@@ -45,10 +191,13 @@ class RoutingAgent:
             response = await self.model.generate_content_async(prompt)
             # A resposta do LLM deve ser apenas o nome da ferramenta.
             # O strip() remove espaços em branco ou novas linhas extras.
-            tool_name = response.text.strip()
-            logger.info(f"Consulta: '{query[:50]}...' -> Ferramenta escolhida: {tool_name}")
-            return tool_name
+            tool_name = response.text.strip().strip("`")
         except Exception as e:
             logger.error(f"Erro ao escolher a ferramenta para a consulta '{query}': {e}", exc_info=True)
-            # Fallback para uma ferramenta padrão em caso de erro.
-            return "default_search"
+            return None
+        if tool_name not in self.tool_names:
+            # Respostas malformadas não podem ser cacheadas como decisão da consulta.
+            logger.warning(f"O LLM escolheu uma ferramenta desconhecida para '{query[:50]}': {tool_name!r}")
+            return None
+        logger.info(f"Consulta: '{query[:50]}...' -> Ferramenta escolhida: {tool_name}")
+        return tool_name
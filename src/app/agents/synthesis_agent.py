@@ -10,7 +10,7 @@ logger = logging.getLogger(__name__)
 
 class SynthesisAgent:
     def __init__(self):
-        self.model = llm_provider.get_model(settings.models.synthesis_agent)
+        self.model = llm_provider.get_model(settings.models.synthesis_agent, agent_name="synthesis_agent")
 
     async def generate_summary_with_citations(self, text: str, research_question: str, sources: List[Dict[str, str]]) -> FinalReport:
         """Generates a summary with sentence-level citations.
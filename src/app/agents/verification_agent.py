@@ -1,12 +1,60 @@
+import asyncio
 import logging
 from typing import Any, Dict, List
 
 from app.config.settings import settings
-from app.core.db.neo4j_manager import execute_query, get_neo4j_driver
+from app.core.db.neo4j_manager import execute_query
+from app.core.registry import get_shared_neo4j_driver
 from app.models.verification_models import Claim, VerificationReport # Importar os novos modelos
 
 logger = logging.getLogger(__name__)
 
+# Resolve sujeito e objeto pelos índices de `lookup` (minúsculas): nós nomeados via :Entity
+# e resumos via :Summary. A relação é então procurada apenas entre os candidatos, sem
+# varrer as relações do grafo.
+CLAIM_MATCH_QUERY = """
+CALL {
+  MATCH (s:Entity {lookup: toLower($subject)}) RETURN s
+  UNION
+  MATCH (s:Summary {lookup: toLower($subject)}) RETURN s
+}
+CALL {
+  MATCH (o:Entity {lookup: toLower($object)}) RETURN o
+  UNION
+  MATCH (o:Summary {lookup: toLower($object)}) RETURN o
+}
+MATCH (s)-[r]->(o)
+WHERE toLower(type(r)) CONTAINS toLower($predicate)
+RETURN count(r) > 0 AS verified
+"""
+
+# Versão em lote de CLAIM_MATCH_QUERY: verifica todas as alegações de $claims em uma única
+# ida ao banco e retorna o resultado de cada uma pelo seu índice.
+BULK_CLAIM_MATCH_QUERY = """
+UNWIND $claims AS claim
+CALL {
+  WITH claim
+  CALL {
+    WITH claim
+    MATCH (s:Entity {lookup: toLower(claim.subject)}) RETURN s
+    UNION
+    WITH claim
+    MATCH (s:Summary {lookup: toLower(claim.subject)}) RETURN s
+  }
+  CALL {
+    WITH claim
+    MATCH (o:Entity {lookup: toLower(claim.object)}) RETURN o
+    UNION
+    WITH claim
+    MATCH (o:Summary {lookup: toLower(claim.object)}) RETURN o
+  }
+  MATCH (s)-[r]->(o)
+  WHERE toLower(type(r)) CONTAINS toLower(claim.predicate)
+  RETURN count(r) > 0 AS verified
+}
+RETURN claim.index AS index, verified
+"""
+
 
 class VerificationAgent:
     """
@@ -17,47 +65,80 @@ class VerificationAgent:
         if not settings.database.neo4j_knowledge:
             raise ValueError("Configurações do Neo4j para conhecimento não definidas.")
         self.db_settings = settings.database.neo4j_knowledge
-        self.driver = get_neo4j_driver(self.db_settings)
+        self.driver = get_shared_neo4j_driver(self.db_settings)
 
     async def verify_claim(self, claim: Claim) -> bool:
         """
         Verifica uma única alegação no grafo de conhecimento.
         Retorna True se um caminho correspondente for encontrado.
         """
-        # Esta consulta é uma simplificação. Um sistema de produção poderia ter uma
-        # lógica mais complexa para mapear predicados para tipos de relação
-        # e buscar em diferentes tipos de nós.
-        query = """
-        MATCH (s)-[r]->(o)
-        WHERE (toLower(s.name) = toLower($subject) OR toLower(s.identifier) = toLower($subject) OR toLower(s.text) = toLower($subject))
-          AND (toLower(o.name) = toLower($object) OR toLower(o.identifier) = toLower($object) OR toLower(o.text) = toLower($object))
-          AND toLower(type(r)) CONTAINS toLower($predicate)
-        RETURN count(r) > 0 AS verified
-        """
-        # Simplificando o predicado para uma busca mais flexível
-        simple_predicate = claim.predicate.replace("_", " ").split(" ")[-1]
-
+        # Os candidatos são resolvidos pelos índices de `lookup` (ver app.core.graph_schema).
+        # Um sistema de produção poderia ter uma lógica mais complexa para mapear
+        # predicados para tipos de relação.
         parameters = {
             "subject": claim.subject,
-            "predicate": simple_predicate,
+            "predicate": self._simplify_predicate(claim.predicate),
             "object": claim.object,
         }
 
         try:
-            result = await execute_query(self.driver, self.db_settings.database, query, parameters)
+            result = await execute_query(self.driver, self.db_settings.database, CLAIM_MATCH_QUERY, parameters)
             return result[0].get("verified", False) if result else False
         except Exception as e:
             logger.error(f"Erro ao verificar alegação '{claim.subject} {claim.predicate} {claim.object}': {e}", exc_info=True)
             return False
 
+    @staticmethod
+    def _simplify_predicate(predicate: str) -> str:
+        """Simplifica o predicado (ex: 'CAN_CAUSE' -> 'CAUSE') para uma busca mais flexível."""
+        return predicate.replace("_", " ").split(" ")[-1]
+
+    async def _verify_chunk(self, claims: List[Claim]) -> List[bool]:
+        """Verifica um bloco de alegações com uma única consulta UNWIND."""
+        parameters = {
+            "claims": [
+                {
+                    "index": index,
+                    "subject": claim.subject,
+                    "predicate": self._simplify_predicate(claim.predicate),
+                    "object": claim.object,
+                }
+                for index, claim in enumerate(claims)
+            ]
+        }
+        try:
+            result = await execute_query(self.driver, self.db_settings.database, BULK_CLAIM_MATCH_QUERY, parameters)
+        except Exception as e:
+            logger.error(f"Erro ao verificar {len(claims)} alegações em lote: {e}", exc_info=True)
+            return [False] * len(claims)
+        verified_by_index = {record.get("index"): bool(record.get("verified")) for record in result or []}
+        return [verified_by_index.get(index, False) for index in range(len(claims))]
+
     async def bulk_verify(self, claims: List[Claim]) -> VerificationReport:
-        """Verifica uma lista de alegações e retorna um relatório."""
-        verified_claims = []
-        unverified_claims = []
+        """
+        Verifica uma lista de alegações e retorna um relatório.
+
+        Até `settings.verification.max_claims_per_query` alegações são verificadas em uma
+        única consulta; listas maiores são divididas em blocos executados com concorrência
+        limitada a `settings.verification.max_concurrency`.
+        """
+        chunk_size = settings.verification.max_claims_per_query
+        if len(claims) <= chunk_size:
+            flags = await self._verify_chunk(claims) if claims else []
+        else:
+            semaphore = asyncio.Semaphore(settings.verification.max_concurrency)
+
+            async def verify_bounded(chunk: List[Claim]) -> List[bool]:
+                async with semaphore:
+                    return await self._verify_chunk(chunk)
+
+            chunk_flags = await asyncio.gather(
+                *(verify_bounded(claims[start:start + chunk_size]) for start in range(0, len(claims), chunk_size))
+            )
+            flags = [flag for chunk in chunk_flags for flag in chunk]
 
-        for claim in claims:
-            is_verified = await self.verify_claim(claim)
-            (verified_claims if is_verified else unverified_claims).append(claim)
+        verified_claims = [claim for claim, is_verified in zip(claims, flags) if is_verified]
+        unverified_claims = [claim for claim, is_verified in zip(claims, flags) if not is_verified]
 
         hallucination_detected = len(unverified_claims) > 0
         return VerificationReport(
@@ -66,4 +147,4 @@ class VerificationAgent:
             unverified_count=len(unverified_claims),
             verified_claims=verified_claims,
             unverified_claims=unverified_claims,
-        )
\ No newline at end of file
+        )
@@ -1,19 +1,51 @@
+import asyncio
+import logging
 from fastapi import FastAPI, HTTPException
 from typing import List, Dict, Any
-from app.core.db.neo4j_manager import get_neo4j_driver, execute_query
+from app.core.db.neo4j_manager import execute_query
+from app.core.registry import close_resources, get_shared_neo4j_driver
 from app.core.minio_client import MinIOClient
 from app.config.settings import settings
+from app.core.llm_provider import llm_provider
+from app.core.graph_schema import bootstrap_graph_schemas
+from app.agents.memory_agent import MemoryAgent
+from app.core.http_client import close_http_clients
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
 # Initialize MinIO client
 minio_client = MinIOClient()
 
+@app.on_event("startup")
+async def ensure_graph_schema():
+    """Create Neo4j constraints and indexes (idempotent) before serving requests."""
+    await bootstrap_graph_schemas()
+
+@app.on_event("startup")
+async def warm_up_vector_db():
+    """Load the embedding model once so the first search does not pay for it."""
+    if not settings.database.chroma.warm_up:
+        return
+    try:
+        from app.core.vector_db import warm_up
+        await asyncio.to_thread(warm_up)
+    except Exception as e:
+        logger.warning(f"Vector DB warm-up failed: {e}")
+
+@app.on_event("shutdown")
+async def release_resources():
+    """Write agent memories still buffered by the MemoryAgent, then close pooled HTTP connections, Neo4j drivers and shared agents."""
+    await MemoryAgent.flush_all()
+    await close_http_clients()
+    await close_resources()
+
 @app.get("/api/graph")
 async def get_graph_data():
     """Retrieve all nodes and relationships from the Neo4j knowledge graph."""
     try:
-        driver = get_neo4j_driver(settings.database.neo4j.knowledge)
+        driver = get_shared_neo4j_driver(settings.database.neo4j.knowledge)
         query = "MATCH (n)-[r]->(m) RETURN n, r, m LIMIT 100"
         results = await execute_query(driver, settings.database.neo4j.knowledge.database, query)
 
@@ -42,6 +74,11 @@ async def get_pdf_presigned_url(object_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating pre-signed URL: {e}")
 
+@app.get("/api/metrics/llm")
+async def get_llm_metrics():
+    """Expose LLM limiter queue/wait metrics and response-cache counters."""
+    return {"limiter": llm_provider.limiter_metrics(), "cache": llm_provider.cache_stats()}
+
 @app.get("/api/hello")
 async def hello():
     return {"message": "Hello from FastAPI!"}
@@ -0,0 +1,158 @@
+"""Checkpoints duráveis das execuções de pesquisa profunda, armazenados em SQLite."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def new_run_id() -> str:
+    """Gera um identificador curto e único para uma execução."""
+    return uuid.uuid4().hex[:12]
+
+
+def to_jsonable(value: Any) -> Any:
+    """Converte recursivamente modelos Pydantic em estruturas serializáveis em JSON."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    return value
+
+
+class CheckpointStore:
+    """
+    Guarda, por execução (`run_id`), a saída de cada nó concluído do grafo, os resultados
+    de cada busca concluída e as análises já realizadas por fonte, permitindo retomar uma
+    execução interrompida.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " run_id TEXT PRIMARY KEY,"
+                " topic TEXT NOT NULL,"
+                " search_limit INTEGER,"
+                " status TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS node_checkpoints ("
+                " run_id TEXT NOT NULL,"
+                " node TEXT NOT NULL,"
+                " state_update TEXT NOT NULL,"
+                " completed_at REAL NOT NULL,"
+                " PRIMARY KEY (run_id, node))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyzed_sources ("
+                " run_id TEXT NOT NULL,"
+                " source_identifier TEXT NOT NULL,"
+                " analysis TEXT NOT NULL,"
+                " PRIMARY KEY (run_id, source_identifier))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completed_searches ("
+                " run_id TEXT NOT NULL,"
+                " query TEXT NOT NULL,"
+                " results TEXT NOT NULL,"
+                " PRIMARY KEY (run_id, query))"
+            )
+
+    def ensure_run(self, run_id: str, topic: str, search_limit: Optional[int]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, topic, search_limit, status, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'running', ?, ?)",
+                (run_id, topic, search_limit, now, now),
+            )
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, topic, search_limit, status FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"run_id": row[0], "topic": row[1], "search_limit": row[2], "status": row[3]}
+
+    def set_status(self, run_id: str, status: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id)
+            )
+
+    def save_node(self, run_id: str, node: str, state_update: Dict[str, Any]) -> None:
+        payload = json.dumps(to_jsonable(state_update), ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO node_checkpoints (run_id, node, state_update, completed_at) VALUES (?, ?, ?, ?)",
+                (run_id, node, payload, time.time()),
+            )
+            self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (time.time(), run_id))
+
+    def load_node(self, run_id: str, node: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state_update FROM node_checkpoints WHERE run_id = ? AND node = ?", (run_id, node)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_analysis(self, run_id: str, source_identifier: str, analysis: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyzed_sources (run_id, source_identifier, analysis) VALUES (?, ?, ?)",
+                (run_id, source_identifier, json.dumps(to_jsonable(analysis), ensure_ascii=False)),
+            )
+
+    def load_analyses(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_identifier, analysis FROM analyzed_sources WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        return {source_identifier: json.loads(analysis) for source_identifier, analysis in rows}
+
+    def save_search(self, run_id: str, query: str, results: List[Dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completed_searches (run_id, query, results) VALUES (?, ?, ?)",
+                (run_id, query, json.dumps(to_jsonable(results), ensure_ascii=False, default=str)),
+            )
+
+    def load_searches(self, run_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, results FROM completed_searches WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        return {query: json.loads(results) for query, results in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache
+def get_checkpoint_store() -> CheckpointStore:
+    """Retorna o `CheckpointStore` configurado em `settings.checkpoints.path` (cacheado)."""
+    return CheckpointStore(settings.checkpoints.path)
@@ -18,6 +18,11 @@ from app.config.settings import settings, get_settings, GlobalSettings # Import
 from app.models.rag_models import RagResponse
 from app.rag import perform_rag_query
 from app.orchestrator import run_deep_research
+from app.checkpoints import new_run_id
+from app.core.graph_schema import bootstrap_graph_schemas
+from app.core.http_client import close_http_clients
+from app.core.registry import close_resources
+from app.ingestion import IngestionStats, ingest_directory
 from app.agents.feedback_agent import FeedbackAgent
 from app.reporting.utils import export_report_formats
 
@@ -27,8 +32,7 @@ def _slugify(text: str) -> str:
     """
     Converte uma string em um slug URL-friendly.
     """
-    text = re.sub(r'[^
-\w\s-]', '', text).strip().lower()
+    text = re.sub(r'[^\w\s-]', '', text).strip().lower()
     text = re.sub(r'[-\s]+', '_', text)
     return text
 
@@ -178,6 +182,43 @@ def automation_set_cron(
     console.print(f"  Revisão Trimestral: [cyan]{quarterly}[/cyan]")
 
 
+@app.command(name="schema")
+def graph_schema():
+    """Cria (de forma idempotente) as constraints e índices dos grafos Neo4j."""
+    reports = asyncio.run(bootstrap_graph_schemas())
+    for graph_name, report in reports.items():
+        console.print(
+            f"[bold]{graph_name}[/bold]: [green]{len(report['applied'])} aplicadas[/green], "
+            f"[red]{len(report['failed'])} com falha[/red]"
+        )
+        for statement in report["failed"]:
+            console.print(f"  [red]- {statement}[/red]")
+
+
+@app.command(name="ingest")
+def ingest(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, help="Diretório com os documentos (.txt, .md, .pdf)."),
+    collection: Optional[str] = typer.Option(
+        None, "--collection", "-c", help="Coleção de destino (padrão: database.chroma.collection)."
+    ),
+):
+    """Ingere em lote os documentos de um diretório na base vetorial."""
+    def report_progress(stats: IngestionStats):
+        progress = stats.as_dict()
+        console.print(
+            f"[dim]{progress['documents']} documentos, {progress['upserted']} trechos gravados, "
+            f"{progress['duplicates']} duplicados ({progress['chunks_per_second']} trechos/s)[/dim]"
+        )
+
+    stats = asyncio.run(ingest_directory(directory, collection_name=collection, on_progress=report_progress)).as_dict()
+    console.print(
+        f"[bold green]Ingestão concluída:[/bold green] {stats['documents']} documentos, "
+        f"{stats['chunks']} trechos, {stats['upserted']} gravados, {stats['duplicates']} duplicados, "
+        f"{stats['failed_documents']} com falha em {stats['elapsed_seconds']}s "
+        f"({stats['chunks_per_second']} trechos/s)."
+    )
+
+
 @app.command(name="rapida")
 def fast_query(
     query: str = typer.Argument(..., help="A pergunta para a consulta rápida baseada em RAG."),
@@ -256,8 +297,14 @@ def fast_query(
 
 @app.command(name="profunda")
 @asyncio_typer.wrap_async()
-def deep_research(
-    topic: str = typer.Argument(..., help="O tópico para a pesquisa profunda."),
+async def deep_research(
+    topic: Optional[str] = typer.Argument(None, help="O tópico para a pesquisa profunda (opcional com --resume)."),
+    resume: Optional[str] = typer.Option(
+        None,
+        "--resume",
+        "-r",
+        help="ID de uma execução anterior a retomar, reaproveitando nós, buscas e fontes já concluídos.",
+    ),
     search_limit: Optional[int] = typer.Option(
         None,
         "--search-limit",
@@ -306,9 +353,15 @@ def deep_research(
     Inicia uma pesquisa profunda e exaustiva sobre um tópico.
     """
     report_summary = ""
+    if not topic and not resume:
+        console.print("[bold red]Informe um tópico ou uma execução a retomar com --resume.[/bold red]")
+        return
+    run_id = resume or new_run_id()
+    console.print(f"ID da execução: [cyan]{run_id}[/cyan] (use --resume {run_id} para retomar em caso de falha)")
     try:
-        with console.status(f"[bold green]Executando Pesquisa Profunda sobre: '[cyan]{topic}[/cyan]\'...", spinner="dots"):
-            final_state = await run_deep_research(topic, search_limit)
+        with console.status(f"[bold green]Executando Pesquisa Profunda sobre: '[cyan]{topic or run_id}[/cyan]\'...", spinner="dots"):
+            final_state = await run_deep_research(topic, search_limit, run_id=run_id, resume=bool(resume))
+            topic = final_state.get("topic", topic)
 
             if output_format == OutputFormat.json:
                 console.print(json.dumps(final_state, indent=2, default=str))
@@ -361,7 +414,9 @@ def deep_research(
         logger.error("Erro crítico na orquestração da pesquisa profunda", exc_info=True)
     finally:
         if output_format == OutputFormat.text and report_summary:
-            asyncio.run(_prompt_for_feedback(topic, report_summary, "Deep Research"))
+            await _prompt_for_feedback(topic, report_summary, "Deep Research")
+        await close_http_clients()
+        await close_resources()
 
 
 def main():
@@ -3,7 +3,7 @@ import yaml
 from pathlib import Path
 from functools import lru_cache
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 # Define Pydantic models mirroring config.yaml structure
 
@@ -23,9 +23,13 @@ class Neo4jSettingsGroup(BaseModel):
     memory_agents: Neo4jDatabaseSettings
 
 class ChromaSettings(BaseModel):
+    client: Literal["http", "persistent"] = "http" # "http": servidor em host:port; "persistent": base local em persist_path
     host: str = "localhost"
     port: int = 8000
     collection: str = "provida_knowledge"
+    persist_path: str = "data/vector_db" # Base local, usada com client: persistent
+    embedding_model: str = "all-MiniLM-L6-v2" # Modelo SentenceTransformers, carregado uma vez por processo
+    warm_up: bool = True # Carrega o modelo de embeddings na inicialização da API
 
 class DatabaseSettings(BaseModel):
     neo4j: Neo4jSettingsGroup
@@ -100,17 +104,170 @@ class LoggingSettings(BaseModel):
 class RagSettings(BaseModel):
     n_results: int
 
+class RagCacheSettings(BaseModel):
+    enabled: bool = True # Cache semântico de respostas do modo rápido
+    similarity_threshold: float = 0.95 # Similaridade de cosseno mínima entre as perguntas
+    max_entries: int = 512 # Respostas mantidas em memória (as mais antigas são descartadas)
+    ttl_seconds: Optional[float] = 86400 # Validade de uma resposta (None = até a coleção mudar)
+
+class RetrievalSettings(BaseModel):
+    hybrid_enabled: bool = True # Combina a busca vetorial com o índice BM25 local (RRF)
+    candidates: int = 20 # Candidatos de cada busca antes da fusão
+    rrf_k: int = 60 # Constante da Reciprocal Rank Fusion
+    bm25_path: str = "data/cache/bm25" # Um índice JSON por coleção
+    rebuild_page_size: int = 1000 # Trechos lidos por página ao reconstruir o índice
+    rebuild_in_background: bool = True # Reconstrói o índice desatualizado fora da requisição
+    rerank_enabled: bool = False # Reordena os candidatos fundidos com um cross-encoder
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_candidates: int = 20 # Candidatos da fusão enviados ao cross-encoder
+
+class ResearchSettings(BaseModel):
+    streaming: bool = True # Coleta, análise e escrita no grafo em pipeline
+    queue_size: int = 32 # Capacidade das filas entre etapas (contrapressão)
+    analysis_workers: int = 4
+    kg_workers: int = 1
+    search_mode: Literal["route", "fan_out"] = "route" # "route": uma ferramenta por pergunta; "fan_out": todas, com fusão RRF
+    provider_deadlines: Dict[str, float] = Field(
+        default_factory=lambda: {"brave_search": 5.0, "pubmed_search": 10.0}
+    ) # Segundos até descartar a resposta de cada ferramenta no modo fan_out
+    default_deadline: float = 10.0 # Ferramentas sem prazo em provider_deadlines
+    rrf_k: int = 60 # Constante da Reciprocal Rank Fusion
+
+class BudgetSettings(BaseModel):
+    enabled: bool = True # Buscas limitadas por search_limit (ou search.deep_search_limit)
+    max_llm_calls: Optional[int] = 200 # Chamadas ao LLM por execução (None = ilimitado)
+    max_tokens: Optional[int] = 2000000 # Tokens estimados por execução (None = ilimitado)
+    reserved_llm_calls: int = 4 # Reservadas para a síntese e a verificação do relatório
+    reserved_tokens: int = 100000 # Reservados para a síntese e a verificação do relatório
+
+class RoutingSettings(BaseModel):
+    local_enabled: bool = True # Tenta palavras-chave (e embeddings) antes do LLM
+    min_keyword_confidence: float = 0.75 # Fração da pontuação de palavras-chave da ferramenta vencedora
+    embeddings_enabled: bool = False # Similaridade com a descrição das ferramentas (requer o modelo de embeddings)
+    min_embedding_margin: float = 0.05 # Diferença mínima de similaridade entre a 1ª e a 2ª ferramenta
+    cache_max_entries: int = 2048 # Decisões cacheadas por consulta normalizada
+
+class SourceDedupSettings(BaseModel):
+    near_duplicates: bool = False # Une também conteúdos quase idênticos (MinHash)
+    similarity_threshold: float = 0.9 # Similaridade de Jaccard estimada para considerar duplicata
+    minhash_permutations: int = 64
+    min_content_chars: int = 200 # Textos menores (ex: snippets) só são unidos por identificador
+
+class IngestionSettings(BaseModel):
+    chunk_size: int = 1000 # Caracteres por trecho (~256 tokens, o limite do all-MiniLM-L6-v2)
+    chunk_overlap: int = 150 # Caracteres repetidos entre trechos consecutivos
+    embedding_batch_size: int = 64 # Trechos por chamada ao modelo de embeddings
+    upsert_batch_size: int = 512 # Trechos por upsert no ChromaDB
+    queue_size: int = 8 # Lotes em espera entre etapas (contrapressão)
+    file_extensions: List[str] = Field(default_factory=lambda: [".txt", ".md", ".pdf"])
+
+class EmbeddingCacheSettings(BaseModel):
+    enabled: bool = True # Reaproveita embeddings de trechos já vistos (por modelo e hash do conteúdo)
+    path: str = "data/cache/embeddings" # Um par de arquivos .f32/.index por modelo
+
+class CheckpointSettings(BaseModel):
+    enabled: bool = True
+    path: str = "data/checkpoints/research_runs.sqlite"
+
+class AnalysisSettings(BaseModel):
+    batch_enabled: bool = True
+    batch_token_budget: int = 6000 # Tokens de entrada estimados por prompt em lote
+    max_batch_size: int = 8
+
+class KnowledgeGraphSettings(BaseModel):
+    bulk_chunk_size: int = 500 # Fontes por consulta UNWIND na escrita em lote
+
+class PubMedSettings(BaseModel):
+    batch_size: int = 200 # Artigos por página de efetch no download em lotes
+    max_concurrency: int = 3 # Páginas baixadas simultaneamente (sempre sob o limite de taxa do NCBI)
+    max_results: int = 1000 # Artigos por consulta no download em lotes
+    curation_max_results: int = 500 # Artigos por consulta nas tarefas de curadoria
+
+class SearchRateLimitSettings(BaseModel):
+    enabled: bool = True # Brave usa search.rate_limit (requisições por minuto)
+    pubmed_requests_per_second: Optional[float] = None # None: 10/s com ENTREZ_API_KEY, 3/s sem
+    max_retries: int = 3 # Novas tentativas após HTTP 429
+    default_retry_after_seconds: float = 10.0 # Pausa quando o 429 não traz Retry-After
+
+class SearchCacheSettings(BaseModel):
+    enabled: bool = True
+    path: str = "data/cache/search_results.sqlite"
+    max_entries: int = 20000 # Entradas mantidas em disco (as menos acessadas são removidas)
+    ttl_seconds: Dict[str, float] = Field(
+        default_factory=lambda: {"brave": 6 * 3600, "pubmed": 7 * 24 * 3600}
+    ) # Validade por provedor
+    default_ttl_seconds: float = 24 * 3600 # Provedores não listados em ttl_seconds
+    stale_while_revalidate_seconds: float = 24 * 3600 # Serve a resposta expirada e atualiza em segundo plano
+
+class HTTPClientSettings(BaseModel):
+    http2: bool = True # Requer o pacote 'h2' (httpx[http2]); sem ele usa HTTP/1.1
+    max_connections: int = 20 # Conexões simultâneas do cliente compartilhado
+    max_keepalive_connections: int = 10 # Conexões ociosas mantidas abertas
+    keepalive_expiry: float = 30.0 # Segundos até fechar uma conexão ociosa
+    connect_timeout: float = 5.0 # Timeout de conexão; o total vem de search.timeout
+
+class MemorySettings(BaseModel):
+    cache_max_entries: int = 4096 # Entradas do cache LRU em processo do MemoryAgent
+    cache_ttl_seconds: Optional[float] = 3600 # Validade das entradas do cache (None = sem expiração)
+    negative_cache_ttl_seconds: Optional[float] = 30 # Validade das chaves ausentes no grafo no cache
+    write_behind: bool = True # Agrupa as escritas de `remember` em lotes
+    flush_batch_size: int = 100 # Memórias pendentes que disparam uma gravação
+    flush_interval_seconds: float = 2.0 # Atraso máximo de uma memória pendente
+
+class VerificationSettings(BaseModel):
+    max_claims_per_query: int = 200 # Alegações por consulta UNWIND em bulk_verify
+    max_concurrency: int = 4 # Blocos simultâneos para listas maiores
+
+class LLMCacheSettings(BaseModel):
+    enabled: bool = True
+    memory_max_entries: int = 1024
+    disk_enabled: bool = True
+    disk_path: str = "data/cache/llm_responses.sqlite"
+    disk_max_entries: int = 50000
+    ttl_seconds: Optional[int] = 604800 # 7 dias
+    disabled_agents: List[str] = Field(default_factory=list)
+
+class ModelLimitSettings(BaseModel):
+    max_concurrency: int = 8
+    requests_per_minute: Optional[int] = 60
+    tokens_per_minute: Optional[int] = 1000000
+
+class LLMLimitsSettings(BaseModel):
+    enabled: bool = True
+    estimated_output_tokens: int = 1024
+    default: ModelLimitSettings = Field(default_factory=ModelLimitSettings)
+    models: Dict[str, ModelLimitSettings] = Field(default_factory=dict)
+
 class GlobalSettings(BaseModel):
     app: AppSettings
     database: DatabaseSettings
     minio: MinioSettings
     google: GoogleSettings
     rag: RagSettings
+    rag_cache: RagCacheSettings = Field(default_factory=RagCacheSettings)
+    retrieval: RetrievalSettings = Field(default_factory=RetrievalSettings)
     search: SearchSettings
     reporting: ReportingSettings
     automation: AutomationSettings
     logging: LoggingSettings # Add logging settings
     llm_models: ModelsSettings # This is already handled in get_settings to be moved here
+    research: ResearchSettings = Field(default_factory=ResearchSettings)
+    budget: BudgetSettings = Field(default_factory=BudgetSettings)
+    routing: RoutingSettings = Field(default_factory=RoutingSettings)
+    source_dedup: SourceDedupSettings = Field(default_factory=SourceDedupSettings)
+    ingestion: IngestionSettings = Field(default_factory=IngestionSettings)
+    embedding_cache: EmbeddingCacheSettings = Field(default_factory=EmbeddingCacheSettings)
+    checkpoints: CheckpointSettings = Field(default_factory=CheckpointSettings)
+    analysis: AnalysisSettings = Field(default_factory=AnalysisSettings)
+    knowledge_graph: KnowledgeGraphSettings = Field(default_factory=KnowledgeGraphSettings)
+    pubmed: PubMedSettings = Field(default_factory=PubMedSettings)
+    search_rate_limits: SearchRateLimitSettings = Field(default_factory=SearchRateLimitSettings)
+    search_cache: SearchCacheSettings = Field(default_factory=SearchCacheSettings)
+    http_client: HTTPClientSettings = Field(default_factory=HTTPClientSettings)
+    memory: MemorySettings = Field(default_factory=MemorySettings)
+    verification: VerificationSettings = Field(default_factory=VerificationSettings)
+    llm_cache: LLMCacheSettings = Field(default_factory=LLMCacheSettings)
+    llm_limits: LLMLimitsSettings = Field(default_factory=LLMLimitsSettings)
 
 @lru_cache
 def get_settings() -> GlobalSettings:
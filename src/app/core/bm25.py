@@ -0,0 +1,102 @@
+"""Índice invertido BM25 mantido localmente sobre os trechos da base vetorial."""
+
+import heapq
+import json
+import math
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Termos com hífen (ex: glp-1) são indexados inteiros e também por partes.
+_TOKEN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Minúsculas e sem acentos; siglas (RYGB, SG), nomes de fármacos e PMIDs viram termos exatos."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    tokens = []
+    for token in _TOKEN.findall(text):
+        tokens.append(token)
+        if "-" in token:
+            tokens.extend(token.split("-"))
+    return tokens
+
+
+class BM25Index:
+    """
+    Índice Okapi BM25: `postings[termo][id] = frequência` e o comprimento de cada documento.
+
+    Os IDs dos trechos são o hash do conteúdo, então um ID já indexado nunca muda de
+    texto e `add` o ignora. Para refletir remoções, reconstrua o índice.
+
+    `revision` guarda a revisão da coleção que o índice reflete (None se desconhecida).
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.revision: Optional[int] = None
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        if doc_id in self.lengths:
+            return
+        tokens = tokenize(text)
+        self.lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+        for token in tokens:
+            postings = self.postings.setdefault(token, {})
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> None:
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Retorna os `top_k` documentos com maior pontuação BM25 para `query`."""
+        if not self.lengths:
+            return []
+        total = len(self.lengths)
+        average_length = self._total_length / total or 1.0
+        scores: Dict[str, float] = {}
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(top_k, scores.items(), key=lambda entry: entry[1])
+
+    def save(self, path: str) -> None:
+        """Grava o índice em JSON, substituindo o arquivo de forma atômica."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(
+                {"k1": self.k1, "b": self.b, "revision": self.revision, "lengths": self.lengths, "postings": self.postings},
+                f,
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data["k1"], b=data["b"])
+        index.lengths = data["lengths"]
+        index.postings = data["postings"]
+        index.revision = data.get("revision")
+        index._total_length = sum(index.lengths.values())
+        return index
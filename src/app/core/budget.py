@@ -0,0 +1,117 @@
+"""Orçamento por execução de pesquisa profunda: buscas, chamadas ao LLM e tokens."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+
+class BudgetExceeded(Exception):
+    """O orçamento da execução não comporta a operação solicitada."""
+
+
+class RunBudget:
+    """
+    Limites de uma execução. `None` em um limite significa ilimitado.
+
+    Uma parte das chamadas e dos tokens (`reserved_llm_calls`, `reserved_tokens`) fica
+    reservada para a finalização (síntese e verificação), de modo que uma execução que
+    esgota o orçamento na coleta ou na análise ainda produza um relatório com os
+    resultados parciais. Só chamadas feitas dentro de `finalizing()` usam a reserva.
+    """
+
+    def __init__(
+        self,
+        max_searches: Optional[int] = None,
+        max_llm_calls: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        reserved_llm_calls: int = 0,
+        reserved_tokens: int = 0,
+    ):
+        self.max_searches = max_searches
+        self.max_llm_calls = max_llm_calls
+        self.max_tokens = max_tokens
+        self.reserved_llm_calls = reserved_llm_calls
+        self.reserved_tokens = reserved_tokens
+        self.searches = 0
+        self.llm_calls = 0
+        self.tokens = 0
+        self.denied_searches = 0
+        self.denied_llm_calls = 0
+
+    def try_spend_searches(self, amount: int = 1) -> bool:
+        """Consome `amount` buscas se couberem no orçamento; retorna False caso contrário."""
+        if self.max_searches is not None and self.searches + amount > self.max_searches:
+            self.denied_searches += amount
+            return False
+        self.searches += amount
+        return True
+
+    def reserve_llm_call(self, estimated_tokens: int) -> None:
+        """
+        Registra uma chamada ao LLM com o custo estimado.
+
+        Raises:
+            BudgetExceeded: Se a chamada ou os tokens estimados excederem o orçamento disponível.
+        """
+        finalizing = _finalizing.get()
+        call_limit = self._available(self.max_llm_calls, self.reserved_llm_calls, finalizing)
+        token_limit = self._available(self.max_tokens, self.reserved_tokens, finalizing)
+        if call_limit is not None and self.llm_calls + 1 > call_limit:
+            self.denied_llm_calls += 1
+            raise BudgetExceeded(f"Orçamento de chamadas ao LLM esgotado ({self.llm_calls}/{self.max_llm_calls}).")
+        if token_limit is not None and self.tokens + estimated_tokens > token_limit:
+            self.denied_llm_calls += 1
+            raise BudgetExceeded(f"Orçamento de tokens esgotado ({self.tokens}/{self.max_tokens}).")
+        self.llm_calls += 1
+        self.tokens += estimated_tokens
+
+    def adjust_tokens(self, delta: int) -> None:
+        """Corrige a estimativa de tokens de uma chamada após conhecer o uso real."""
+        self.tokens = max(0, self.tokens + delta)
+
+    @staticmethod
+    def _available(limit: Optional[int], reserved: int, finalizing: bool) -> Optional[int]:
+        if limit is None:
+            return None
+        return limit if finalizing else max(0, limit - reserved)
+
+    @property
+    def searches_exhausted(self) -> bool:
+        return self.max_searches is not None and self.searches >= self.max_searches
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "searches": self.searches,
+            "max_searches": self.max_searches,
+            "llm_calls": self.llm_calls,
+            "max_llm_calls": self.max_llm_calls,
+            "tokens": self.tokens,
+            "max_tokens": self.max_tokens,
+            "denied_searches": self.denied_searches,
+            "denied_llm_calls": self.denied_llm_calls,
+        }
+
+
+# Orçamento da execução corrente; propagado às tarefas criadas pelo grafo via contextvars.
+current_budget: ContextVar[Optional[RunBudget]] = ContextVar("current_budget", default=None)
+_finalizing: ContextVar[bool] = ContextVar("budget_finalizing", default=False)
+
+
+@contextmanager
+def budget_scope(budget: Optional[RunBudget]) -> Iterator[Optional[RunBudget]]:
+    """Define `budget` como orçamento corrente dentro do bloco."""
+    token = current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        current_budget.reset(token)
+
+
+@contextmanager
+def finalizing() -> Iterator[None]:
+    """Permite que as chamadas ao LLM dentro do bloco usem a reserva de finalização."""
+    token = _finalizing.set(True)
+    try:
+        yield
+    finally:
+        _finalizing.reset(token)
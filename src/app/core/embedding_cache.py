@@ -0,0 +1,206 @@
+"""Cache persistente de embeddings por (modelo, hash do trecho normalizado), em uma matriz float32 mapeada em memória."""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_FLOAT_SIZE = array("f").itemsize
+
+
+def normalize_chunk(text: str) -> str:
+    """Forma normalizada usada na chave: Unicode NFC e espaços colapsados."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(normalize_chunk(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings de um modelo gravados em disco, um vetor por linha.
+
+    `<modelo>.f32` guarda a matriz float32 (linhas de `dim` valores, só acrescentadas) e é
+    lida por `mmap`; `<modelo>.index` tem um cabeçalho JSON com o modelo e a dimensão e,
+    em seguida, o hash de cada linha, na mesma ordem. Os vetores são gravados antes do
+    índice, então uma escrita interrompida deixa no máximo linhas órfãs, ignoradas ao abrir.
+
+    Seguro entre threads e entre processos (a API e `provida ingest` podem usar o mesmo
+    diretório): as escritas são serializadas por uma trava de arquivo (`<modelo>.lock`) e,
+    antes de acrescentar, cada escritor lê as linhas que os outros gravaram no índice.
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        os.makedirs(directory, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]+", "_", model_name)
+        self.model_name = model_name
+        self.data_path = os.path.join(directory, f"{safe_name}.f32")
+        self.index_path = os.path.join(directory, f"{safe_name}.index")
+        self.lock_path = os.path.join(directory, f"{safe_name}.lock")
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self._rows: Dict[str, int] = {}
+        self._row_count = 0
+        self._index_offset = 0
+        self._lock = threading.Lock()
+        self._map: Optional[mmap.mmap] = None
+        with self._lock, self._file_lock():
+            self._load()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            hashes = [line.strip() for line in f if line.strip()]
+        if header.get("model") != self.model_name or not header.get("dim"):
+            logger.warning(f"Índice de embeddings '{self.index_path}' inválido; o cache será recriado.")
+            os.remove(self.index_path)
+            if os.path.exists(self.data_path):
+                os.remove(self.data_path)
+            return
+        self.dim = header["dim"]
+        row_size = self.dim * _FLOAT_SIZE
+        stored_rows = os.path.getsize(self.data_path) // row_size if os.path.exists(self.data_path) else 0
+        rows = min(stored_rows, len(hashes))
+        # Descarta o que uma escrita interrompida deixou sem par, para que as próximas linhas fiquem alinhadas.
+        with open(self.data_path, "ab") as f:
+            f.truncate(rows * row_size)
+        if len(hashes) > rows:
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(header) + "\n" + "".join(f"{digest}\n" for digest in hashes[:rows]))
+        self._rows = {}
+        self._row_count = 0
+        self._add_rows(hashes[:rows])
+        self._index_offset = os.path.getsize(self.index_path)
+
+    def _add_rows(self, digests: Iterable[str]) -> None:
+        for digest in digests:
+            self._rows.setdefault(digest, self._row_count)
+            self._row_count += 1
+
+    def _sync(self) -> None:
+        """Lê as linhas acrescentadas ao índice por outros processos desde a última leitura."""
+        if not os.path.exists(self.index_path) or os.path.getsize(self.index_path) == self._index_offset:
+            return
+        if self.dim is None:
+            self._load()
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            appended = f.read()
+        self._index_offset += len(appended)
+        self._add_rows(line.strip() for line in appended.decode("utf-8").splitlines() if line.strip())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _row(self, row: int) -> List[float]:
+        start = row * self.dim * _FLOAT_SIZE
+        end = start + self.dim * _FLOAT_SIZE
+        if self._map is None or len(self._map) < end:
+            # O arquivo cresceu desde o último mapeamento.
+            if self._map is not None:
+                self._map.close()
+            with open(self.data_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        vector = array("f")
+        vector.frombytes(self._map[start:end])
+        return vector.tolist()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Retorna o embedding em cache de cada texto, ou None para os ausentes."""
+        digests = [chunk_hash(text) for text in texts]
+        with self._lock:
+            vectors = [self._row(self._rows[d]) if d in self._rows else None for d in digests]
+        found = sum(1 for vector in vectors if vector is not None)
+        self.hits += found
+        self.misses += len(vectors) - found
+        return vectors
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Acrescenta os embeddings de `texts` que ainda não estão no cache."""
+        with self._lock, self._file_lock():
+            self._sync()
+            new_rows = {}
+            for text, vector in zip(texts, vectors):
+                digest = chunk_hash(text)
+                if digest not in self._rows and digest not in new_rows:
+                    new_rows[digest] = vector
+            if not new_rows:
+                return
+            dims = {len(vector) for vector in new_rows.values()}
+            if len(dims) > 1 or (self.dim is not None and dims != {self.dim}):
+                raise ValueError(f"Embeddings com dimensões {sorted(dims)}; esperado {self.dim}.")
+            if self.dim is None:
+                self.dim = len(next(iter(new_rows.values())))
+                header = json.dumps({"model": self.model_name, "dim": self.dim}) + "\n"
+                with open(self.index_path, "w", encoding="utf-8") as f:
+                    f.write(header)
+                open(self.data_path, "wb").close()
+                self._index_offset = len(header.encode("utf-8"))
+
+            with open(self.data_path, "ab") as f:
+                for vector in new_rows.values():
+                    f.write(array("f", vector).tobytes())
+            lines = "".join(f"{digest}\n" for digest in new_rows)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self._index_offset += len(lines.encode("utf-8"))
+            self._add_rows(new_rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+class CachedEmbeddingFunction:
+    """
+    Envolve uma função de embeddings do ChromaDB: textos já vistos são lidos do
+    `EmbeddingCache` e apenas os demais são enviados ao modelo, em uma única chamada.
+    """
+
+    def __init__(self, embedding_function: Any, cache: EmbeddingCache):
+        self._embedding_function = embedding_function
+        self.cache = cache
+
+    def __call__(self, input: Sequence[str]) -> List[List[float]]:
+        texts = list(input)
+        vectors = self.cache.get_many(texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self._embedding_function([texts[index] for index in missing])
+            computed = [list(map(float, vector)) for vector in computed]
+            self.cache.put_many([texts[index] for index in missing], computed)
+            for index, vector in zip(missing, computed):
+                vectors[index] = vector
+        return vectors
@@ -0,0 +1,117 @@
+"""Migração idempotente de constraints, índices e propriedades de busca dos grafos de conhecimento e de memória."""
+
+import logging
+from typing import Any, Dict, List, Sequence
+
+from app.config.settings import settings
+from app.core.db.neo4j_manager import execute_query
+from app.core.registry import get_shared_neo4j_driver
+
+logger = logging.getLogger(__name__)
+
+# Cada MERGE do KnowledgeGraphAgent usa uma destas propriedades como chave de busca.
+KNOWLEDGE_SCHEMA: List[str] = [
+    "CREATE CONSTRAINT topic_name_unique IF NOT EXISTS FOR (n:Topic) REQUIRE n.name IS UNIQUE",
+    "CREATE CONSTRAINT source_identifier_unique IF NOT EXISTS FOR (n:Source) REQUIRE n.identifier IS UNIQUE",
+    "CREATE CONSTRAINT keyword_name_unique IF NOT EXISTS FOR (n:Keyword) REQUIRE n.name IS UNIQUE",
+    "CREATE CONSTRAINT evidence_level_unique IF NOT EXISTS FOR (n:EvidenceLevel) REQUIRE n.level IS UNIQUE",
+    # Resumos são longos demais para um índice de intervalo sobre o texto; o MERGE
+    # (text, source_identifier) é resolvido pelo índice em source_identifier e o
+    # índice de texto atende buscas pelo conteúdo.
+    "CREATE INDEX summary_source_identifier IF NOT EXISTS FOR (n:Summary) ON (n.source_identifier)",
+    "CREATE TEXT INDEX summary_text IF NOT EXISTS FOR (n:Summary) ON (n.text)",
+    # Propriedades normalizadas usadas pelo VerificationAgent para resolver sujeito e objeto.
+    "CREATE INDEX entity_lookup IF NOT EXISTS FOR (n:Entity) ON (n.lookup)",
+    "CREATE TEXT INDEX summary_lookup IF NOT EXISTS FOR (n:Summary) ON (n.lookup)",
+]
+
+# Preenche `lookup` em nós gravados antes da propriedade existir (idempotente). Cada
+# instrução atualiza no máximo `$batch_size` nós e é repetida até não restar nenhum, para
+# que a migração de um grafo grande não precise de uma única transação com todos os nós.
+KNOWLEDGE_BACKFILL: List[str] = [
+    "MATCH (n:Topic) WHERE n.lookup IS NULL AND n.name IS NOT NULL"
+    " WITH n LIMIT $batch_size SET n:Entity, n.lookup = toLower(n.name) RETURN count(n) AS updated",
+    "MATCH (n:Source) WHERE n.lookup IS NULL AND n.identifier IS NOT NULL"
+    " WITH n LIMIT $batch_size SET n:Entity, n.lookup = toLower(n.identifier) RETURN count(n) AS updated",
+    "MATCH (n:Keyword) WHERE n.lookup IS NULL AND n.name IS NOT NULL"
+    " WITH n LIMIT $batch_size SET n:Entity, n.lookup = toLower(n.name) RETURN count(n) AS updated",
+    "MATCH (n:EvidenceLevel) WHERE n.lookup IS NULL AND n.level IS NOT NULL"
+    " WITH n LIMIT $batch_size SET n:Entity, n.lookup = toLower(n.level) RETURN count(n) AS updated",
+    "MATCH (n:Summary) WHERE n.lookup IS NULL AND n.text IS NOT NULL"
+    " WITH n LIMIT $batch_size SET n.lookup = toLower(n.text) RETURN count(n) AS updated",
+]
+
+BACKFILL_BATCH_SIZE = 10_000
+
+# Chaves usadas pelo MemoryAgent.
+MEMORY_SCHEMA: List[str] = [
+    "CREATE CONSTRAINT agent_id_unique IF NOT EXISTS FOR (n:Agent) REQUIRE n.id IS UNIQUE",
+    "CREATE CONSTRAINT memory_agent_key_unique IF NOT EXISTS FOR (n:Memory) REQUIRE (n.agent_id, n.key) IS UNIQUE",
+]
+
+
+async def apply_schema(
+    driver: Any, database: str, statements: List[str], backfills: Sequence[str] = ()
+) -> Dict[str, List[str]]:
+    """
+    Executa as instruções de schema em um banco. Todas usam `IF NOT EXISTS`, então
+    reexecutar é seguro.
+
+    Em seguida executa cada instrução de `backfills` em lotes de `BACKFILL_BATCH_SIZE` nós,
+    repetindo-a até que um lote não atualize nenhum nó.
+
+    Uma instrução que falha (ex: dados duplicados impedindo uma constraint de unicidade)
+    é registrada e não interrompe as demais.
+
+    Returns:
+        Dict[str, List[str]]: As instruções aplicadas (`applied`) e as que falharam (`failed`).
+    """
+    report: Dict[str, List[str]] = {"applied": [], "failed": []}
+    for statement in statements:
+        try:
+            await execute_query(driver, database, statement)
+            report["applied"].append(statement)
+        except Exception as e:
+            logger.error(f"Falha ao aplicar schema no banco '{database}': {statement}\n{e}")
+            report["failed"].append(statement)
+
+    for statement in backfills:
+        try:
+            total = 0
+            while True:
+                result = await execute_query(driver, database, statement, {"batch_size": BACKFILL_BATCH_SIZE})
+                updated = result[0].get("updated", 0) if result else 0
+                total += updated
+                if updated == 0:
+                    break
+            if total:
+                logger.info(f"Backfill no banco '{database}' atualizou {total} nós: {statement}")
+            report["applied"].append(statement)
+        except Exception as e:
+            logger.error(f"Falha ao aplicar backfill no banco '{database}': {statement}\n{e}")
+            report["failed"].append(statement)
+    return report
+
+
+async def bootstrap_graph_schemas() -> Dict[str, Dict[str, List[str]]]:
+    """
+    Cria as constraints e índices dos grafos de conhecimento e de memória.
+
+    Chamado na inicialização da aplicação e pelo comando `provida schema`.
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: O relatório de `apply_schema` por banco.
+    """
+    targets = {
+        "knowledge": (settings.database.neo4j_knowledge, KNOWLEDGE_SCHEMA, KNOWLEDGE_BACKFILL),
+        "memory": (settings.database.neo4j_memory_agents, MEMORY_SCHEMA, ()),
+    }
+    reports = {}
+    for name, (db_settings, statements, backfills) in targets.items():
+        driver = get_shared_neo4j_driver(db_settings)
+        reports[name] = await apply_schema(driver, db_settings.database, statements, backfills)
+        logger.info(
+            f"Schema do grafo '{name}': {len(reports[name]['applied'])} instruções aplicadas, "
+            f"{len(reports[name]['failed'])} falharam."
+        )
+    return reports
@@ -0,0 +1,61 @@
+"""Cliente HTTP assíncrono compartilhado (keep-alive e HTTP/2) usado pelas ferramentas de busca."""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Dict
+
+import httpx
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Um `httpx.AsyncClient` pertence ao event loop em que foi criado; a CLI executa cada
+# comando em um loop próprio (`asyncio.run`), então mantemos um cliente por loop.
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_client() -> httpx.AsyncClient:
+    http_settings = settings.http_client
+    http2 = http_settings.http2 and _http2_available()
+    if http_settings.http2 and not http2:
+        logger.warning("Pacote 'h2' não instalado; o cliente HTTP usará HTTP/1.1. Instale 'httpx[http2]'.")
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(settings.search.timeout, connect=http_settings.connect_timeout),
+        limits=httpx.Limits(
+            max_connections=http_settings.max_connections,
+            max_keepalive_connections=http_settings.max_keepalive_connections,
+            keepalive_expiry=http_settings.keepalive_expiry,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP compartilhado do event loop atual, criando-o na primeira chamada.
+
+    As conexões (TCP/TLS) ficam abertas entre requisições e são reaproveitadas por todas as
+    buscas concorrentes do processo. Não feche o cliente retornado; use `close_http_clients()`
+    no desligamento da aplicação.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _build_client()
+    return client
+
+
+async def close_http_clients() -> None:
+    """Fecha o cliente do event loop atual e descarta os de loops já encerrados."""
+    loop = asyncio.get_running_loop()
+    for client_loop in list(_clients):
+        if client_loop is loop:
+            await _clients.pop(client_loop).aclose()
+        elif client_loop.is_closed():
+            _clients.pop(client_loop)
@@ -1,6 +1,264 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
 import google.generativeai as genai
 import os
-from app.config.settings import settings
+from typing import Any, Dict, Optional, Tuple
+from app.config.settings import settings, ModelLimitSettings
+from app.core.budget import current_budget
+from app.core.cache import LRUCache, SQLiteCache, TieredCache
+from app.core.rate_limiting import AsyncTokenBucket
+from app.core.registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """Resposta servida pelo cache; expõe `.text` como as respostas do Gemini."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.from_cache = True
+
+
+class LLMResponseCache:
+    """
+    Cache de respostas do LLM endereçado pelo conteúdo da requisição.
+
+    A chave é um hash SHA-256 do nome do modelo, do prompt e dos parâmetros de geração,
+    de modo que prompts idênticos reutilizem a resposta anterior.
+    """
+
+    def __init__(self, store: TieredCache):
+        self.store = store
+
+    @staticmethod
+    def make_key(model_name: str, prompt: Any, params: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "params": params},
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.store.get, key)
+
+    async def set(self, key: str, text: str) -> None:
+        await asyncio.to_thread(self.store.set, key, text)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna os contadores de acertos/erros de cada nível do cache."""
+        stats = {"total": self.store.stats.as_dict(), "memory": self.store.memory.stats.as_dict()}
+        if self.store.disk is not None:
+            stats["disk"] = self.store.disk.stats.as_dict()
+        return stats
+
+
+class CachedModel:
+    """
+    Envolve um modelo Gemini e serve `generate_content_async` a partir do cache quando possível.
+
+    Os demais atributos são delegados ao modelo original.
+    """
+
+    def __init__(self, model: Any, model_name: str, cache: LLMResponseCache):
+        self._model = model
+        self._model_name = model_name
+        self._cache = cache
+
+    async def generate_content_async(self, contents: Any, **kwargs: Any) -> Any:
+        key = LLMResponseCache.make_key(self._model_name, contents, kwargs)
+        cached_text = await self._cache.get(key)
+        if cached_text is not None:
+            logger.debug(f"Resposta do modelo '{self._model_name}' servida pelo cache.")
+            return CachedResponse(cached_text)
+
+        response = await self._model.generate_content_async(contents, **kwargs)
+        try:
+            text = response.text
+        except Exception:
+            # Respostas bloqueadas ou sem candidatos não expõem `.text`; não são cacheadas.
+            return response
+        await self._cache.set(key, text)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
+
+
+class ModelLimiter:
+    """
+    Limita as chamadas a um modelo: concorrência máxima, requisições e tokens por minuto.
+
+    Os chamadores aguardam em fila (FIFO) em vez de falhar; a profundidade da fila e o
+    tempo de espera são contabilizados em `metrics()`.
+    """
+
+    def __init__(self, model_name: str, limits: ModelLimitSettings):
+        self.model_name = model_name
+        self.limits = limits
+        # O semáforo e os baldes pertencem ao event loop em que são aguardados; como a CLI,
+        # o agendador e src/main.py usam loops próprios, há um conjunto por loop. Só os
+        # contadores de `metrics()` são globais.
+        self._loops: Dict[asyncio.AbstractEventLoop, Tuple[asyncio.Semaphore, Optional[AsyncTokenBucket], Optional[AsyncTokenBucket]]] = {}
+        self.queued = 0
+        self.in_flight = 0
+        self.total_requests = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def run(self, call, estimated_tokens: int):
+        """Executa `call()` assim que houver capacidade disponível para o modelo."""
+        semaphore, requests, tokens = self._primitives()
+        started_at = time.monotonic()
+        self.queued += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+        try:
+            if requests is not None:
+                await requests.acquire(1)
+            if tokens is not None:
+                await tokens.acquire(estimated_tokens)
+            waited = time.monotonic() - started_at
+            self.total_requests += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            if waited > 1:
+                logger.debug(f"Chamada ao modelo '{self.model_name}' aguardou {waited:.2f}s na fila.")
+
+            self.in_flight += 1
+            try:
+                response = await call()
+            finally:
+                self.in_flight -= 1
+        finally:
+            semaphore.release()
+
+        actual_tokens = _total_token_count(response)
+        if tokens is not None and actual_tokens and actual_tokens > estimated_tokens:
+            tokens.consume(actual_tokens - estimated_tokens)
+        return response
+
+    def _primitives(self) -> Tuple[asyncio.Semaphore, Optional[AsyncTokenBucket], Optional[AsyncTokenBucket]]:
+        """Retorna o semáforo e os baldes do event loop atual, descartando os de loops já encerrados."""
+        loop = asyncio.get_running_loop()
+        primitives = self._loops.get(loop)
+        if primitives is None:
+            for closed_loop in [other for other in self._loops if other.is_closed()]:
+                del self._loops[closed_loop]
+            limits = self.limits
+            primitives = self._loops[loop] = (
+                asyncio.Semaphore(limits.max_concurrency),
+                AsyncTokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None,
+                AsyncTokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None,
+            )
+        return primitives
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "total_requests": self.total_requests,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "avg_wait_seconds": round(self.total_wait_seconds / self.total_requests, 3) if self.total_requests else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+def _total_token_count(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None) if usage is not None else None
+
+
+def _estimate_tokens(contents: Any) -> int:
+    # Estimativa grosseira (~4 caracteres por token); corrigida após a resposta via usage_metadata.
+    return len(str(contents)) // 4 + settings.llm_limits.estimated_output_tokens
+
+
+class LLMGovernor:
+    """Mantém um `ModelLimiter` compartilhado por nome de modelo, configurado em `settings.llm_limits`."""
+
+    def __init__(self):
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def limiter_for(self, model_name: str) -> ModelLimiter:
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limits = settings.llm_limits.models.get(model_name, settings.llm_limits.default)
+            limiter = self._limiters[model_name] = ModelLimiter(model_name, limits)
+        return limiter
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.metrics() for name, limiter in self._limiters.items()}
+
+
+class GovernedModel:
+    """Envolve um modelo Gemini para que `generate_content_async` passe pelo `ModelLimiter`."""
+
+    def __init__(self, model: Any, limiter: ModelLimiter):
+        self._model = model
+        self._limiter = limiter
+
+    async def generate_content_async(self, contents: Any, **kwargs: Any) -> Any:
+        return await self._limiter.run(
+            lambda: self._model.generate_content_async(contents, **kwargs), _estimate_tokens(contents)
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
+
+
+class BudgetedModel:
+    """
+    Envolve um modelo Gemini para que cada chamada seja descontada do orçamento da
+    execução corrente (`app.core.budget.current_budget`), se houver.
+
+    Fica abaixo do `CachedModel`: respostas servidas pelo cache não consomem orçamento.
+
+    Raises:
+        BudgetExceeded: Em `generate_content_async`, se o orçamento não comportar a chamada.
+    """
+
+    def __init__(self, model: Any):
+        self._model = model
+
+    async def generate_content_async(self, contents: Any, **kwargs: Any) -> Any:
+        budget = current_budget.get()
+        if budget is None:
+            return await self._model.generate_content_async(contents, **kwargs)
+
+        estimated_tokens = _estimate_tokens(contents)
+        budget.reserve_llm_call(estimated_tokens)
+        response = await self._model.generate_content_async(contents, **kwargs)
+        actual_tokens = _total_token_count(response)
+        if actual_tokens:
+            budget.adjust_tokens(actual_tokens - estimated_tokens)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._model, name)
+
+
+def _build_response_cache() -> Optional[LLMResponseCache]:
+    cache_settings = settings.llm_cache
+    if not cache_settings.enabled:
+        return None
+    memory = LRUCache(max_entries=cache_settings.memory_max_entries, ttl_seconds=cache_settings.ttl_seconds)
+    disk = None
+    if cache_settings.disk_enabled:
+        disk = SQLiteCache(
+            cache_settings.disk_path,
+            max_entries=cache_settings.disk_max_entries,
+            ttl_seconds=cache_settings.ttl_seconds,
+        )
+    return LLMResponseCache(TieredCache(memory, disk))
+
 
 class LLMProvider:
     def __init__(self):
@@ -8,14 +266,45 @@ class LLMProvider:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables.")
         genai.configure(api_key=api_key)
+        self.response_cache = _build_response_cache()
+        self.governor = LLMGovernor() if settings.llm_limits.enabled else None
+
+    def get_model(self, model_name: str, agent_name: Optional[str] = None):
+        """Returns a configured Gemini model.
 
-    def get_model(self, model_name: str):
-        """Returns a configured Gemini model."""
+        Calls go through the shared per-model limiter (`settings.llm_limits`). When the
+        response cache is enabled, the model is also wrapped so identical prompts are
+        served from the cache without consuming rate-limit capacity or the run budget
+        (`app.core.budget`). Agents listed in
+        `settings.llm_cache.disabled_agents` receive an uncached model.
+
+        Models are shared through the resource registry (`app.core.registry`), so agents
+        asking for the same model reuse one instance.
+        """
+        cached = self.response_cache is not None and agent_name not in settings.llm_cache.disabled_agents
+        return get_registry().get(("model", model_name, cached), lambda: self._build_model(model_name, cached))
+
+    def _build_model(self, model_name: str, cached: bool):
         try:
             model = genai.GenerativeModel(model_name)
-            return model
         except Exception as e:
             raise ValueError(f"Failed to load model {model_name}: {e}")
 
+        if self.governor is not None:
+            model = GovernedModel(model, self.governor.limiter_for(model_name))
+        model = BudgetedModel(model)
+
+        if not cached:
+            return model
+        return CachedModel(model, model_name, self.response_cache)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for the LLM response cache."""
+        return self.response_cache.stats() if self.response_cache else {}
+
+    def limiter_metrics(self) -> Dict[str, Any]:
+        """Returns queue depth and wait-time metrics per model."""
+        return self.governor.metrics() if self.governor else {}
+
 # Instantiate the LLMProvider globally or as needed
 llm_provider = LLMProvider()
@@ -0,0 +1,34 @@
+"""Fusão de listas ranqueadas vindas de fontes diferentes."""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Combina várias listas ranqueadas com Reciprocal Rank Fusion (RRF).
+
+    Cada item recebe `weight / (k + posição)` de cada lista em que aparece (posição a
+    partir de 1); itens presentes em várias listas somam as contribuições. Só a ordem
+    importa, então listas com escalas de pontuação diferentes podem ser combinadas.
+
+    Args:
+        rankings (Sequence[Sequence[Hashable]]): As listas, cada uma do melhor para o pior item.
+        k (int): Constante de suavização; valores maiores reduzem o peso das primeiras posições.
+        weights (Optional[Sequence[float]]): Peso de cada lista (padrão: 1.0 para todas).
+
+    Returns:
+        List[Tuple[Hashable, float]]: Os itens e suas pontuações, da maior para a menor.
+            Empates mantêm a ordem em que o item apareceu pela primeira vez.
+    """
+    weights = weights if weights is not None else [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        # Repetições dentro da mesma lista são ignoradas e não ocupam posição.
+        unique = list(dict.fromkeys(ranking))
+        for position, item in enumerate(unique, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + position)
+    return sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
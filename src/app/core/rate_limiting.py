@@ -0,0 +1,194 @@
+"""Primitivas assíncronas de limitação de taxa compartilhadas pela aplicação."""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+class AsyncTokenBucket:
+    """
+    Balde de tokens assíncrono com enfileiramento justo (FIFO).
+
+    Os tokens são repostos continuamente a `rate_per_minute / 60` por segundo até
+    `capacity`. Chamadores de `acquire` aguardam em ordem de chegada em vez de falhar
+    quando o balde está vazio.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute deve ser positivo.")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Aguarda até que `amount` tokens estejam disponíveis e os consome.
+
+        Pedidos maiores que a capacidade são limitados à capacidade do balde para
+        não bloquear para sempre.
+
+        Returns:
+            float: O tempo, em segundos, passado aguardando.
+        """
+        amount = min(amount, self.capacity)
+        started_at = time.monotonic()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return time.monotonic() - started_at
+                await asyncio.sleep((amount - self._tokens) / self.rate_per_second)
+
+    def consume(self, amount: float) -> None:
+        """
+        Consome tokens sem aguardar, permitindo saldo negativo.
+
+        Útil para corrigir uma estimativa depois que o custo real é conhecido; o
+        débito é pago pelos próximos chamadores de `acquire`.
+        """
+        self._refill()
+        self._tokens -= amount
+
+
+class Priority(IntEnum):
+    """Prioridade de uma requisição; valores menores são atendidos primeiro."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Prioridade das requisições feitas no contexto atual. Consultas da CLI e da API são
+# interativas por padrão; tarefas de curadoria marcam-se como BACKGROUND.
+request_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.INTERACTIVE)
+
+
+def with_priority(priority: Priority) -> Callable:
+    """Decorador que executa a corrotina com `request_priority` definido como `priority`."""
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = request_priority.set(priority)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                request_priority.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+class RateLimitExceeded(Exception):
+    """O provedor respondeu HTTP 429; `retry_after` é a pausa pedida, em segundos, se informada."""
+
+    def __init__(self, provider: str, retry_after: Optional[float] = None):
+        super().__init__(f"Limite de requisições do provedor '{provider}' excedido.")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Interpreta o cabeçalho `Retry-After` (segundos ou data HTTP) e retorna a pausa em segundos."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class PriorityRateLimiter:
+    """
+    Balde de tokens com fila de prioridade: quando há espera, requisições INTERACTIVE
+    são liberadas antes das BACKGROUND; dentro da mesma prioridade, a ordem é de chegada.
+
+    `penalize` suspende todas as liberações por um intervalo, usado quando o provedor
+    responde 429 com `Retry-After`.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute deve ser positivo.")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[Tuple[int, int]] = []
+        self._counter = itertools.count()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def penalize(self, seconds: float) -> None:
+        """Bloqueia novas liberações pelos próximos `seconds` segundos."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self, priority: Optional[Priority] = None) -> float:
+        """
+        Aguarda a vez da requisição e consome um token.
+
+        Args:
+            priority (Optional[Priority]): A prioridade; padrão: `request_priority` do contexto.
+
+        Returns:
+            float: O tempo, em segundos, passado aguardando.
+        """
+        priority = request_priority.get() if priority is None else priority
+        started_at = time.monotonic()
+        ticket = (int(priority), next(self._counter))
+        heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                self._refill()
+                now = time.monotonic()
+                delay = max(
+                    self._blocked_until - now,
+                    (1 - self._tokens) / self.rate_per_second if self._tokens < 1 else 0.0,
+                )
+                if delay <= 0 and self._waiters[0] == ticket:
+                    heapq.heappop(self._waiters)
+                    self._tokens -= 1
+                    return time.monotonic() - started_at
+                # Quem não está à frente da fila reavalia quando o próximo token estiver disponível,
+                # pois pode ter sido ultrapassado por uma requisição de maior prioridade.
+                await asyncio.sleep(delay)
+        finally:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
@@ -0,0 +1,109 @@
+"""Registro de recursos compartilhados do processo: agentes, modelos e drivers do Neo4j."""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResourceRegistry:
+    """
+    Mantém uma instância por chave, criada na primeira chamada a `get` e reutilizada
+    nas seguintes. Recursos registrados com `close` são liberados por `aclose()`, na
+    ordem inversa da criação (agentes antes dos drivers que eles usam).
+    """
+
+    def __init__(self):
+        self._resources: Dict[Hashable, Any] = {}
+        self._closers: List[Tuple[Hashable, Callable[[Any], Any]]] = []
+
+    def get(self, key: Hashable, factory: Callable[[], T], close: Optional[Callable[[T], Any]] = None) -> T:
+        """
+        Retorna o recurso `key`, criando-o com `factory()` se ainda não existir.
+
+        Args:
+            key (Hashable): Identificador do recurso.
+            factory (Callable[[], T]): Cria o recurso.
+            close (Optional[Callable[[T], Any]]): Libera o recurso em `aclose()`; pode ser uma corrotina.
+        """
+        if key not in self._resources:
+            self._resources[key] = factory()
+            if close is not None:
+                self._closers.append((key, close))
+        return self._resources[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._resources
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    async def aclose(self) -> None:
+        """Libera os recursos registrados e esvazia o registro. Falhas são apenas registradas em log."""
+        closers, self._closers = self._closers, []
+        resources, self._resources = self._resources, {}
+        for key, close in reversed(closers):
+            try:
+                result = close(resources[key])
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Falha ao liberar o recurso {key!r}: {e}")
+
+
+# Drivers assíncronos e clientes de modelo pertencem ao event loop em que são usados pela
+# primeira vez; como a CLI executa cada comando em um loop próprio (`asyncio.run`), há um
+# registro por loop. Objetos criados fora de um loop ficam no registro da chave None.
+_registries: Dict[Optional[asyncio.AbstractEventLoop], ResourceRegistry] = {}
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_registry() -> ResourceRegistry:
+    """Retorna o registro do event loop atual, criando-o na primeira chamada."""
+    loop = _current_loop()
+    registry = _registries.get(loop)
+    if registry is None:
+        registry = _registries[loop] = ResourceRegistry()
+    return registry
+
+
+def get_agent(agent_class: Type[T], *args: Any, **kwargs: Any) -> T:
+    """
+    Retorna a instância compartilhada de `agent_class(*args, **kwargs)`.
+
+    Agentes guardam apenas modelos, drivers e configuração, de modo que a mesma
+    instância pode atender execuções sucessivas e concorrentes (API e agendador).
+    """
+    key = ("agent", agent_class, args, tuple(sorted(kwargs.items())))
+    return get_registry().get(key, lambda: agent_class(*args, **kwargs))
+
+
+def get_shared_neo4j_driver(db_settings: Any) -> Any:
+    """Retorna um driver do Neo4j por servidor e usuário, fechado em `close_resources()`."""
+    from app.core.db.neo4j_manager import get_neo4j_driver
+
+    key = ("neo4j", db_settings.uri, db_settings.user)
+    return get_registry().get(key, lambda: get_neo4j_driver(db_settings), close=lambda driver: driver.close())
+
+
+async def close_resources() -> None:
+    """
+    Libera os recursos do event loop atual e os criados fora de um loop, e descarta os
+    registros de loops já encerrados. Chamado no desligamento da API, do agendador e da CLI.
+    """
+    loop = _current_loop()
+    for registry_loop in list(_registries):
+        if registry_loop is loop or registry_loop is None:
+            await _registries.pop(registry_loop).aclose()
+        elif registry_loop.is_closed():
+            _registries.pop(registry_loop)
@@ -0,0 +1,196 @@
+"""Recuperação híbrida de trechos: BM25 local + busca vetorial, fundidas por RRF, com reordenação opcional."""
+
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config.settings import settings
+from app.core.bm25 import BM25Index
+from app.core.ranking import reciprocal_rank_fusion
+from app.core.vector_db import get_collection_revision, get_cross_encoder
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_indexes: Dict[str, BM25Index] = {}
+_collection_locks: Dict[str, threading.Lock] = {}
+_rebuilds: Dict[str, threading.Thread] = {}
+
+
+def _index_path(collection_name: str) -> str:
+    safe_name = re.sub(r"[^\w.-]+", "_", collection_name)
+    return os.path.join(settings.retrieval.bm25_path, f"{safe_name}.json")
+
+
+def load_bm25_index(collection_name: str) -> Optional[BM25Index]:
+    """Retorna o índice BM25 da coleção em memória ou em disco, sem verificar se está atualizado."""
+    with _lock:
+        index = _indexes.get(collection_name)
+    path = _index_path(collection_name)
+    if index is not None or not os.path.exists(path):
+        return index
+    # A leitura do JSON acontece fora de `_lock`; se outra thread carregou antes, vale o dela.
+    loaded = BM25Index.load(path)
+    with _lock:
+        return _indexes.setdefault(collection_name, loaded)
+
+
+def _collection_lock(collection_name: str) -> threading.Lock:
+    with _lock:
+        return _collection_locks.setdefault(collection_name, threading.Lock())
+
+
+def save_bm25_index(collection_name: str) -> None:
+    """Grava em disco o índice em memória da coleção, fora de `_lock` para não bloquear as consultas."""
+    with _lock:
+        index = _indexes.get(collection_name)
+    if index is not None:
+        with _collection_lock(collection_name):
+            index.save(_index_path(collection_name))
+
+
+def _collection_version(collection_name: str, collection: Any) -> Tuple[int, int]:
+    return collection.count(), get_collection_revision(collection_name)
+
+
+def _is_current(index: Optional[BM25Index], version: Tuple[int, int]) -> bool:
+    # Só o tamanho não basta: trechos trocados na mesma quantidade mudam apenas a revisão.
+    return index is not None and (len(index), index.revision) == version
+
+
+def _rebuild(collection: Any) -> BM25Index:
+    index = BM25Index()
+    page_size = settings.retrieval.rebuild_page_size
+    offset = 0
+    while True:
+        page = collection.get(include=["documents"], limit=page_size, offset=offset)
+        ids = page.get("ids") or []
+        # Trechos sem texto (só embedding) entram sem termos, para que o tamanho do índice
+        # continue igual ao da coleção.
+        index.add_many((chunk_id, document or "") for chunk_id, document in zip(ids, page.get("documents") or []))
+        if len(ids) < page_size:
+            return index
+        offset += page_size
+
+
+def _rebuild_if_stale(collection_name: str, collection: Any) -> BM25Index:
+    with _collection_lock(collection_name):
+        # Outra thread pode ter reconstruído o índice enquanto esta esperava.
+        index = load_bm25_index(collection_name)
+        version = _collection_version(collection_name, collection)
+        if _is_current(index, version):
+            return index
+        logger.info(f"Reconstruindo o índice BM25 da coleção '{collection_name}' ({version[0]} trechos).")
+        index = _rebuild(collection)
+        # A revisão lida antes da reconstrução: uma mudança durante ela gera nova reconstrução depois.
+        index.revision = version[1]
+        with _lock:
+            _indexes[collection_name] = index
+        index.save(_index_path(collection_name))
+        return index
+
+
+def _run_rebuild(collection_name: str, collection: Any) -> None:
+    try:
+        _rebuild_if_stale(collection_name, collection)
+    except Exception as e:
+        logger.warning(f"Falha ao reconstruir o índice BM25 da coleção '{collection_name}': {e}")
+    finally:
+        with _lock:
+            _rebuilds.pop(collection_name, None)
+
+
+def _start_rebuild(collection_name: str, collection: Any) -> None:
+    with _lock:
+        if collection_name in _rebuilds:
+            return
+        thread = _rebuilds[collection_name] = threading.Thread(
+            target=_run_rebuild, args=(collection_name, collection), name=f"bm25-{collection_name}", daemon=True
+        )
+    thread.start()
+
+
+def get_bm25_index(collection_name: str, collection: Any) -> Optional[BM25Index]:
+    """
+    Retorna o índice BM25 dos trechos da coleção. Se o número de trechos indexados ou a
+    revisão da coleção (`get_collection_revision`) não coincidem com os do índice (trechos
+    gravados ou removidos por outro caminho), o índice é reconstruído a partir da coleção
+    e gravado em disco, uma única vez mesmo com consultas concorrentes.
+
+    Com `settings.retrieval.rebuild_in_background`, a reconstrução roda em uma thread e a
+    consulta usa o índice desatualizado, ou None se ainda não houver nenhum.
+    """
+    index = load_bm25_index(collection_name)
+    if _is_current(index, _collection_version(collection_name, collection)):
+        return index
+    if settings.retrieval.rebuild_in_background:
+        _start_rebuild(collection_name, collection)
+        return index
+    return _rebuild_if_stale(collection_name, collection)
+
+
+def _rerank(query: str, ranked: List[str], documents: Dict[str, str]) -> List[str]:
+    try:
+        cross_encoder = get_cross_encoder(settings.retrieval.rerank_model)
+        scores = cross_encoder.predict([(query, documents[chunk_id]) for chunk_id in ranked])
+    except Exception as e:
+        logger.warning(f"Reordenação indisponível; mantendo a ordem da fusão: {e}")
+        return ranked
+    order = sorted(range(len(ranked)), key=lambda position: float(scores[position]), reverse=True)
+    return [ranked[position] for position in order]
+
+
+def hybrid_search(
+    collection: Any,
+    collection_name: str,
+    query: str,
+    query_embedding: Sequence[float],
+    n_results: int,
+) -> Dict[str, List[Any]]:
+    """
+    Recupera os `n_results` trechos mais relevantes para `query`.
+
+    A busca vetorial e o índice BM25 retornam `settings.retrieval.candidates` candidatos
+    cada; as duas listas são combinadas por Reciprocal Rank Fusion, de modo que termos
+    exatos (siglas, nomes de fármacos, PMIDs) que a busca vetorial perde ainda entram no
+    resultado. Enquanto o primeiro índice é construído, só a busca vetorial é usada.
+    Com `rerank_enabled`, os melhores candidatos da fusão são reordenados por um
+    cross-encoder antes do corte em `n_results`.
+
+    Returns:
+        Dict[str, List[Any]]: `ids`, `documents` e `metadatas` dos trechos, na ordem final.
+    """
+    retrieval_settings = settings.retrieval
+    candidates = max(retrieval_settings.candidates, n_results)
+    vector_results = collection.query(query_embeddings=[query_embedding], n_results=candidates)
+    vector_ids = (vector_results.get("ids") or [[]])[0]
+    documents = dict(zip(vector_ids, (vector_results.get("documents") or [[]])[0]))
+    metadatas = dict(zip(vector_ids, (vector_results.get("metadatas") or [[]])[0]))
+
+    index = get_bm25_index(collection_name, collection) if retrieval_settings.hybrid_enabled else None
+    if index is not None:
+        lexical_ids = [chunk_id for chunk_id, _ in index.search(query, candidates)]
+        fused = reciprocal_rank_fusion([vector_ids, lexical_ids], k=retrieval_settings.rrf_k)
+        ranked = [chunk_id for chunk_id, _ in fused]
+    else:
+        ranked = list(vector_ids)
+
+    ranked = ranked[: max(retrieval_settings.rerank_candidates, n_results) if retrieval_settings.rerank_enabled else n_results]
+    missing = [chunk_id for chunk_id in ranked if chunk_id not in documents]
+    if missing:
+        # Trechos encontrados só pelo BM25: busca o texto e os metadados na coleção.
+        fetched = collection.get(ids=missing, include=["documents", "metadatas"])
+        documents.update(zip(fetched.get("ids") or [], fetched.get("documents") or []))
+        metadatas.update(zip(fetched.get("ids") or [], fetched.get("metadatas") or []))
+        ranked = [chunk_id for chunk_id in ranked if chunk_id in documents]
+
+    if retrieval_settings.rerank_enabled and ranked:
+        ranked = _rerank(query, ranked, documents)
+    ranked = ranked[:n_results]
+    return {
+        "ids": ranked,
+        "documents": [documents[chunk_id] for chunk_id in ranked],
+        "metadatas": [metadatas.get(chunk_id) for chunk_id in ranked],
+    }
@@ -0,0 +1,82 @@
+"""Cache semântico de respostas: reaproveita a resposta de uma pergunta anterior equivalente."""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+
+def _unit(vector: Sequence[float]) -> Tuple[float, ...]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return tuple(x / norm for x in vector) if norm else tuple(vector)
+
+
+class SemanticAnswerCache:
+    """
+    Respostas indexadas pelo embedding da pergunta.
+
+    Uma pergunta nova reaproveita a resposta de uma anterior quando a similaridade de
+    cosseno entre elas atinge `similarity_threshold`, o `namespace` (ex: nível de detalhe)
+    é o mesmo e o conjunto de fontes recuperadas para a pergunta nova é idêntico ao usado
+    na resposta guardada. Qualquer mudança da versão da coleção (`sync_version`) esvazia
+    o cache. As entradas mais antigas são descartadas acima de `max_entries`.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, max_entries: int = 512, ttl_seconds: Optional[float] = None):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version: Optional[Hashable] = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[Tuple[float, ...], Hashable, frozenset, Any, float]]" = OrderedDict()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def sync_version(self, version: Hashable) -> None:
+        """Registra a versão atual da coleção; se mudou, as respostas guardadas são descartadas."""
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def lookup(self, vector: Sequence[float], namespace: Hashable, source_ids: Iterable[str]) -> Optional[Any]:
+        """Retorna a resposta da pergunta mais parecida que atende aos critérios, ou None."""
+        query = _unit(vector)
+        sources = frozenset(source_ids)
+        now = time.monotonic()
+        best_id, best_score = None, self.similarity_threshold
+        for entry_id, (entry_vector, entry_namespace, entry_sources, _, stored_at) in list(self._entries.items()):
+            if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+                del self._entries[entry_id]
+                continue
+            if entry_namespace != namespace or entry_sources != sources:
+                continue
+            score = sum(a * b for a, b in zip(query, entry_vector))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        if best_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][3]
+
+    def store(self, vector: Sequence[float], namespace: Hashable, source_ids: Iterable[str], value: Any) -> None:
+        self._entries[self._next_id] = (_unit(vector), namespace, frozenset(source_ids), value, time.monotonic())
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
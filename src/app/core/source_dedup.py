@@ -0,0 +1,195 @@
+"""Canonicalização de identificadores de fontes e remoção de duplicatas entre consultas."""
+
+import hashlib
+import random
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parâmetros de rastreamento que não mudam o conteúdo da página.
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid"}
+_PMID_URL = re.compile(r"(?:pubmed\.ncbi\.nlm\.nih\.gov/|ncbi\.nlm\.nih\.gov/pubmed/)(\d+)", re.I)
+_PMID_TEXT = re.compile(r"\bPMID:?\s*(\d{1,9})\b", re.I)
+_DOI = re.compile(r"\b(10\.\d{4,9}/[^\s\"'<>]+)", re.I)
+_WORD = re.compile(r"\w+", re.U)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normaliza uma URL: esquema e host em minúsculas, sem `www.`, porta padrão, fragmento,
+    parâmetros de rastreamento (utm_*, fbclid, ...) e barra final; parâmetros ordenados.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+        )
+    )
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def extract_pmid(text: str) -> Optional[str]:
+    """Extrai o PMID de uma URL do PubMed ou de um texto no formato 'PMID: 123'."""
+    match = _PMID_URL.search(text) or _PMID_TEXT.search(text)
+    return match.group(1) if match else None
+
+
+def extract_doi(text: str) -> Optional[str]:
+    """Extrai um DOI (também de URLs doi.org), em minúsculas e sem pontuação final."""
+    match = _DOI.search(text)
+    return match.group(1).rstrip(".,;)]").lower() if match else None
+
+
+def canonical_key(source_identifier: str) -> str:
+    """
+    Retorna a chave que identifica a mesma fonte entre resultados diferentes:
+    `pmid:<n>`, `doi:<doi>`, a URL canonicalizada ou o identificador sem espaços.
+
+    Só o identificador é considerado: páginas e revisões que citam um PMID no texto
+    continuam sendo fontes distintas do artigo citado.
+    """
+    pmid = extract_pmid(source_identifier)
+    if pmid:
+        return f"pmid:{pmid}"
+    doi = extract_doi(source_identifier)
+    if doi:
+        return f"doi:{doi}"
+    if re.match(r"^[a-z][a-z0-9+.-]*://", source_identifier.strip(), re.I):
+        return canonicalize_url(source_identifier)
+    return source_identifier.strip()
+
+
+def canonical_identifier(source_identifier: str) -> str:
+    """Forma canônica do identificador exibido e gravado: URL do PubMed para PMIDs, URL normalizada para URLs."""
+    pmid = extract_pmid(source_identifier)
+    if pmid:
+        return f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+    if re.match(r"^https?://", source_identifier.strip(), re.I):
+        return canonicalize_url(source_identifier)
+    return source_identifier.strip()
+
+
+class MinHasher:
+    """Assinaturas MinHash de shingles de palavras, para estimar a similaridade de Jaccard entre textos."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        words = _WORD.findall(text.lower())
+        size = min(self.shingle_size, len(words)) or 1
+        shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big") for s in shingles]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+class SourceDeduplicator:
+    """
+    Agrupa itens coletados (com `source_identifier`, `content` e `questions`) que
+    representam a mesma fonte.
+
+    Duplicatas exatas são detectadas pela chave canônica (PMID, DOI ou URL normalizada).
+    Com `near_duplicates`, conteúdos quase idênticos também são unidos via MinHash com
+    LSH (bandas de `rows_per_band` linhas). Ao unir, o item mantido fica com o conteúdo
+    mais longo e acumula as perguntas que trouxeram cada cópia.
+    """
+
+    def __init__(
+        self,
+        near_duplicates: bool = False,
+        similarity_threshold: float = 0.9,
+        num_perm: int = 64,
+        rows_per_band: int = 4,
+        min_content_chars: int = 200,
+    ):
+        self.near_duplicates = near_duplicates
+        self.similarity_threshold = similarity_threshold
+        self.min_content_chars = min_content_chars
+        self.rows_per_band = rows_per_band
+        self.duplicates = 0
+        self._by_key: Dict[str, Any] = {}
+        self._items: List[Any] = []
+        self._hasher = MinHasher(num_perm=num_perm) if near_duplicates else None
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Any]] = {}
+
+    @property
+    def items(self) -> List[Any]:
+        """Os itens únicos, na ordem em que foram vistos pela primeira vez."""
+        return list(self._items)
+
+    def add(self, item: Any) -> Optional[Any]:
+        """
+        Registra um item. Retorna o próprio item (com identificador canônico) se a fonte
+        ainda não tinha sido vista, ou None se foi unido a um item anterior.
+        """
+        key = canonical_key(item.source_identifier)
+        existing = self._by_key.get(key)
+        signature = None
+        if existing is None and self._hasher is not None and len(item.content) >= self.min_content_chars:
+            signature = self._hasher.signature(item.content)
+            existing = self._find_similar(signature)
+        if existing is not None:
+            self._merge(existing, item)
+            self._by_key.setdefault(key, existing)
+            return None
+
+        item.source_identifier = canonical_identifier(item.source_identifier)
+        self._by_key[key] = item
+        self._items.append(item)
+        if signature is not None:
+            self._index(item, signature)
+        return item
+
+    def _merge(self, kept: Any, duplicate: Any) -> None:
+        self.duplicates += 1
+        for question in duplicate.questions:
+            if question not in kept.questions:
+                kept.questions.append(question)
+        if len(duplicate.content) > len(kept.content):
+            kept.content = duplicate.content
+
+    def _bands(self, signature: Tuple[int, ...]):
+        for start in range(0, len(signature), self.rows_per_band):
+            yield start, signature[start:start + self.rows_per_band]
+
+    def _find_similar(self, signature: Tuple[int, ...]) -> Optional[Any]:
+        for band in self._bands(signature):
+            for candidate in self._buckets.get(band, []):
+                if MinHasher.similarity(signature, self._signatures[id(candidate)]) >= self.similarity_threshold:
+                    return candidate
+        return None
+
+    def _index(self, item: Any, signature: Tuple[int, ...]) -> None:
+        self._signatures[id(item)] = signature
+        for band in self._bands(signature):
+            self._buckets.setdefault(band, []).append(item)
+
+
+def deduplicate(items: List[Any], **options: Any) -> List[Any]:
+    """Remove duplicatas de `items` com um `SourceDeduplicator` (ver seus parâmetros em `options`)."""
+    deduplicator = SourceDeduplicator(**options)
+    for item in items:
+        deduplicator.add(item)
+    return deduplicator.items
@@ -1,23 +1,173 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
 import chromadb
 from chromadb.utils import embedding_functions
 from app.config.settings import settings
-from typing import List, Dict, Any
+from app.core.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+# Clientes, modelos de embeddings e coleções são caros de criar (o modelo é carregado do
+# disco a cada instância) e podem ser usados de várias threads (`asyncio.to_thread`), então
+# são mantidos por processo, e não por event loop como os recursos de `app.core.registry`.
+_lock = threading.RLock()
+_clients: Dict[Tuple[str, str], Any] = {}
+_embedding_models: Dict[str, Any] = {}
+_embedding_functions: Dict[str, Any] = {}
+_collections: Dict[Tuple[Tuple[str, str], str, str], Any] = {}
+_cross_encoders: Dict[str, Any] = {}
+
+# Chave, nos metadados da coleção, do contador de alterações (ver `bump_collection_revision`).
+REVISION_KEY = "provida_revision"
+
 
-def get_vector_db_client():
-    """Initializes and returns a ChromaDB client."""
-    db_path = settings["services"]["vector_db"]["path"]
-    client = chromadb.PersistentClient(path=db_path)
+def _client_target(path: Optional[str] = None) -> Tuple[str, str]:
+    chroma_settings = settings.database.chroma
+    if path is None and chroma_settings.client == "http":
+        return "http", f"{chroma_settings.host}:{chroma_settings.port}"
+    return "persistent", path or chroma_settings.persist_path
+
+
+def get_vector_db_client(path: Optional[str] = None):
+    """Returns the shared ChromaDB client, creating it once.
+
+    `settings.database.chroma.client` selects the Chroma server (`http`, at `host:port`)
+    or the local store (`persistent`, at `persist_path`). Passing `path` always opens the
+    local store at that directory.
+    """
+    key = _client_target(path)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                kind, target = key
+                if kind == "http":
+                    chroma_settings = settings.database.chroma
+                    client = chromadb.HttpClient(host=chroma_settings.host, port=chroma_settings.port)
+                else:
+                    client = chromadb.PersistentClient(path=target)
+                _clients[key] = client
     return client
 
-def get_embedding_function():
-    """Returns a default embedding function (e.g., SentenceTransformers)."""
-    # For a real application, you might want to use a more robust embedding function
-    # like one provided by Google's models or OpenAI.
-    # This is a placeholder for initial setup.
-    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
+
+def get_embedding_function(model_name: Optional[str] = None, cached: bool = True):
+    """Returns the SentenceTransformers embedding function for `model_name`, loading the model once per process.
+
+    With `settings.embedding_cache.enabled` and `cached`, the function first looks up each
+    text in the on-disk `EmbeddingCache`, so unchanged chunks are never embedded twice.
+    Queries should use `cached=False`: the cache is meant for chunks, and every distinct
+    question would otherwise be appended to it forever.
+    """
+    model_name = model_name or settings.database.chroma.embedding_model
+    model = _embedding_models.get(model_name)
+    if model is None:
+        with _lock:
+            model = _embedding_models.get(model_name)
+            if model is None:
+                logger.info(f"Carregando o modelo de embeddings '{model_name}'.")
+                model = _embedding_models[model_name] = embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model_name)
+    if not cached or not settings.embedding_cache.enabled:
+        return model
+
+    embedding_function = _embedding_functions.get(model_name)
+    if embedding_function is None:
+        with _lock:
+            embedding_function = _embedding_functions.get(model_name)
+            if embedding_function is None:
+                cache = EmbeddingCache(settings.embedding_cache.path, model_name)
+                embedding_function = _embedding_functions[model_name] = CachedEmbeddingFunction(model, cache)
+    return embedding_function
+
+
+def get_cross_encoder(model_name: str):
+    """Returns the SentenceTransformers cross-encoder for `model_name`, loading it once per process (used for reranking)."""
+    cross_encoder = _cross_encoders.get(model_name)
+    if cross_encoder is None:
+        with _lock:
+            cross_encoder = _cross_encoders.get(model_name)
+            if cross_encoder is None:
+                from sentence_transformers import CrossEncoder  # dependência opcional (reordenação)
+
+                logger.info(f"Carregando o cross-encoder '{model_name}'.")
+                cross_encoder = _cross_encoders[model_name] = CrossEncoder(model_name)
+    return cross_encoder
+
+
+def get_collection(collection_name: str, path: Optional[str] = None, model_name: Optional[str] = None):
+    """Returns a cached handle to `collection_name`, bound to the shared client and embedding function.
+
+    This is the single accessor for writers (`app.ingestion`) and readers (`app.rag`), so
+    both always use the store selected by `settings.database.chroma.client`.
+    """
+    model_name = model_name or settings.database.chroma.embedding_model
+    key = (_client_target(path), collection_name, model_name)
+    collection = _collections.get(key)
+    if collection is None:
+        client = get_vector_db_client(path)
+        embedding_function = get_embedding_function(model_name)
+        with _lock:
+            collection = _collections.get(key)
+            if collection is None:
+                collection = _collections[key] = client.get_or_create_collection(
+                    name=collection_name, embedding_function=embedding_function
+                )
+    return collection
+
+
+def _fetch_collection(collection_name: str):
+    # Os handles em `_collections` guardam os metadados de quando foram abertos; este relê do cliente.
+    return get_vector_db_client().get_collection(name=collection_name, embedding_function=get_embedding_function(cached=False))
+
+
+def get_collection_revision(collection_name: str) -> int:
+    """Returns the change counter stored in the collection metadata (0 if it was never bumped).
+
+    The counter lives in Chroma, so changes made by another process (e.g. `provida ingest`)
+    are visible to the API. Used as the version of `app.core.semantic_cache`.
+    """
+    metadata = _fetch_collection(collection_name).metadata or {}
+    return int(metadata.get(REVISION_KEY, 0))
+
+
+def bump_collection_revision(collection_name: str) -> int:
+    """Increments the collection's change counter; call after adding, updating or deleting chunks."""
+    collection = _fetch_collection(collection_name)
+    # Parâmetros do índice (hnsw:*) não podem ser alterados depois da criação da coleção.
+    metadata = {key: value for key, value in (collection.metadata or {}).items() if not key.startswith("hnsw:")}
+    metadata[REVISION_KEY] = int(metadata.get(REVISION_KEY, 0)) + 1
+    collection.modify(metadata=metadata)
+    return metadata[REVISION_KEY]
+
+
+def warm_up(model_name: Optional[str] = None) -> None:
+    """Loads the embedding model and runs one embedding so the first request does not pay for it.
+
+    Called at application startup when `settings.database.chroma.warm_up` is enabled.
+    """
+    get_embedding_function(model_name, cached=False)(["warm-up"])
+    get_vector_db_client()
+    logger.info("Modelo de embeddings e cliente do ChromaDB prontos.")
+
+
+def reset_vector_db() -> None:
+    """Drops the cached clients, models and collections (e.g. after deleting the database directory)."""
+    with _lock:
+        _collections.clear()
+        _clients.clear()
+        for embedding_function in _embedding_functions.values():
+            embedding_function.cache.close()
+        _embedding_functions.clear()
+        _embedding_models.clear()
+        _cross_encoders.clear()
+
 
 def add_documents(collection_name: str, documents: List[str], metadatas: List[Dict[str, Any]], ids: List[str]):
-    """Adds documents to a specified ChromaDB collection.
+    """Adds documents to a specified ChromaDB collection, in batches of `settings.ingestion.upsert_batch_size`.
+
+    For whole directories use `app.ingestion.ingest_directory`, which also splits and deduplicates.
 
     Args:
         collection_name (str): The name of the collection.
@@ -25,11 +175,14 @@ def add_documents(collection_name: str, documents: List[str], metadatas: List[Di
         metadatas (List[Dict[str, Any]]): A list of metadata dictionaries, one for each document.
         ids (List[str]): A list of unique IDs for each document.
     """
-    client = get_vector_db_client()
-    embedding_function = get_embedding_function()
-    collection = client.get_or_create_collection(name=collection_name, embedding_function=embedding_function)
-    collection.add(documents=documents, metadatas=metadatas, ids=ids)
-    print(f"Added {len(documents)} documents to collection '{collection_name}'.")
+    collection = get_collection(collection_name)
+    batch_size = settings.ingestion.upsert_batch_size
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        collection.add(documents=documents[start:end], metadatas=metadatas[start:end], ids=ids[start:end])
+    if ids:
+        bump_collection_revision(collection_name)
+    logger.info(f"Added {len(documents)} documents to collection '{collection_name}'.")
 
 def search_documents(collection_name: str, query_texts: List[str], n_results: int = 5) -> List[Dict[str, Any]]:
     """Searches for similar documents in a specified ChromaDB collection.
@@ -42,8 +195,7 @@ def search_documents(collection_name: str, query_texts: List[str], n_results: in
     Returns:
         List[Dict[str, Any]]: A list of dictionaries containing search results.
     """
-    client = get_vector_db_client()
-    embedding_function = get_embedding_function()
-    collection = client.get_or_create_collection(name=collection_name, embedding_function=embedding_function)
-    results = collection.query(query_texts=query_texts, n_results=n_results)
-    return results
\ No newline at end of file
+    collection = get_collection(collection_name)
+    query_embeddings = get_embedding_function(cached=False)(query_texts)
+    results = collection.query(query_embeddings=query_embeddings, n_results=n_results)
+    return results
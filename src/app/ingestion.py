@@ -0,0 +1,223 @@
+"""Ingestão em lote de documentos na base vetorial: leitura, divisão, deduplicação, embeddings e upsert."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.retrieval import load_bm25_index, save_bm25_index
+from app.core.vector_db import bump_collection_revision, get_collection, get_embedding_function
+
+logger = logging.getLogger(__name__)
+
+# Marcador de fim de fluxo colocado nas filas entre as etapas.
+_END = None
+
+
+class IngestionStats:
+    """Contadores de uma ingestão, usados no relatório de progresso e de vazão."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.documents = 0
+        self.failed_documents = 0
+        self.chunks = 0
+        self.duplicates = 0
+        self.embedded = 0
+        self.upserted = 0
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed_seconds
+        return {
+            "documents": self.documents,
+            "failed_documents": self.failed_documents,
+            "chunks": self.chunks,
+            "duplicates": self.duplicates,
+            "embedded": self.embedded,
+            "upserted": self.upserted,
+            "elapsed_seconds": round(elapsed, 2),
+            "chunks_per_second": round(self.upserted / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """
+    Divide `text` em trechos de até `chunk_size` caracteres, com `overlap` caracteres
+    repetidos entre trechos consecutivos.
+
+    O corte é feito, quando possível, no último fim de parágrafo, de frase ou espaço da
+    janela, para não partir palavras; o trecho seguinte recomeça `overlap` caracteres antes.
+    """
+    if overlap >= chunk_size:
+        raise ValueError("O overlap deve ser menor que o tamanho do trecho.")
+    text = text.strip()
+    chunks: List[str] = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            window = text[start:end]
+            for separator in ("\n\n", ". ", "\n", " "):
+                cut = window.rfind(separator)
+                if cut > overlap:
+                    end = start + cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = end - overlap
+    return chunks
+
+
+def content_id(text: str) -> str:
+    """Identificador do trecho na coleção: o SHA-256 do conteúdo, de modo que trechos repetidos colidem."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _read_document(path: Path) -> str:
+    if path.suffix.lower() == ".pdf":
+        from PyPDF2 import PdfReader  # dependência opcional para PDFs
+
+        return "\n\n".join(page.extract_text() or "" for page in PdfReader(str(path)).pages)
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+async def iter_documents(directory: Path, stats: IngestionStats) -> AsyncIterator[Tuple[str, str]]:
+    """Percorre `directory` recursivamente e produz `(caminho, texto)` dos arquivos com extensões suportadas."""
+    extensions = {extension.lower() for extension in settings.ingestion.file_extensions}
+    paths = sorted(path for path in directory.rglob("*") if path.is_file() and path.suffix.lower() in extensions)
+    for path in paths:
+        try:
+            text = await asyncio.to_thread(_read_document, path)
+        except Exception as e:
+            stats.failed_documents += 1
+            logger.warning(f"Falha ao ler '{path}': {e}")
+            continue
+        stats.documents += 1
+        yield str(path), text
+
+
+async def ingest_directory(
+    directory: Path,
+    collection_name: Optional[str] = None,
+    on_progress: Optional[Callable[[IngestionStats], None]] = None,
+) -> IngestionStats:
+    """
+    Ingere os documentos de `directory` na coleção do ChromaDB como um pipeline com filas limitadas.
+
+    Etapas: leitura dos arquivos, divisão em trechos com sobreposição, descarte de trechos
+    já presentes na coleção (o ID é o hash do conteúdo), embeddings em lotes do tamanho
+    configurado para o modelo e upsert em lotes. As filas têm tamanho máximo
+    (`settings.ingestion.queue_size`), então a leitura espera pelos embeddings em vez de
+    acumular o corpus em memória.
+
+    Args:
+        directory (Path): O diretório com os documentos.
+        collection_name (Optional[str]): A coleção de destino (padrão: `settings.database.chroma.collection`).
+        on_progress (Optional[Callable[[IngestionStats], None]]): Chamado após cada lote gravado.
+
+    Returns:
+        IngestionStats: Os contadores finais da ingestão.
+    """
+    ingestion_settings = settings.ingestion
+    collection_name = collection_name or settings.database.chroma.collection
+    collection = await asyncio.to_thread(get_collection, collection_name)
+    bm25_index = await asyncio.to_thread(load_bm25_index, collection_name)
+    embed = await asyncio.to_thread(get_embedding_function)
+    stats = IngestionStats()
+
+    embed_queue: asyncio.Queue = asyncio.Queue(maxsize=ingestion_settings.queue_size)
+    upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=ingestion_settings.queue_size)
+    seen_ids = set()
+
+    async def flush_new_chunks(batch: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        # Consulta apenas os IDs do lote para descartar os trechos que a coleção já tem.
+        existing = await asyncio.to_thread(collection.get, ids=[chunk_id for chunk_id, _, _ in batch], include=[])
+        existing_ids = set(existing.get("ids", []))
+        new_chunks = [chunk for chunk in batch if chunk[0] not in existing_ids]
+        stats.duplicates += len(batch) - len(new_chunks)
+        if new_chunks:
+            await embed_queue.put(new_chunks)
+
+    async def produce() -> None:
+        try:
+            batch: List[Tuple[str, str, Dict[str, Any]]] = []
+            async for source, text in iter_documents(directory, stats):
+                for index, chunk in enumerate(split_text(text, ingestion_settings.chunk_size, ingestion_settings.chunk_overlap)):
+                    stats.chunks += 1
+                    chunk_id = content_id(chunk)
+                    if chunk_id in seen_ids:
+                        stats.duplicates += 1
+                        continue
+                    seen_ids.add(chunk_id)
+                    batch.append((chunk_id, chunk, {"source": source, "chunk": index}))
+                    if len(batch) >= ingestion_settings.embedding_batch_size:
+                        await flush_new_chunks(batch)
+                        batch = []
+            if batch:
+                await flush_new_chunks(batch)
+        finally:
+            await embed_queue.put(_END)
+
+    async def embed_chunks() -> None:
+        try:
+            while True:
+                batch = await embed_queue.get()
+                if batch is _END:
+                    return
+                embeddings = await asyncio.to_thread(embed, [text for _, text, _ in batch])
+                stats.embedded += len(batch)
+                await upsert_queue.put((batch, embeddings))
+        finally:
+            await upsert_queue.put(_END)
+
+    async def upsert() -> None:
+        pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        pending_embeddings: List[Any] = []
+
+        async def write() -> None:
+            await asyncio.to_thread(
+                collection.upsert,
+                ids=[chunk_id for chunk_id, _, _ in pending],
+                documents=[text for _, text, _ in pending],
+                metadatas=[metadata for _, _, metadata in pending],
+                embeddings=[list(embedding) for embedding in pending_embeddings],
+            )
+            if bm25_index is not None:
+                bm25_index.add_many((chunk_id, text) for chunk_id, text, _ in pending)
+            stats.upserted += len(pending)
+            if on_progress is not None:
+                on_progress(stats)
+
+        while True:
+            item = await upsert_queue.get()
+            if item is _END:
+                break
+            batch, embeddings = item
+            pending.extend(batch)
+            pending_embeddings.extend(embeddings)
+            if len(pending) >= ingestion_settings.upsert_batch_size:
+                await write()
+                pending, pending_embeddings = [], []
+        if pending:
+            await write()
+
+    await asyncio.gather(produce(), embed_chunks(), upsert())
+    if stats.upserted:
+        revision = await asyncio.to_thread(bump_collection_revision, collection_name)
+        # O índice recebeu os trechos desta ingestão; só continua atual se já refletia a revisão anterior.
+        if bm25_index is not None and bm25_index.revision == revision - 1:
+            bm25_index.revision = revision
+    if bm25_index is not None:
+        await asyncio.to_thread(save_bm25_index, collection_name)
+    logger.info(f"Ingestão de '{directory}' concluída: {stats.as_dict()}")
+    return stats
@@ -4,6 +4,7 @@ from typing import List, Dict, Any, Optional
 class CollectedDataItem(BaseModel):
     source_identifier: str
     content: str
+    questions: List[str] = Field(default_factory=list) # Research questions that surfaced this source
     # Add other fields as needed, e.g., url, title, etc.
 
 class AnalyzedDataItem(BaseModel):
@@ -1,20 +1,65 @@
 from app.orchestrator_graph import build_research_graph, ResearchState
+from app.agents.memory_agent import MemoryAgent
 from app.models.research_models import FinalReport, VerificationReport
+from app.checkpoints import get_checkpoint_store, new_run_id
+from app.core.budget import RunBudget, budget_scope
+from app.config.settings import settings
 from typing import Dict, Any, Optional
 
-async def run_deep_research(topic: str, search_limit: Optional[int] = None) -> Dict[str, Any]:
+async def run_deep_research(
+    topic: Optional[str],
+    search_limit: Optional[int] = None,
+    streaming: Optional[bool] = None,
+    run_id: Optional[str] = None,
+    resume: bool = False,
+) -> Dict[str, Any]:
     """
     Executa o modo de pesquisa profunda e retorna o estado final.
 
+    Com checkpoints habilitados (`settings.checkpoints.enabled`), a saída de cada nó e
+    cada fonte analisada são persistidas sob `run_id`. Com `resume=True`, nós já
+    concluídos e fontes já analisadas nessa execução são reaproveitados.
+
+    Com `settings.budget.enabled`, a execução tem um orçamento (`RunBudget`) de buscas
+    (`search_limit` ou `settings.search.deep_search_limit`), chamadas ao LLM e tokens. As
+    perguntas do plano são pesquisadas em ordem até o orçamento de buscas acabar, e
+    fontes sem orçamento de LLM ficam sem análise; o relatório é gerado com o que foi
+    obtido. O consumo fica em `final_state["budget"]`.
+
     Args:
-        topic (str): O tópico para a pesquisa.
-        search_limit (Optional[int]): Limite de buscas para a pesquisa profunda.
+        topic (Optional[str]): O tópico para a pesquisa. Ao retomar, pode ser omitido.
+        search_limit (Optional[int]): Limite total de buscas da execução.
+        streaming (Optional[bool]): Executa coleta, análise e grafo em pipeline
+            (padrão: `settings.research.streaming`).
+        run_id (Optional[str]): Identificador da execução; gerado se omitido.
+        resume (bool): Retoma a execução `run_id` existente.
 
     Returns:
         Dict[str, Any]: O estado final do grafo de pesquisa.
+
+    Raises:
+        ValueError: Se a execução a retomar não existir ou se nenhum tópico for informado.
     """
+    store = get_checkpoint_store() if settings.checkpoints.enabled else None
+    if resume:
+        if store is None:
+            raise ValueError("Checkpoints estão desabilitados; não é possível retomar uma execução.")
+        previous_run = store.get_run(run_id) if run_id else None
+        if previous_run is None:
+            raise ValueError(f"Execução '{run_id}' não encontrada para retomada.")
+        topic = topic or previous_run["topic"]
+        search_limit = search_limit if search_limit is not None else previous_run["search_limit"]
+    if not topic:
+        raise ValueError("O tópico da pesquisa não pode ser vazio.")
+
+    if store is not None:
+        run_id = run_id or new_run_id()
+        store.ensure_run(run_id, topic, search_limit)
+    else:
+        run_id = None
+
     # Build the research graph which defines the workflow for deep research
-    graph = build_research_graph()
+    graph = build_research_graph(streaming=streaming)
     
     # Initialize the research state with the provided topic and optional search limit
     initial_state = ResearchState(
@@ -25,7 +70,32 @@ async def run_deep_research(topic: str, search_limit: Optional[int] = None) -> D
         final_report=None,  # Placeholder for the final report
         verification_report=None,  # Placeholder for the verification report
         search_limit=search_limit,  # Pass search_limit to ResearchState
+        run_id=run_id,  # Checkpoints are stored under this run ID
     )
     
+    budget = None
+    if settings.budget.enabled:
+        budget = RunBudget(
+            max_searches=search_limit if search_limit is not None else settings.search.deep_search_limit,
+            max_llm_calls=settings.budget.max_llm_calls,
+            max_tokens=settings.budget.max_tokens,
+            reserved_llm_calls=settings.budget.reserved_llm_calls,
+            reserved_tokens=settings.budget.reserved_tokens,
+        )
+
     # Invoke the graph with the initial state to start the deep research process
-    return await graph.ainvoke(initial_state)
\ No newline at end of file
+    try:
+        with budget_scope(budget):
+            final_state = await graph.ainvoke(initial_state)
+    except Exception:
+        if store is not None:
+            store.set_status(run_id, "failed")
+        raise
+    finally:
+        # Grava as memórias ainda pendentes da escrita adiada antes de encerrar.
+        await MemoryAgent.flush_all()
+    if store is not None:
+        store.set_status(run_id, "completed")
+    if budget is not None:
+        final_state["budget"] = budget.as_dict()
+    return final_state
@@ -11,6 +11,12 @@ from app.agents.knowledge_graph_agent import KnowledgeGraphAgent
 from app.agents.planning_agent import PlanningAgent
 from app.agents.synthesis_agent import SynthesisAgent
 from app.agents.data_collection_agent import DataCollectionAgent
+from app.core.budget import current_budget, finalizing
+from app.core.llm_provider import llm_provider
+from app.core.registry import get_agent
+from app.config.settings import settings
+from app.checkpoints import get_checkpoint_store
+from app.research_pipeline import run_streaming_pipeline
 from app.services.fact_checking_service import verify_text_against_kg
 
 logger = logging.getLogger(__name__)
@@ -27,6 +33,32 @@ class ResearchState(BaseModel):
     final_report: Optional[FinalReport] = None
     verification_report: Optional[VerificationReport] = None
     search_limit: Optional[int] = None
+    run_id: Optional[str] = None
+
+
+def _checkpointed(node_name: str, node):
+    """
+    Envolve um nó para persistir sua saída no `CheckpointStore` ao concluir.
+
+    Se a execução (`state.run_id`) já tiver um checkpoint para o nó, a saída salva é
+    reutilizada e o nó não é executado novamente.
+    """
+    async def wrapper(state: ResearchState) -> Dict[str, Any]:
+        if not state.run_id:
+            return await node(state)
+
+        store = get_checkpoint_store()
+        saved_update = await asyncio.to_thread(store.load_node, state.run_id, node_name)
+        if saved_update is not None:
+            logger.info(f"Nó '{node_name}' já concluído na execução '{state.run_id}'. Reutilizando checkpoint.")
+            return saved_update
+
+        update = await node(state)
+        await asyncio.to_thread(store.save_node, state.run_id, node_name, update or {})
+        return update
+
+    wrapper.__name__ = node.__name__
+    return wrapper
 
 
 # --- Nós do Grafo ---
@@ -37,7 +69,7 @@ async def plan_node(state: ResearchState) -> Dict[str, Any]:
     Nó responsável por gerar o plano de pesquisa.
     """
     logger.info(f"Gerando plano de pesquisa para o tópico: {state['topic']}")
-    planning_agent = PlanningAgent()
+    planning_agent = get_agent(PlanningAgent)
     # A chamada ao PlanningAgent deve ser assíncrona, então o nó também deve ser assíncrono.
     # Para manter a compatibilidade com a estrutura atual do LangGraph (que espera nós síncronos aqui),
     # vamos usar asyncio.run() para este mock, mas o ideal é que o nó seja async.
@@ -48,8 +80,9 @@ async def plan_node(state: ResearchState) -> Dict[str, Any]:
     # Para fins de desmocking, vamos assumir que o ambiente suporta o await aqui.
     plan_data = await planning_agent.generate_research_plan(state['topic'])
 
-    current_search_limit = state.get('search_limit')
-    logger.info(f"Limite de busca para esta execução: {current_search_limit if current_search_limit is not None else 'padrão do sistema'}")
+    budget = current_budget.get()
+    current_search_limit = budget.max_searches if budget is not None else state.get('search_limit')
+    logger.info(f"Limite de busca para esta execução: {current_search_limit if current_search_limit is not None else 'sem limite'}")
 
     return {"research_plan": plan_data}
 
@@ -59,7 +92,7 @@ async def collection_node(state: ResearchState) -> Dict[str, Any]:
     Nó responsável por coletar dados com base no plano de pesquisa.
     """
     logger.info("Coletando dados de fontes externas...")
-    collection_agent = DataCollectionAgent()
+    collection_agent = get_agent(DataCollectionAgent)
     collected_data = await collection_agent.collect_data(state['research_plan'])
     return {"collected_data": collected_data}
 
@@ -69,20 +102,36 @@ async def analysis_node(state: ResearchState) -> Dict[str, Any]:
     Nó que executa a análise dos dados coletados.
     """
     logger.info("Analisando dados coletados...")
-    analysis_agent = AnalysisAgent()
-    tasks = [
-        analysis_agent.classify_evidence(
-            text=item.content,
-            source_identifier=item.source_identifier
-        )
-        for item in state.collected_data
-    ]
-    analysis_results = await asyncio.gather(*tasks)
+    analysis_agent = get_agent(AnalysisAgent)
+    store = get_checkpoint_store() if state.run_id else None
+
+    # Ao retomar uma execução, fontes já analisadas são reaproveitadas do checkpoint.
+    analyses = await asyncio.to_thread(store.load_analyses, state.run_id) if store else {}
+    pending = [item for item in state.collected_data if item.source_identifier not in analyses]
+    if analyses:
+        logger.info(f"{len(state.collected_data) - len(pending)} fontes já analisadas recuperadas do checkpoint.")
+
+    # Carrega no cache do MemoryAgent, em uma única consulta, as análises já memorizadas de todas as fontes.
+    await analysis_agent.memory.recall_many([item.source_identifier for item in pending])
+
+    # Fontes curtas são agrupadas em poucos prompts; as chamadas restantes ao LLM são
+    # enfileiradas pelo limitador compartilhado do LLMProvider.
+    analysis_results = await analysis_agent.classify_evidence_batch(pending)
+    logger.info(f"Métricas do limitador de LLM após a análise: {llm_provider.limiter_metrics()}")
+
+    for item, result in zip(pending, analysis_results):
+        if result is None:
+            # Sem orçamento de LLM para esta fonte; o relatório segue com as já analisadas.
+            continue
+        analyses[item.source_identifier] = result.model_dump()
+        if store:
+            await asyncio.to_thread(store.save_analysis, state.run_id, item.source_identifier, analyses[item.source_identifier])
 
     # Combina o resultado da análise com o identificador da fonte
     analyzed_data = [
-        AnalyzedDataItem(source_identifier=item.source_identifier, analysis=result)
-        for item, result in zip(state.collected_data, analysis_results)
+        AnalyzedDataItem(source_identifier=item.source_identifier, analysis=analyses[item.source_identifier])
+        for item in state.collected_data
+        if item.source_identifier in analyses
     ]
     return {"analyzed_data": analyzed_data}
 
@@ -92,25 +141,33 @@ async def knowledge_graph_node(state: ResearchState) -> None:
     Nó que atualiza o grafo de conhecimento com os resultados da análise.
     """
     logger.info("Atualizando o grafo de conhecimento...")
-    kg_agent = KnowledgeGraphAgent()
-    tasks = [
-        kg_agent.update_graph_with_analysis(
-            source_identifier=item["source_identifier"],
-            analysis_data=item["analysis"],
-            research_topic=state["topic"],
-        )
-        for item in state["analyzed_data"]
-    ]
-    await asyncio.gather(*tasks)
+    kg_agent = get_agent(KnowledgeGraphAgent)
+    await kg_agent.update_graph_with_analyses_bulk(state.topic, state.analyzed_data)
     return {}  # Este nó não modifica o estado, apenas tem um efeito colateral
 
 
+async def streaming_research_node(state: ResearchState) -> Dict[str, Any]:
+    """
+    Nó que executa coleta, análise e atualização do grafo como um pipeline em streaming.
+
+    Substitui a sequência `collect` -> `analyze` -> `update_kg` quando
+    `settings.research.streaming` está ativo.
+    """
+    logger.info("Coletando, analisando e atualizando o grafo em streaming...")
+    collected_data, analyzed_data = await run_streaming_pipeline(state.topic, state.research_plan, run_id=state.run_id)
+    logger.info(f"Métricas do limitador de LLM após a análise: {llm_provider.limiter_metrics()}")
+    return {"collected_data": collected_data, "analyzed_data": analyzed_data}
+
+
 async def synthesis_node(state: ResearchState) -> Dict[str, Any]:
     """
     Nó que sintetiza os dados analisados em um relatório final.
+
+    Roda com a reserva de finalização do orçamento, para que uma execução que esgotou o
+    orçamento na coleta ou na análise ainda gere o relatório com os resultados parciais.
     """
     logger.info("Sintetizando o relatório final...")
-    synthesis_agent = SynthesisAgent()
+    synthesis_agent = get_agent(SynthesisAgent)
 
     # Combina o conteúdo analisado em um único texto para síntese
     # e prepara as fontes para citação
@@ -122,11 +179,12 @@ async def synthesis_node(state: ResearchState) -> Dict[str, Any]:
         for item in state["analyzed_data"]
     ]
 
-    report = await synthesis_agent.generate_summary_with_citations(
-        text=full_text_content,
-        research_question=state["topic"],
-        sources=sources_for_citation,
-    )
+    with finalizing():
+        report = await synthesis_agent.generate_summary_with_citations(
+            text=full_text_content,
+            research_question=state["topic"],
+            sources=sources_for_citation,
+        )
     return {"final_report": FinalReport(**report)}
 
 
@@ -141,26 +199,43 @@ async def fact_check_node(state: ResearchState) -> Dict[str, Any]:
         logger.warning("Nenhum resumo para verificar. Pulando a verificação de fatos.")
         return {"verification_report": {"hallucination_detected": False, "message": "No summary to check."}}
 
-    report = await verify_text_against_kg(summary_text)
+    with finalizing():
+        report = await verify_text_against_kg(summary_text)
     return {"verification_report": VerificationReport(**report)}
 
 
-def build_research_graph():
-    """Constrói e compila o grafo de pesquisa do LangGraph."""
-    workflow = StateGraph(ResearchState)
+def build_research_graph(streaming: Optional[bool] = None):
+    """
+    Constrói e compila o grafo de pesquisa do LangGraph.
 
-    workflow.add_node("plan", plan_node)
-    workflow.add_node("collect", collection_node)
-    workflow.add_node("analyze", analysis_node)
-    workflow.add_node("update_kg", knowledge_graph_node)
-    workflow.add_node("synthesis", synthesis_node)
-    workflow.add_node("fact_check", fact_check_node)
+    Args:
+        streaming (Optional[bool]): Se True, coleta, análise e atualização do grafo rodam
+            como um único nó em pipeline. Por padrão usa `settings.research.streaming`.
+    """
+    if streaming is None:
+        streaming = settings.research.streaming
 
+    workflow = StateGraph(ResearchState)
+
+    # Cada nó é envolvido por `_checkpointed` para permitir retomar execuções interrompidas.
+    workflow.add_node("plan", _checkpointed("plan", plan_node))
+    workflow.add_node("synthesis", _checkpointed("synthesis", synthesis_node))
+    workflow.add_node("fact_check", _checkpointed("fact_check", fact_check_node))
     workflow.set_entry_point("plan")
-    workflow.add_edge("plan", "collect")
-    workflow.add_edge("collect", "analyze")
-    workflow.add_edge("analyze", "update_kg")
-    workflow.add_edge("update_kg", "synthesis")
+
+    if streaming:
+        workflow.add_node("stream", _checkpointed("stream", streaming_research_node))
+        workflow.add_edge("plan", "stream")
+        workflow.add_edge("stream", "synthesis")
+    else:
+        workflow.add_node("collect", _checkpointed("collect", collection_node))
+        workflow.add_node("analyze", _checkpointed("analyze", analysis_node))
+        workflow.add_node("update_kg", _checkpointed("update_kg", knowledge_graph_node))
+        workflow.add_edge("plan", "collect")
+        workflow.add_edge("collect", "analyze")
+        workflow.add_edge("analyze", "update_kg")
+        workflow.add_edge("update_kg", "synthesis")
+
     workflow.add_edge("synthesis", "fact_check")
     workflow.add_edge("fact_check", END)
 
@@ -139,6 +139,39 @@ Formato de Saída (JSON):
 Certifique-se de que a saída seja um JSON válido e completo. Se a informação não estiver presente, o valor da chave DEVE ser 'null' ou uma lista vazia para 'keywords'.
 """
 
+ANALYSIS_AGENT_BATCH_PROMPT = """Você é um Agente de Análise e Classificação. Sua tarefa é avaliar CADA UM dos textos fornecidos de forma independente, extrair um resumo conciso, classificar seu nível de evidência e extrair palavras-chave relevantes.
+
+Níveis de Evidência:
+A: Evidência forte (ex: meta-análises de ensaios clínicos randomizados, revisões sistemáticas).
+B: Evidência moderada (ex: ensaios clínicos randomizados individuais, estudos de coorte bem delineados).
+C: Evidência limitada (ex: estudos caso-controle, séries de casos, estudos observacionais).
+D: Opinião de especialista ou consenso (ex: diretrizes baseadas em consenso, opinião de comitês de especialistas).
+E: Evidência anedótica, opinião pessoal ou sem suporte científico direto.
+
+Textos para Análise (cada um identificado por seu SOURCE_ID):
+{documents}
+
+Formato de Saída (JSON), com exatamente um item em "results" para cada SOURCE_ID acima:
+{{
+    "results": [
+        {{
+            "source_identifier": "O SOURCE_ID do texto, copiado exatamente",
+            "summary": "Um resumo conciso do texto, focado nos principais achados e conclusões.",
+            "evidence_level": "A letra correspondente ao nível de evidência (A, B, C, D, ou E)",
+            "justification": "Justificativa para a classificação do nível de evidência.",
+            "keywords": ["lista", "de", "palavras-chave"]
+        }}
+    ]
+}}
+
+Não misture informações entre textos diferentes. Certifique-se de que a saída seja um JSON válido e completo.
+"""
+
+ANALYSIS_BATCH_DOCUMENT_TEMPLATE = """--- SOURCE_ID: {source_identifier} ---
+{text}
+--- FIM DO TEXTO {source_identifier} ---
+"""
+
 # Prompt for the Routing Agent
 ROUTING_AGENT_PROMPT = """
 You are an expert routing agent. Your task is to choose the most appropriate tool to answer a given user query based on the tool's description.
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 from functools import lru_cache
-from typing import Optional
+from typing import Optional, Tuple
 
 import chromadb
 from chromadb.types import Collection
@@ -9,32 +9,27 @@ from chromadb.types import Collection
 from app.config.settings import settings
 from app.models.rag_models import RagResponse
 from app.core.llm_provider import llm_provider
+from app.core.retrieval import hybrid_search
+from app.core.semantic_cache import SemanticAnswerCache
+from app.core.vector_db import get_collection, get_collection_revision, get_embedding_function
 
 logger = logging.getLogger(__name__)
 
 
-@lru_cache
 def get_chroma_collection() -> Collection:
     """
-    Cria e retorna um cliente ChromaDB conectado à coleção especificada.
+    Retorna a coleção do ChromaDB usada pelo modo rápido.
 
-    A instância do cliente e da coleção são cacheadas para reutilização,
-    evitando múltiplas conexões. As configurações são lidas do objeto
-    de settings global.
+    A coleção vem de `app.core.vector_db.get_collection`, o mesmo acessor usado pela
+    ingestão (`provida ingest`): cliente (servidor HTTP ou base local, conforme
+    `settings.database.chroma.client`), coleção e modelo de embeddings são criados uma
+    vez por processo e reutilizados.
 
     Returns:
         Collection: A instância da coleção do ChromaDB.
     """
     try:
-        client = chromadb.HttpClient(
-            host=settings.database.chroma.host,
-            port=settings.database.chroma.port,
-        )
-        collection = client.get_or_create_collection(
-            name=settings.database.chroma.collection
-        )
-        logger.info(f"Conectado com sucesso à coleção '{settings.database.chroma.collection}' do ChromaDB.")
-        return collection
+        return get_collection(settings.database.chroma.collection)
     except chromadb.errors.ChromaError as e:
         logger.critical(f"Falha ao conectar ou configurar a coleção do ChromaDB: {e}", exc_info=True)
         raise ConnectionError(f"Não foi possível conectar ao ChromaDB: {e}")
@@ -43,9 +38,34 @@ def get_chroma_collection() -> Collection:
         raise
 
 
+def _collection_version(collection: Collection) -> Tuple[int, int]:
+    # O contador de alterações cobre trechos substituídos sem mudar o total; o total cobre
+    # alterações feitas por fora de `app.core.vector_db` e da ingestão.
+    return collection.count(), get_collection_revision(settings.database.chroma.collection)
+
+
+@lru_cache
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Retorna o cache semântico de respostas do modo rápido, ou None se desabilitado."""
+    cache_settings = settings.rag_cache
+    if not cache_settings.enabled:
+        return None
+    return SemanticAnswerCache(
+        similarity_threshold=cache_settings.similarity_threshold,
+        max_entries=cache_settings.max_entries,
+        ttl_seconds=cache_settings.ttl_seconds,
+    )
+
+
 async def perform_rag_query(query: str, detail_level: str = "padrao") -> RagResponse:
     """
-    Executa uma consulta RAG completa: busca no ChromaDB e síntese com LLM.
+    Executa uma consulta RAG completa: busca híbrida no ChromaDB e síntese com LLM.
+
+    Com `settings.rag_cache.enabled`, uma pergunta igual ou parecida (similaridade dos
+    embeddings acima do limiar) a outra já respondida, com o mesmo nível de detalhe e que
+    recupere exatamente as mesmas fontes, recebe a resposta guardada sem chamar o LLM. O
+    cache é esvaziado quando a coleção muda (número de trechos ou contador de alterações,
+    ver `app.core.vector_db.bump_collection_revision`).
 
     Args:
         query (str): A pergunta do usuário.
@@ -57,18 +77,21 @@ async def perform_rag_query(query: str, detail_level: str = "padrao") -> RagResp
     if not query:
         raise ValueError("A consulta não pode ser vazia.")
 
-    collection = get_chroma_collection()
-
-    # 1. Buscar chunks de documentos relevantes no ChromaDB
-    results = collection.query(query_texts=[query], n_results=settings.rag.n_results)
+    collection = await asyncio.to_thread(get_chroma_collection)
+    answer_cache = get_answer_cache()
 
-    documents = []
-    metadatas = []
+    # O embedding da pergunta serve tanto à busca quanto ao cache semântico.
+    query_embedding = (await asyncio.to_thread(get_embedding_function(cached=False), [query]))[0]
+    if answer_cache is not None:
+        answer_cache.sync_version(await asyncio.to_thread(_collection_version, collection))
 
-    if results and "documents" in results and len(results["documents"]) > 0:
-        documents = results["documents"][0]
-    if results and "metadatas" in results and len(results["metadatas"]) > 0:
-        metadatas = results["metadatas"][0]
+    # 1. Buscar chunks relevantes: busca vetorial + BM25, fundidas (ver app.core.retrieval)
+    results = await asyncio.to_thread(
+        hybrid_search, collection, settings.database.chroma.collection, query, query_embedding, settings.rag.n_results
+    )
+    chunk_ids = results["ids"]
+    documents = results["documents"]
+    metadatas = results["metadatas"]
 
     if not documents:
         return RagResponse(
@@ -76,6 +99,12 @@ async def perform_rag_query(query: str, detail_level: str = "padrao") -> RagResp
             sources=[],
         )
 
+    if answer_cache is not None:
+        cached_response = answer_cache.lookup(query_embedding, detail_level, chunk_ids)
+        if cached_response is not None:
+            logger.info(f"Resposta para '{query[:50]}' servida pelo cache semântico.")
+            return cached_response
+
     context = "\n\n".join(documents)
     sources = list(set(meta.get("source", "Fonte desconhecida") for meta in metadatas if meta))
 
@@ -92,10 +121,14 @@ async def perform_rag_query(query: str, detail_level: str = "padrao") -> RagResp
 
     # 3. Chamar o LLM para gerar a síntese
     try:
-        model = llm_provider.get_model(settings.models.rag_agent)
+        model = llm_provider.get_model(settings.models.rag_agent, agent_name="rag_agent")
         response = await model.generate_content_async(prompt)
-        return RagResponse(summary=response.text, sources=sources)
+        rag_response = RagResponse(summary=response.text, sources=sources)
     except Exception as e:
         logger.error(f"Erro ao gerar a síntese com o LLM para a consulta '{query}': {e}", exc_info=True)
         # Retorna uma resposta de erro ou levanta uma exceção personalizada
         raise RuntimeError(f"Falha ao gerar resposta de RAG: {e}")
+
+    if answer_cache is not None:
+        answer_cache.store(query_embedding, detail_level, chunk_ids, rag_response)
+    return rag_response
@@ -0,0 +1,148 @@
+"""Execução em streaming das etapas de coleta, análise e atualização do grafo de conhecimento."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.agents.analysis_agent import AnalysisAgent
+from app.agents.data_collection_agent import DataCollectionAgent
+from app.agents.knowledge_graph_agent import KnowledgeGraphAgent
+from app.checkpoints import get_checkpoint_store
+from app.config.settings import settings
+from app.core.registry import get_agent
+from app.models.research_models import AnalyzedDataItem, CollectedDataItem
+
+logger = logging.getLogger(__name__)
+
+# Marcador de fim de fluxo colocado nas filas entre as etapas.
+_END = None
+
+
+async def _drain(queue: asyncio.Queue, first: Any, limit: int) -> Tuple[List[Any], bool]:
+    """
+    Retorna `first` mais os itens já disponíveis na fila, até `limit`, sem aguardar novos itens.
+
+    O segundo valor indica se o marcador de fim foi consumido durante a drenagem.
+    """
+    items = [first]
+    while len(items) < limit:
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if item is _END:
+            return items, True
+        items.append(item)
+    return items, False
+
+
+async def run_streaming_pipeline(
+    topic: str, research_plan: Dict[str, Any], run_id: Optional[str] = None
+) -> Tuple[List[CollectedDataItem], List[AnalyzedDataItem]]:
+    """
+    Executa coleta, classificação e escrita no grafo como um pipeline com filas limitadas.
+
+    Cada busca alimenta a fila de análise assim que retorna, e cada `AnalysisResult` é
+    enviado ao grafo de conhecimento assim que existe. As filas têm tamanho máximo
+    (`settings.research.queue_size`), de modo que uma etapa lenta aplica contrapressão
+    às anteriores em vez de acumular itens em memória.
+
+    Quando `run_id` é informado, os resultados de cada busca e cada análise são salvos no
+    `CheckpointStore`: ao retomar a execução, buscas já concluídas não são refeitas (nem
+    consomem orçamento) e fontes já analisadas não são reenviadas ao LLM.
+
+    Args:
+        topic (str): O tópico da pesquisa, usado ao gravar no grafo.
+        research_plan (Dict[str, Any]): O plano gerado pelo PlanningAgent.
+        run_id (Optional[str]): A execução à qual os checkpoints pertencem.
+
+    Returns:
+        Tuple[List[CollectedDataItem], List[AnalyzedDataItem]]: Os itens coletados e analisados.
+    """
+    research_settings = settings.research
+    collection_agent = get_agent(DataCollectionAgent)
+    analysis_agent = get_agent(AnalysisAgent)
+    kg_agent = get_agent(KnowledgeGraphAgent)
+
+    analysis_queue: asyncio.Queue = asyncio.Queue(maxsize=research_settings.queue_size)
+    kg_queue: asyncio.Queue = asyncio.Queue(maxsize=research_settings.queue_size)
+    collected_data: List[CollectedDataItem] = []
+    analyzed_data: List[AnalyzedDataItem] = []
+    store = get_checkpoint_store() if run_id else None
+    previous_analyses = await asyncio.to_thread(store.load_analyses, run_id) if store else {}
+    completed_searches = await asyncio.to_thread(store.load_searches, run_id) if store else {}
+
+    async def save_search(query: str, results: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(store.save_search, run_id, query, results)
+
+    async def produce() -> None:
+        try:
+            async for item in collection_agent.iter_collected_data(
+                research_plan, completed_searches=completed_searches, on_search=save_search if store else None
+            ):
+                collected_data.append(item)
+                if item.source_identifier in previous_analyses:
+                    analyzed = AnalyzedDataItem(
+                        source_identifier=item.source_identifier, analysis=previous_analyses[item.source_identifier]
+                    )
+                    analyzed_data.append(analyzed)
+                    await kg_queue.put(analyzed)
+                    continue
+                await analysis_queue.put(item)
+        finally:
+            for _ in range(research_settings.analysis_workers):
+                await analysis_queue.put(_END)
+
+    async def analyze() -> None:
+        while True:
+            first = await analysis_queue.get()
+            if first is _END:
+                return
+            # Agrupa o que já estiver na fila para aproveitar a classificação em lote.
+            batch, finished = await _drain(analysis_queue, first, settings.analysis.max_batch_size)
+            try:
+                results = await analysis_agent.classify_evidence_batch(batch)
+            except Exception as e:
+                logger.error(f"Falha ao classificar {len(batch)} fontes no pipeline: {e}", exc_info=True)
+                results = []
+            for item, result in zip(batch, results):
+                if result is None:
+                    continue  # Sem orçamento de LLM para esta fonte.
+                analyzed = AnalyzedDataItem(source_identifier=item.source_identifier, analysis=result.model_dump())
+                analyzed_data.append(analyzed)
+                if store:
+                    await asyncio.to_thread(store.save_analysis, run_id, item.source_identifier, analyzed.analysis)
+                await kg_queue.put(analyzed)
+            if finished:
+                return
+
+    async def write_graph() -> None:
+        while True:
+            first: Optional[AnalyzedDataItem] = await kg_queue.get()
+            if first is _END:
+                return
+            # Grava de uma vez tudo o que já estiver na fila, em uma única transação.
+            batch, finished = await _drain(kg_queue, first, settings.knowledge_graph.bulk_chunk_size)
+            try:
+                await kg_agent.update_graph_with_analyses_bulk(topic, batch)
+            except Exception as e:
+                logger.error(f"Falha ao gravar {len(batch)} fontes no grafo: {e}")
+            if finished:
+                return
+
+    async def analysis_stage() -> None:
+        try:
+            await asyncio.gather(*(analyze() for _ in range(research_settings.analysis_workers)))
+        finally:
+            for _ in range(research_settings.kg_workers):
+                await kg_queue.put(_END)
+
+    await asyncio.gather(
+        produce(),
+        analysis_stage(),
+        *(write_graph() for _ in range(research_settings.kg_workers)),
+    )
+    logger.info(
+        f"Pipeline em streaming concluído: {len(collected_data)} itens coletados, {len(analyzed_data)} analisados."
+    )
+    return collected_data, analyzed_data
@@ -9,6 +9,8 @@ from apscheduler.jobstores.memory import MemoryJobStore
 
 from app.config.settings import settings
 from app.agents.knowledge_curation_agent import KnowledgeCurationAgent
+from app.core.http_client import close_http_clients
+from app.core.registry import close_resources, get_agent
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +27,7 @@ class SchedulerService:
             'default': MemoryJobStore()
         }
         self.scheduler = AsyncIOScheduler(jobstores=self.jobstores)
-        self.curation_agent = KnowledgeCurationAgent()
+        self.curation_agent = get_agent(KnowledgeCurationAgent)
         logger.info("SchedulerService initialized.")
 
     def start(self):
@@ -124,6 +126,8 @@ async def main():
             await asyncio.sleep(3600) # Sleep for an hour
     except (KeyboardInterrupt, SystemExit):
         scheduler_service.shutdown()
+        await close_http_clients()
+        await close_resources()
 
 if __name__ == "__main__":
     import asyncio
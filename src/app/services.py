@@ -1,3 +1,5 @@
+import asyncio
+
 from rich.console import Console
 
 def run_fast_query(query: str):
@@ -5,5 +7,5 @@ def run_fast_query(query: str):
     console = Console()
     console.print(f"Executando Consulta Rápida para: '{query}'")
     from app.tools.web_search import search_web
-    results = search_web(query)
+    results = asyncio.run(search_web(query))
     console.print(results)
@@ -1,6 +1,28 @@
+import logging
 import os
+import re
+from typing import Any, Dict, List, Optional
+
 import httpx
 
+from app.core.http_client import get_http_client
+from app.core.rate_limiting import RateLimitExceeded, parse_retry_after
+from app.tools.search_rate_limiter import get_search_rate_limiter
+from app.tools.search_cache import get_search_cache
+
+logger = logging.getLogger(__name__)
+
+# Termos usados pelo roteador local (RoutingAgent) antes de recorrer ao LLM.
+# Termos terminados em `*` casam por prefixo; acentos e maiúsculas são ignorados.
+# Anos (ex: 2025) indicam busca por informação recente.
+BRAVE_KEYWORDS = [
+    "noticia*", "news", "hoje", "today", "atual", "latest", "ultim*", "recente*", re.compile(r"\b20\d{2}\b"),
+    "preco*", "price*", "cust*", "cost*", "valor", "onde", "where", "perto", "near", "hospital*",
+    "clinica em", "endereco", "telefone", "contato", "site", "website", "empresa*", "company",
+    "lei", "law", "legislac*", "regulament*", "anvisa", "sus", "plano de saude", "insurance",
+    "opiniao", "opinion", "forum", "reddit", "blog", "video", "youtube", "evento*", "event*",
+]
+
 class BraveSearch:
     def __init__(self):
         self.api_key = os.getenv("BRAVE_API_KEY")
@@ -15,6 +37,9 @@ class BraveSearch:
     async def search(self, query: str, count: int = 10) -> dict:
         """Performs a search using the Brave Search API.
 
+        Responses go through the shared search cache (settings.search_cache) when enabled;
+        errors are never cached.
+
         Args:
             query (str): The search query.
             count (int): The number of results to return (max 20).
@@ -25,16 +50,60 @@ class BraveSearch:
         if count > 20:
             count = 20 # Brave Search API limit
 
+        cache = get_search_cache()
+        if cache is None:
+            return await self._search(query, count)
+        return await cache.fetch("brave", query, count, lambda: self._search(query, count))
+
+    async def _search(self, query: str, count: int) -> dict:
         params = {
             "q": query,
             "count": count
         }
+
+        async def call() -> dict:
+            # Shared pooled client: keeps TCP/TLS connections alive across searches
+            client = get_http_client()
+            response = await client.get("https://api.search.brave.com/res/v1/web/search", headers=self.headers, params=params)
+            if response.status_code == 429:
+                raise RateLimitExceeded("brave", parse_retry_after(response.headers.get("Retry-After")))
+            response.raise_for_status() # Raise an exception for HTTP errors
+            return response.json()
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get("https://api.search.brave.com/res/v1/web/search", headers=self.headers, params=params)
-                response.raise_for_status() # Raise an exception for HTTP errors
-                return response.json()
-        except httpx.RequestError as e:
+            # Shared per-provider rate limit (settings.search.rate_limit), retried on 429
+            return await get_search_rate_limiter().run("brave", call)
+        except (httpx.RequestError, RateLimitExceeded) as e:
             print(f"Error during Brave Search API call: {e}")
             return {"error": str(e)}
 
+
+class BraveSearchTool:
+    """
+    Adaptador do `BraveSearch` para o DataCollectionAgent: `run(query)` retorna os resultados
+    da web como dicionários com `title`, `url` e `snippet`.
+
+    A busca passa por `BraveSearch.search`, portanto pelo cache de respostas e pelo limite
+    de taxa compartilhados. O cliente é criado na primeira busca, para que a ausência da
+    chave de API só afete quem de fato usa a ferramenta.
+    """
+
+    def __init__(self, count: int = 10):
+        self.count = count
+        self._client: Optional[BraveSearch] = None
+
+    async def run(self, query: str) -> List[Dict[str, Any]]:
+        if self._client is None:
+            self._client = BraveSearch()
+        response = await self._client.search(query, count=self.count)
+        if "error" in response:
+            logger.warning(f"Busca no Brave falhou para '{query}': {response['error']}")
+            return []
+        return [
+            {
+                "title": result.get("title", "N/A"),
+                "url": result.get("url"),
+                "snippet": re.sub(r"<[^>]+>", "", result.get("description", "")),
+            }
+            for result in response.get("web", {}).get("results", [])
+        ]
@@ -0,0 +1,77 @@
+"""Parser incremental do XML de `efetch` do PubMed."""
+
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
+
+
+def _text(element: Optional[ET.Element]) -> str:
+    # itertext inclui a marcação interna (<i>, <sup>, ...) presente em títulos e resumos.
+    return "".join(element.itertext()).strip() if element is not None else ""
+
+
+def _authors(article: ET.Element) -> List[str]:
+    authors = []
+    for author in article.iterfind("AuthorList/Author"):
+        last_name, fore_name = author.findtext("LastName"), author.findtext("ForeName")
+        if last_name and fore_name:
+            authors.append(f"{last_name} {fore_name}")
+        elif author.findtext("CollectiveName"):
+            authors.append(_text(author.find("CollectiveName")))
+    return authors
+
+
+def _pub_date(article: ET.Element) -> str:
+    pub_date = article.find("Journal/JournalIssue/PubDate")
+    year = pub_date.findtext("Year") if pub_date is not None else None
+    if not year:
+        return "N/A"
+    month = pub_date.findtext("Month")
+    return f"{year} {month}" if month else year
+
+
+def _to_record(element: ET.Element) -> Dict[str, Any]:
+    medline = element.find("MedlineCitation")
+    article = medline.find("Article")
+    pmid = medline.findtext("PMID", "").strip()
+    abstract_parts = [_text(part) for part in article.iterfind("Abstract/AbstractText")]
+    return {
+        "pmid": pmid,
+        "title": _text(article.find("ArticleTitle")) or "N/A",
+        "abstract": " ".join(abstract_parts) if abstract_parts else "N/A",
+        "authors": _authors(article),
+        "journal": _text(article.find("Journal/Title")) or "N/A",
+        "pub_date": _pub_date(article),
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+    }
+
+
+def iter_pubmed_articles(source: Union[str, IO[bytes]]) -> Iterator[Dict[str, Any]]:
+    """
+    Percorre um XML de `efetch` (PubmedArticleSet) sem materializar o documento inteiro.
+
+    Cada `PubmedArticle` é convertido em um registro compacto com os campos usados pela
+    aplicação (mesmo formato de `PubMedSearch.search`) e descartado em seguida, de modo
+    que a memória usada não cresce com o tamanho da resposta.
+
+    Args:
+        source (Union[str, IO[bytes]]): Caminho do arquivo ou stream binário (ex: o handle do Entrez).
+
+    Yields:
+        Dict[str, Any]: pmid, title, abstract, authors, journal, pub_date e url de cada artigo.
+    """
+    root = None
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            continue
+        if element.tag == "PubmedArticle":
+            yield _to_record(element)
+            # Remove o artigo já processado da árvore parcial mantida pelo iterparse.
+            element.clear()
+            root.clear()
+
+
+def parse_pubmed_articles(source: Union[str, IO[bytes]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Lê uma resposta completa de `efetch` no formato `{"PubmedArticle": [registros]}`."""
+    return {"PubmedArticle": list(iter_pubmed_articles(source))}
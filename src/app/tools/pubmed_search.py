@@ -1,12 +1,34 @@
+import itertools
+import os
+from urllib.error import HTTPError
+
 from Bio import Entrez
 import asyncio
 import logging
-from typing import List, Dict, Any
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
 
-from src.app.config.settings import settings
+from app.config.settings import settings
+from app.core.rate_limiting import RateLimitExceeded, parse_retry_after
+from app.tools.pubmed_parser import parse_pubmed_articles
+from app.tools.search_rate_limiter import get_search_rate_limiter
+from app.tools.search_cache import get_search_cache
 
 logger = logging.getLogger(__name__)
 
+# Termos usados pelo roteador local (RoutingAgent) antes de recorrer ao LLM.
+# Termos terminados em `*` casam por prefixo; acentos e maiúsculas são ignorados.
+PUBMED_KEYWORDS = [
+    "pubmed", "mesh", "estudo*", "study", "studies", "ensaio*", "trial*", "random*", "coorte", "cohort",
+    "meta-anal*", "metaanal*", "revisao sistematica", "systematic review", "evidencia*", "evidence",
+    "clinic*", "paciente*", "patient*", "tratamento*", "treatment*", "terapia*", "therap*",
+    "cirurgi*", "surg*", "bariatric*", "gastrectom*", "bypass", "sleeve", "obesidade", "obesity",
+    "diabet*", "metabol*", "farmac*", "pharmac*", "drug*", "medicament*", "glp-1", "semaglutid*",
+    "dose", "efic*", "effic*", "seguranca", "safety", "mortalidade", "mortality", "comorbid*",
+    "fisiopatolog*", "pathophysiolog*", "diagnost*", "prognos*", "complicac*", "complication*",
+    "doenca*", "disease*", "sindrome", "syndrome", "nutric*", "nutrition*", "biomarc*", "biomark*",
+]
+
 class PubMedSearch:
     def __init__(self):
         self.api_key = os.getenv("ENTREZ_API_KEY")
@@ -22,9 +44,32 @@ class PubMedSearch:
         Entrez.api_key = self.api_key
         Entrez.email = self.email
 
+    async def _entrez_read(
+        self, request: Callable[..., Any], parse: Callable[[Any], Any] = Entrez.read, **params: Any
+    ) -> Any:
+        """Executa uma chamada Entrez e lê a resposta com `parse`, respeitando o limite de taxa do NCBI."""
+
+        async def call() -> Any:
+            # Envolver chamadas síncronas em asyncio.to_thread para não bloquear o loop de eventos
+            try:
+                handle = await asyncio.to_thread(request, **params)
+            except HTTPError as e:
+                if e.code == 429:
+                    raise RateLimitExceeded("pubmed", parse_retry_after(e.headers.get("Retry-After"))) from e
+                raise
+            try:
+                return await asyncio.to_thread(parse, handle)
+            finally:
+                await asyncio.to_thread(handle.close)
+
+        return await get_search_rate_limiter().run("pubmed", call)
+
     async def search(self, query: str, count: int = 10) -> List[Dict[str, Any]]:
         """Searches PubMed for articles asynchronously.
 
+        Responses go through the shared search cache (settings.search_cache) when enabled;
+        failed or empty searches are never cached.
+
         Args:
             query (str): The search query.
             count (int): The maximum number of UIDs to retrieve.
@@ -32,61 +77,143 @@ class PubMedSearch:
         Returns:
             List[Dict[str, Any]]: A list of dictionaries containing article details.
         """
+        cache = get_search_cache()
+        if cache is None:
+            return await self._search(query, count)
+        return await cache.fetch("pubmed", query, count, lambda: self._search(query, count))
+
+    async def _search(self, query: str, count: int) -> List[Dict[str, Any]]:
         logger.info(f"Iniciando busca no PubMed para: '{query}' (count: {count})")
         try:
-            # Envolver chamadas síncronas em asyncio.to_thread para não bloquear o loop de eventos
-            handle = await asyncio.to_thread(Entrez.esearch, db="pubmed", term=query, retmax=count)
-            record = await asyncio.to_thread(Entrez.read, handle)
-            await asyncio.to_thread(handle.close)
+            record = await self._entrez_read(Entrez.esearch, db="pubmed", term=query, retmax=count)
             id_list = record["IdList"]
 
             if not id_list:
                 logger.info(f"Nenhum resultado encontrado no PubMed para: '{query}'")
                 return []
 
-            handle = await asyncio.to_thread(Entrez.efetch, db="pubmed", id=id_list, retmode="xml")
-            articles = await asyncio.to_thread(Entrez.read, handle)
-            await asyncio.to_thread(handle.close)
-
-            results = []
-            for article in articles['PubmedArticle']:
-                medline = article['MedlineCitation']
-                article_info = medline['Article']
-                
-                title = str(article_info.get('ArticleTitle', 'N/A'))
-                abstract = 'N/A'
-                if 'Abstract' in article_info and 'AbstractText' in article_info['Abstract']:
-                    abstract = " ".join(article_info['Abstract']['AbstractText'])
-
-                authors = []
-                if 'AuthorList' in article_info:
-                    for author in article_info['AuthorList']:
-                        if 'LastName' in author and 'ForeName' in author:
-                            authors.append(f"{author['LastName']} {author['ForeName']}")
-                        elif 'CollectiveName' in author:
-                            authors.append(author['CollectiveName'])
-
-                journal = str(article_info.get('Journal', {}).get('Title', 'N/A'))
-                pub_date = 'N/A'
-                if 'Journal' in article_info and 'JournalIssue' in article_info['Journal'] and 'PubDate' in article_info['Journal']['JournalIssue']:
-                    pub_date_info = article_info['Journal']['JournalIssue']['PubDate']
-                    if 'Year' in pub_date_info:
-                        pub_date = pub_date_info['Year']
-                        if 'Month' in pub_date_info:
-                            pub_date += f" {pub_date_info['Month']}"
-
-                results.append({
-                    "pmid": medline['PMID'],
-                    "title": title,
-                    "abstract": abstract,
-                    "authors": authors,
-                    "journal": journal,
-                    "pub_date": pub_date,
-                    "url": f"https://pubmed.ncbi.nlm.nih.gov/{medline['PMID']}/"
-                })
+            articles = await self._entrez_read(
+                Entrez.efetch, parse=parse_pubmed_articles, db="pubmed", id=id_list, retmode="xml"
+            )
+            results = articles['PubmedArticle']
             logger.info(f"Busca no PubMed concluída para: '{query}'. Resultados: {len(results)}")
             return results
 
         except Exception as e:
             logger.error(f"Erro durante a chamada à API do PubMed para '{query}': {e}", exc_info=True)
-            return []
\ No newline at end of file
+            return []
+
+    async def iter_articles(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streams PubMed articles for large pulls using the Entrez history server.
+
+        A single `esearch` with `usehistory=y` stores the result set on NCBI's side
+        (WebEnv/query_key); pages of `batch_size` articles are then fetched with
+        `efetch`, at most `max_concurrency` pages in flight, all under the shared
+        NCBI rate limit. Pages go through the shared search cache, keyed by query
+        and page position, so a repeated pull only re-runs the `esearch`. Articles are yielded in result order as each page arrives,
+        so only the pages in flight are held in memory.
+
+        Args:
+            query (str): The search query.
+            max_results (Optional[int]): Maximum number of articles (default: `settings.pubmed.max_results`).
+            batch_size (Optional[int]): Articles per `efetch` page (default: `settings.pubmed.batch_size`).
+            max_concurrency (Optional[int]): Pages fetched concurrently (default: `settings.pubmed.max_concurrency`).
+
+        Yields:
+            Dict[str, Any]: Article details, in the same format as `search`.
+        """
+        pubmed_settings = settings.pubmed
+        max_results = max_results if max_results is not None else pubmed_settings.max_results
+        batch_size = batch_size or pubmed_settings.batch_size
+        max_concurrency = max_concurrency or pubmed_settings.max_concurrency
+
+        record = await self._entrez_read(Entrez.esearch, db="pubmed", term=query, usehistory="y", retmax=0)
+        total = min(int(record["Count"]), max_results)
+        if total == 0:
+            logger.info(f"Nenhum resultado encontrado no PubMed para: '{query}'")
+            return
+        webenv, query_key = record["WebEnv"], record["QueryKey"]
+        logger.info(f"Baixando {total} artigos do PubMed em lotes de {batch_size} para: '{query}'")
+
+        cache = get_search_cache()
+
+        async def fetch_page(retstart: int) -> List[Dict[str, Any]]:
+            retmax = min(batch_size, total - retstart)
+
+            async def efetch() -> List[Dict[str, Any]]:
+                articles = await self._entrez_read(
+                    Entrez.efetch,
+                    parse=parse_pubmed_articles,
+                    db="pubmed",
+                    webenv=webenv,
+                    query_key=query_key,
+                    retstart=retstart,
+                    retmax=retmax,
+                    retmode="xml",
+                )
+                return articles["PubmedArticle"]
+
+            if cache is None:
+                return await efetch()
+            # WebEnv muda a cada esearch; a página é identificada pela consulta e pela posição.
+            return await cache.fetch("pubmed", f"{query} [retstart={retstart}]", retmax, efetch)
+
+        starts = iter(range(0, total, batch_size))
+        in_flight: Deque[asyncio.Task] = deque()
+        yielded = 0
+        try:
+            for retstart in itertools.islice(starts, max_concurrency):
+                in_flight.append(asyncio.ensure_future(fetch_page(retstart)))
+            while in_flight:
+                page = in_flight.popleft()
+                try:
+                    results = await page
+                except Exception as e:
+                    logger.error(f"Falha ao baixar um lote de artigos do PubMed para '{query}': {e}", exc_info=True)
+                    results = []
+                # Mantém a janela cheia antes de entregar o lote ao consumidor.
+                next_start = next(starts, None)
+                if next_start is not None:
+                    in_flight.append(asyncio.ensure_future(fetch_page(next_start)))
+                for result in results:
+                    yielded += 1
+                    yield result
+        finally:
+            for page in in_flight:
+                page.cancel()
+        logger.info(f"Download em lotes do PubMed concluído para: '{query}'. Artigos: {yielded}")
+
+
+class PubMedSearchTool:
+    """
+    Adaptador do `PubMedSearch` para o DataCollectionAgent: `run(query)` retorna os artigos
+    como dicionários com `title`, `url`, `content` (o resumo) e `pmid`.
+
+    A busca passa por `PubMedSearch.search`, portanto pelo cache de respostas e pelo limite
+    de taxa compartilhados. O cliente é criado na primeira busca, para que a ausência das
+    credenciais do Entrez só afete quem de fato usa a ferramenta.
+    """
+
+    def __init__(self, count: int = 10):
+        self.count = count
+        self._client: Optional[PubMedSearch] = None
+
+    async def run(self, query: str) -> List[Dict[str, Any]]:
+        if self._client is None:
+            self._client = PubMedSearch()
+        articles = await self._client.search(query, count=self.count)
+        return [
+            {
+                "title": article.get("title", "N/A"),
+                "url": article.get("url"),
+                "content": "" if article.get("abstract") == "N/A" else article.get("abstract", ""),
+                "pmid": article.get("pmid"),
+            }
+            for article in articles
+        ]
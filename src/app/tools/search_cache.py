@@ -0,0 +1,128 @@
+"""Cache persistente de respostas das buscas (Brave, PubMed) com política de validade por provedor."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.config.settings import settings
+from app.core.cache import CacheStats, SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza a consulta para a chave do cache: minúsculas e espaços colapsados."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def _is_cacheable(result: Any) -> bool:
+    # Erros (BraveSearch retorna {"error": ...}) e respostas vazias não são guardados.
+    if not result:
+        return False
+    return not (isinstance(result, dict) and "error" in result)
+
+
+class SearchCache:
+    """
+    Guarda respostas de busca por provedor, consulta normalizada e quantidade de resultados.
+
+    Uma entrada mais nova que o TTL do provedor é servida diretamente. Uma entrada
+    expirada há menos de `stale_seconds` também é servida, enquanto uma atualização é
+    feita em segundo plano (stale-while-revalidate). Entradas mais antigas são buscadas
+    novamente antes de responder.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteCache,
+        ttl_seconds: Dict[str, float],
+        default_ttl_seconds: float,
+        stale_seconds: float = 0,
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.stats = CacheStats()
+        self._refreshing: Set[str] = set()
+        self._background: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def make_key(provider: str, query: str, count: int) -> str:
+        payload = json.dumps([provider, normalize_query(query), count], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def fetch(self, provider: str, query: str, count: int, search: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Retorna a resposta cacheada de `search()` para a consulta, executando-a quando necessário.
+
+        Args:
+            provider (str): O provedor de busca (ex: "brave", "pubmed").
+            query (str): A consulta.
+            count (int): A quantidade de resultados solicitada.
+            search (Callable[[], Awaitable[Any]]): Executa a busca real no provedor.
+
+        Returns:
+            Any: A resposta do provedor (da busca ou do cache).
+        """
+        key = self.make_key(provider, query, count)
+        entry = await asyncio.to_thread(self.store.get_with_age, key)
+        if entry is not None:
+            value, age = entry
+            ttl = self.ttl_seconds.get(provider, self.default_ttl_seconds)
+            if age <= ttl:
+                self.stats.hits += 1
+                return json.loads(value)
+            if age <= ttl + self.stale_seconds:
+                self.stats.hits += 1
+                self._refresh_in_background(key, provider, query, search)
+                return json.loads(value)
+            self.stats.expirations += 1
+
+        self.stats.misses += 1
+        return await self._search_and_store(key, search)
+
+    async def _search_and_store(self, key: str, search: Callable[[], Awaitable[Any]]) -> Any:
+        result = await search()
+        if _is_cacheable(result):
+            await asyncio.to_thread(self.store.set, key, json.dumps(result, ensure_ascii=False, default=str))
+        return result
+
+    def _refresh_in_background(
+        self, key: str, provider: str, query: str, search: Callable[[], Awaitable[Any]]
+    ) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                await self._search_and_store(key, search)
+                logger.debug(f"Cache de busca '{provider}' atualizado para: '{query}'")
+            except Exception as e:
+                logger.warning(f"Falha ao atualizar em segundo plano a busca '{provider}' para '{query}': {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+@lru_cache
+def get_search_cache() -> Optional[SearchCache]:
+    """Retorna o `SearchCache` configurado em `settings.search_cache`, ou None se desabilitado."""
+    cache_settings = settings.search_cache
+    if not cache_settings.enabled:
+        return None
+    store = SQLiteCache(cache_settings.path, max_entries=cache_settings.max_entries)
+    return SearchCache(
+        store,
+        ttl_seconds=cache_settings.ttl_seconds,
+        default_ttl_seconds=cache_settings.default_ttl_seconds,
+        stale_seconds=cache_settings.stale_while_revalidate_seconds,
+    )
@@ -0,0 +1,77 @@
+"""Limitação de taxa compartilhada pelas ferramentas de busca, com um balde por provedor."""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.config.settings import settings
+from app.core.rate_limiting import PriorityRateLimiter, RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class SearchRateLimiter:
+    """
+    Mantém um `PriorityRateLimiter` por provedor e executa as chamadas através dele.
+
+    Uma resposta 429 (`RateLimitExceeded`) suspende o provedor pelo `Retry-After`
+    informado (ou `default_retry_after_seconds`) e a chamada é repetida até `max_retries` vezes.
+    """
+
+    def __init__(self, limiters: Dict[str, PriorityRateLimiter], max_retries: int, default_retry_after_seconds: float):
+        self.limiters = limiters
+        self.max_retries = max_retries
+        self.default_retry_after_seconds = default_retry_after_seconds
+
+    async def run(self, provider: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `call()` respeitando o limite do provedor.
+
+        Raises:
+            RateLimitExceeded: Se o provedor continuar respondendo 429 após `max_retries` tentativas.
+        """
+        limiter: Optional[PriorityRateLimiter] = self.limiters.get(provider)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                waited = await limiter.acquire()
+                if waited > 1:
+                    logger.debug(f"Busca no provedor '{provider}' aguardou {waited:.2f}s pelo limite de taxa.")
+            try:
+                return await call()
+            except RateLimitExceeded as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                pause = e.retry_after if e.retry_after is not None else self.default_retry_after_seconds
+                logger.warning(
+                    f"Provedor '{provider}' respondeu 429; nova tentativa ({attempt}/{self.max_retries}) em {pause:.1f}s."
+                )
+                if limiter is not None:
+                    limiter.penalize(pause)
+
+
+def _pubmed_requests_per_second() -> float:
+    configured = settings.search_rate_limits.pubmed_requests_per_second
+    if configured is not None:
+        return configured
+    # Limites do NCBI Entrez: 10 requisições/s com chave de API, 3/s sem.
+    return 10.0 if os.getenv("ENTREZ_API_KEY") else 3.0
+
+
+@lru_cache
+def get_search_rate_limiter() -> SearchRateLimiter:
+    """Retorna o `SearchRateLimiter` do processo, configurado em `settings.search_rate_limits`."""
+    limit_settings = settings.search_rate_limits
+    limiters: Dict[str, PriorityRateLimiter] = {}
+    if limit_settings.enabled:
+        # `search.rate_limit` é em requisições por minuto; a rajada é limitada a esse mesmo valor.
+        limiters["brave"] = PriorityRateLimiter(settings.search.rate_limit)
+        pubmed_rps = _pubmed_requests_per_second()
+        limiters["pubmed"] = PriorityRateLimiter(pubmed_rps * 60, capacity=pubmed_rps)
+    return SearchRateLimiter(
+        limiters,
+        max_retries=limit_settings.max_retries,
+        default_retry_after_seconds=limit_settings.default_retry_after_seconds,
+    )
@@ -1,8 +1,8 @@
 """Utilidades de busca na web."""
 
-from src.app.tools.brave_search import BraveSearch
-from src.app.tools.pubmed_search import PubMedSearch
-from src.app.config.settings import settings
+from app.tools.brave_search import BraveSearch
+from app.tools.pubmed_search import PubMedSearch
+from app.config.settings import settings
 
 FORBIDDEN_TOPICS = ["programming", "machine learning"]
 ALLOWED_TOPICS = ["bariatric", "bariátrica", "obesity", "obesidade"]
@@ -42,15 +42,20 @@ async def search_web(
         query = "cirurgia bariátrica e tratamento da obesidade"
 
     if search_type == "academic":
-        pubmed_search = PubMedSearch()
-        return await pubmed_search.search(query, count=count)
+        return await _search_provider("pubmed", query, count)
     if search_type == "general":
-        brave_search = BraveSearch()
-        return await brave_search.search(query, count=count)
+        return await _search_provider("brave", query, count)
     if search_type == "auto":
         if "academic" in query.lower():
-            pubmed_search = PubMedSearch()
-            return await pubmed_search.search(query, count=count)
-        brave_search = BraveSearch()
-        return await brave_search.search(query, count=count)
+            return await _search_provider("pubmed", query, count)
+        return await _search_provider("brave", query, count)
     raise ValueError(f"Invalid search type: {search_type}")
+
+
+async def _search_provider(provider: str, query: str, count: int):
+    """Executa a busca no provedor (o cache de respostas é aplicado pelo próprio provedor)."""
+    if provider == "pubmed":
+        pubmed_search = PubMedSearch()
+        return await pubmed_search.search(query, count=count)
+    brave_search = BraveSearch()
+    return await brave_search.search(query, count=count)
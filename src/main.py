@@ -2,6 +2,9 @@ import logging
 import asyncio
 from src.app.scheduler_service import SchedulerService
 from src.app.config.logging_config import setup_logging
+from app.core.graph_schema import bootstrap_graph_schemas
+from app.core.http_client import close_http_clients
+from app.core.registry import close_resources
 
 def main() -> None:
     """
@@ -19,6 +22,12 @@ def main() -> None:
     logger = logging.getLogger(__name__) # Get logger after configuration
 
     logger.info("Starting the Provida application...")
+
+    try:
+        # Idempotent: creates Neo4j constraints/indexes only if they do not exist yet
+        asyncio.get_event_loop().run_until_complete(bootstrap_graph_schemas())
+    except Exception as e:
+        logger.error(f"Failed to bootstrap Neo4j schema: {e}")
     
     try:
         scheduler_service = SchedulerService()
@@ -33,6 +42,8 @@ def main() -> None:
         asyncio.get_event_loop().run_forever()
     except (KeyboardInterrupt, SystemExit):
         scheduler_service.shutdown()
+        asyncio.get_event_loop().run_until_complete(close_http_clients())
+        asyncio.get_event_loop().run_until_complete(close_resources())
         logger.info("Provida application shut down.")
 
 if __name__ == "__main__":
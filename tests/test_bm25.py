@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from src.app.core.bm25 import BM25Index, tokenize
+
+
+class TestBM25Index(unittest.TestCase):
+    def setUp(self):
+        self.index = BM25Index()
+        self.index.add_many([
+            ("a", "Bypass gástrico em Y de Roux (RYGB) reduz o peso corporal."),
+            ("b", "A gastrectomia vertical (SG) é comparada ao RYGB em ensaio randomizado."),
+            ("c", "Semaglutida e outros agonistas de GLP-1 na obesidade. PMID: 31000001"),
+            ("d", "Atividade física e dieta no pós-operatório."),
+        ])
+
+    def test_tokenize_normalizes_accents_and_keeps_compounds(self):
+        self.assertEqual(tokenize("Gástrico GLP-1"), ["gastrico", "glp-1", "glp", "1"])
+
+    def test_exact_terms_are_found(self):
+        self.assertEqual(self.index.search("RYGB", top_k=2)[0][0], "a")
+        self.assertEqual({doc_id for doc_id, _ in self.index.search("rygb", top_k=5)}, {"a", "b"})
+        self.assertEqual(self.index.search("31000001")[0][0], "c")
+        self.assertEqual(self.index.search("glp-1")[0][0], "c")
+
+    def test_unknown_terms_return_nothing(self):
+        self.assertEqual(self.index.search("inexistente"), [])
+
+    def test_existing_ids_are_not_reindexed(self):
+        self.index.add("a", "outro texto")
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.search("outro"), [])
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bm25", "collection.json")
+            self.index.save(path)
+            loaded = BM25Index.load(path)
+        self.assertEqual(loaded.search("gastrectomia vertical"), self.index.search("gastrectomia vertical"))
+        self.assertEqual(len(loaded), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+
+from src.app.core.budget import BudgetExceeded, RunBudget, budget_scope, current_budget, finalizing
+
+
+class TestRunBudget(unittest.TestCase):
+    def test_searches_stop_at_limit(self):
+        budget = RunBudget(max_searches=3)
+        self.assertTrue(budget.try_spend_searches(2))
+        self.assertFalse(budget.try_spend_searches(2))
+        self.assertTrue(budget.try_spend_searches(1))
+        self.assertTrue(budget.searches_exhausted)
+        self.assertEqual(budget.as_dict()["denied_searches"], 2)
+
+    def test_unlimited_budget(self):
+        budget = RunBudget()
+        for _ in range(100):
+            self.assertTrue(budget.try_spend_searches())
+            budget.reserve_llm_call(10_000)
+        self.assertFalse(budget.searches_exhausted)
+
+    def test_llm_reserve_is_only_available_when_finalizing(self):
+        budget = RunBudget(max_llm_calls=3, reserved_llm_calls=1)
+        budget.reserve_llm_call(10)
+        budget.reserve_llm_call(10)
+        with self.assertRaises(BudgetExceeded):
+            budget.reserve_llm_call(10)
+        with finalizing():
+            budget.reserve_llm_call(10)
+            with self.assertRaises(BudgetExceeded):
+                budget.reserve_llm_call(10)
+        self.assertEqual(budget.llm_calls, 3)
+        self.assertEqual(budget.denied_llm_calls, 2)
+
+    def test_token_limit_and_adjustment(self):
+        budget = RunBudget(max_tokens=1000)
+        budget.reserve_llm_call(800)
+        with self.assertRaises(BudgetExceeded):
+            budget.reserve_llm_call(300)
+        budget.adjust_tokens(-500)
+        budget.reserve_llm_call(300)
+        self.assertEqual(budget.tokens, 600)
+
+
+class TestBudgetScope(unittest.IsolatedAsyncioTestCase):
+    async def test_scope_is_shared_by_child_tasks(self):
+        budget = RunBudget(max_searches=5)
+
+        async def search():
+            return current_budget.get().try_spend_searches()
+
+        with budget_scope(budget):
+            results = await asyncio.gather(*(search() for _ in range(8)))
+        self.assertEqual(results.count(True), 5)
+        self.assertIsNone(current_budget.get())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.app.core.cache import LRUCache, SQLiteCache, TieredCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    @patch('src.app.core.cache.time.time')
+    def test_expires_after_ttl(self, mock_time):
+        mock_time.return_value = 1000.0
+        cache = LRUCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", "1")
+
+        mock_time.return_value = 1061.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_persists_between_instances(self):
+        cache = SQLiteCache(self.path)
+        cache.set("key", "value")
+        cache.close()
+
+        reopened = SQLiteCache(self.path)
+        self.assertEqual(reopened.get("key"), "value")
+        self.assertEqual(reopened.stats.hits, 1)
+        reopened.close()
+
+    def test_size_bounded_eviction(self):
+        cache = SQLiteCache(self.path, max_entries=3)
+        for i in range(5):
+            cache.set(f"k{i}", str(i))
+
+        self.assertIsNone(cache.get("k0"))
+        self.assertEqual(cache.get("k4"), "4")
+        self.assertEqual(cache.stats.evictions, 2)
+        cache.close()
+
+
+class TestTieredCache(unittest.TestCase):
+    def test_disk_hit_is_promoted_to_memory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            disk = SQLiteCache(os.path.join(tmp_dir, "cache.sqlite"))
+            disk.set("key", "value")
+            cache = TieredCache(LRUCache(max_entries=10), disk)
+
+            self.assertEqual(cache.get("key"), "value")
+            self.assertEqual(cache.memory.get("key"), "value")
+            self.assertIsNone(cache.get("missing"))
+            self.assertEqual(cache.stats.hits, 1)
+            self.assertEqual(cache.stats.misses, 1)
+            disk.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
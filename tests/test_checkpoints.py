@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from src.app.checkpoints import CheckpointStore, new_run_id
+from src.app.models.research_models import CollectedDataItem
+
+
+class TestCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(os.path.join(self.tmp_dir.name, "runs.sqlite"))
+        self.run_id = new_run_id()
+        self.store.ensure_run(self.run_id, "gastrectomia vertical", 20)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_run_metadata_is_kept(self):
+        run = self.store.get_run(self.run_id)
+        self.assertEqual(run["topic"], "gastrectomia vertical")
+        self.assertEqual(run["search_limit"], 20)
+        self.assertEqual(run["status"], "running")
+
+        self.store.set_status(self.run_id, "failed")
+        self.assertEqual(self.store.get_run(self.run_id)["status"], "failed")
+
+    def test_node_checkpoint_serialises_models(self):
+        update = {"collected_data": [CollectedDataItem(source_identifier="pmid:1", content="abc")]}
+        self.store.save_node(self.run_id, "collect", update)
+
+        saved = self.store.load_node(self.run_id, "collect")
+        self.assertEqual(saved, {"collected_data": [{"source_identifier": "pmid:1", "content": "abc", "questions": []}]})
+        self.assertIsNone(self.store.load_node(self.run_id, "analyze"))
+
+    def test_analyses_are_scoped_by_run(self):
+        self.store.save_analysis(self.run_id, "pmid:1", {"summary": "s", "evidence_level": "B"})
+        self.store.save_analysis(new_run_id(), "pmid:2", {"summary": "t", "evidence_level": "C"})
+
+        self.assertEqual(list(self.store.load_analyses(self.run_id)), ["pmid:1"])
+
+    def test_searches_are_scoped_by_run(self):
+        results = [{"url": "https://pubmed.ncbi.nlm.nih.gov/1/", "snippet": "abc"}]
+        self.store.save_search(self.run_id, "sleeve vs bypass", results)
+        self.store.save_search(new_run_id(), "outra pergunta", [])
+
+        self.assertEqual(self.store.load_searches(self.run_id), {"sleeve vs bypass": results})
+
+
+if __name__ == '__main__':
+    unittest.main()
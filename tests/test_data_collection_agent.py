@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from src.app.agents import data_collection_agent
+from src.app.core.budget import RunBudget
+from src.app.agents.data_collection_agent import DataCollectionAgent
+
+
+class FakeTool:
+    def __init__(self, results, delay=0.0):
+        self.results = results
+        self.delay = delay
+        self.queries = []
+
+    async def run(self, query):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        return self.results
+
+
+class TestFanOutSearch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # O RoutingAgent não participa do fan-out; as ferramentas reais são substituídas.
+        self.agent = DataCollectionAgent.__new__(DataCollectionAgent)
+        research_settings = data_collection_agent.settings.research
+        for name, value in {"provider_deadlines": {"slow": 0.05}, "default_deadline": 1.0, "rrf_k": 60}.items():
+            patcher = patch.object(research_settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_tool_past_its_deadline_is_dropped(self):
+        self.agent.tools = {
+            "fast": FakeTool([{"url": "https://example.org/a", "snippet": "a"}]),
+            "slow": FakeTool([{"url": "https://example.org/b", "snippet": "b"}], delay=1.0),
+        }
+
+        results = await asyncio.wait_for(self.agent._fan_out_search("obesidade"), timeout=0.5)
+
+        self.assertEqual([result["url"] for result in results], ["https://example.org/a"])
+
+    async def test_same_pmid_from_two_tools_is_merged(self):
+        self.agent.tools = {
+            "web": FakeTool([{"url": "https://www.ncbi.nlm.nih.gov/pubmed/31000001", "snippet": "curto"}]),
+            "pubmed": FakeTool([{"url": "https://pubmed.ncbi.nlm.nih.gov/31000001/", "content": "resumo completo"}]),
+        }
+
+        results = await self.agent._fan_out_search("sleeve vs bypass")
+
+        self.assertEqual(results, [{"url": "https://pubmed.ncbi.nlm.nih.gov/31000001/", "content": "resumo completo"}])
+
+    async def test_same_doi_from_two_tools_is_merged(self):
+        self.agent.tools = {
+            "web": FakeTool([{"url": "https://doi.org/10.1000/XYZ.1", "snippet": "a"}]),
+            "pubmed": FakeTool([{"url": "https://dx.doi.org/10.1000/xyz.1", "snippet": "b"}]),
+        }
+
+        self.assertEqual(len(await self.agent._fan_out_search("sleeve vs bypass")), 1)
+
+    async def test_results_follow_reciprocal_rank_fusion(self):
+        self.agent.tools = {
+            "web": FakeTool([{"url": "https://example.org/x"}, {"url": "https://example.org/y"}]),
+            "pubmed": FakeTool([{"url": "https://example.org/y"}, {"url": "https://example.org/z"}]),
+        }
+
+        results = await self.agent._fan_out_search("obesidade")
+
+        # y aparece nas duas listas; x (1º em uma) supera z (2º em uma).
+        self.assertEqual(
+            [result["url"] for result in results],
+            ["https://example.org/y", "https://example.org/x", "https://example.org/z"],
+        )
+
+
+class TestIterCollectedData(unittest.IsolatedAsyncioTestCase):
+    async def test_completed_searches_are_replayed_without_searching(self):
+        agent = DataCollectionAgent.__new__(DataCollectionAgent)
+        agent.tools = {}
+        searched, saved = [], {}
+
+        async def search(query):
+            searched.append(query)
+            return [{"url": f"https://example.org/{len(searched)}", "snippet": query}]
+
+        async def on_search(query, results):
+            saved[query] = results
+
+        agent._search = search
+        plan = {"research_questions": [{"query": "q1"}, {"query": "q2"}]}
+        completed = {"q1": [{"url": "https://example.org/saved", "snippet": "q1"}]}
+        # Só a busca nova consome o orçamento: uma única busca basta para retomar.
+        budget = RunBudget(max_searches=1)
+        token = data_collection_agent.current_budget.set(budget)
+        self.addCleanup(data_collection_agent.current_budget.reset, token)
+        with patch.object(data_collection_agent.settings.research, "search_mode", "route"):
+            items = [item async for item in agent.iter_collected_data(plan, completed, on_search)]
+
+        self.assertEqual(searched, ["q2"])
+        self.assertEqual(budget.searches, 1)
+        self.assertEqual(set(saved), {"q2"})
+        self.assertEqual(
+            {item.source_identifier for item in items}, {"https://example.org/saved", "https://example.org/1"}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
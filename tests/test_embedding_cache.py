@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from src.app.core.embedding_cache import CachedEmbeddingFunction, EmbeddingCache, chunk_hash
+
+
+class CountingEmbedding:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [[float(len(text)), 0.5, -1.0] for text in input]
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_normalized_text_shares_key(self):
+        self.assertEqual(chunk_hash("obesidade  grave\n"), chunk_hash("obesidade grave"))
+
+    def test_only_missing_texts_are_embedded(self):
+        model = CountingEmbedding()
+        embed = CachedEmbeddingFunction(model, EmbeddingCache(self.directory.name, "model/a"))
+
+        first = embed(["a", "bb"])
+        second = embed(["bb", "ccc", "a"])
+
+        self.assertEqual(model.calls, [["a", "bb"], ["ccc"]])
+        self.assertEqual(second, [first[1], [3.0, 0.5, -1.0], first[0]])
+
+    def test_cache_survives_reopen(self):
+        cache = EmbeddingCache(self.directory.name, "model-a")
+        cache.put_many(["texto"], [[0.25, 0.5]])
+        cache.close()
+
+        reopened = EmbeddingCache(self.directory.name, "model-a")
+        self.assertEqual(reopened.get_many(["texto", "outro"]), [[0.25, 0.5], None])
+        self.assertEqual(len(EmbeddingCache(self.directory.name, "model-b")), 0)
+
+    def test_orphan_rows_from_interrupted_write_are_dropped(self):
+        cache = EmbeddingCache(self.directory.name, "model-a")
+        cache.put_many(["um"], [[1.0, 1.0]])
+        cache.close()
+        with open(cache.data_path, "ab") as f:
+            f.write(b"\x00" * 8)  # vetor gravado sem a linha correspondente no índice
+
+        reopened = EmbeddingCache(self.directory.name, "model-a")
+        reopened.put_many(["dois"], [[2.0, 2.0]])
+        self.assertEqual(reopened.get_many(["um", "dois"]), [[1.0, 1.0], [2.0, 2.0]])
+        self.assertEqual(os.path.getsize(cache.data_path), 16)
+
+    def test_writers_sharing_a_directory_stay_aligned(self):
+        # Duas instâncias simulam a API e `provida ingest` gravando no mesmo diretório.
+        api = EmbeddingCache(self.directory.name, "model-a")
+        ingest = EmbeddingCache(self.directory.name, "model-a")
+
+        api.put_many(["um"], [[1.0, 1.0]])
+        ingest.put_many(["dois", "um"], [[2.0, 2.0], [9.0, 9.0]])
+        api.put_many(["tres"], [[3.0, 3.0]])
+
+        expected = [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]
+        self.assertEqual(api.get_many(["um", "dois", "tres"]), expected)
+        self.assertEqual(EmbeddingCache(self.directory.name, "model-a").get_many(["um", "dois", "tres"]), expected)
+        self.assertEqual(os.path.getsize(api.data_path), 24)
+
+    def test_dimension_mismatch_is_rejected(self):
+        cache = EmbeddingCache(self.directory.name, "model-a")
+        cache.put_many(["um"], [[1.0, 1.0]])
+        with self.assertRaises(ValueError):
+            cache.put_many(["dois"], [[1.0, 1.0, 1.0]])
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
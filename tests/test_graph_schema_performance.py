@@ -0,0 +1,87 @@
+import os
+import statistics
+import time
+import unittest
+import uuid
+
+from src.app.core.graph_schema import KNOWLEDGE_SCHEMA
+
+BENCHMARK_URI = os.getenv("NEO4J_BENCHMARK_URI")
+
+MERGE_SOURCE_QUERY = """
+MERGE (topic:Topic {name: $topic})
+MERGE (source:Source {identifier: $identifier})
+MERGE (source)-[:RELATED_TO]->(topic)
+"""
+
+
+@unittest.skipUnless(BENCHMARK_URI, "Defina NEO4J_BENCHMARK_URI para executar o benchmark do schema.")
+class TestGraphSchemaPerformance(unittest.TestCase):
+    """
+    Mede o custo de MERGE em Source.identifier enquanto o grafo cresce.
+
+    Usa um banco descartável: todos os nós criados levam o rótulo :Benchmark e são
+    removidos ao final.
+    """
+
+    graph_sizes = [1_000, 10_000, 50_000]
+    merges_per_size = 200
+
+    def setUp(self):
+        from neo4j import GraphDatabase
+
+        self.driver = GraphDatabase.driver(
+            BENCHMARK_URI,
+            auth=(os.getenv("NEO4J_BENCHMARK_USER", "neo4j"), os.getenv("NEO4J_BENCHMARK_PASSWORD", "")),
+        )
+        self.database = os.getenv("NEO4J_BENCHMARK_DATABASE", "neo4j")
+        for statement in KNOWLEDGE_SCHEMA:
+            self.driver.execute_query(statement, database_=self.database)
+        self.timings = {}
+
+    def tearDown(self):
+        deleted = None
+        while deleted != 0:
+            (deleted,) = self.driver.execute_query(
+                "MATCH (n:Benchmark) WITH n LIMIT 10000 DETACH DELETE n RETURN count(*) AS deleted",
+                database_=self.database,
+            ).records[0].values()
+        self.driver.close()
+
+        print("Schema Benchmark Report (median MERGE latency per graph size):")
+        for size, latency in self.timings.items():
+            print(f"  {size:>7} sources: {latency * 1000:.2f} ms")
+
+    def _grow_graph_to(self, size):
+        (current,) = self.driver.execute_query(
+            "MATCH (n:Source:Benchmark) RETURN count(n) AS c", database_=self.database
+        ).records[0].values()
+        if current < size:
+            self.driver.execute_query(
+                "UNWIND range(1, $n) AS i CREATE (:Source:Benchmark {identifier: 'bench-' + randomUUID()})",
+                n=size - current,
+                database_=self.database,
+            )
+
+    def test_merge_cost_stays_flat(self):
+        for size in self.graph_sizes:
+            self._grow_graph_to(size)
+            latencies = []
+            for _ in range(self.merges_per_size):
+                start_time = time.perf_counter()
+                self.driver.execute_query(
+                    MERGE_SOURCE_QUERY + " SET source:Benchmark, topic:Benchmark",
+                    topic="benchmark-topic",
+                    identifier=f"bench-merge-{uuid.uuid4()}",
+                    database_=self.database,
+                )
+                latencies.append(time.perf_counter() - start_time)
+            self.timings[size] = statistics.median(latencies)
+
+        smallest, largest = self.timings[self.graph_sizes[0]], self.timings[self.graph_sizes[-1]]
+        # Sem índice o custo cresceria ~50x entre 1k e 50k nós; com o índice deve ficar estável.
+        self.assertLess(largest, smallest * 3, f"MERGE ficou mais lento com o crescimento do grafo: {self.timings}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import asyncio
+import unittest
+
+from src.app.core.http_client import close_http_clients, get_http_client
+
+
+class TestHTTPClientPool(unittest.TestCase):
+    def test_client_is_shared_within_a_loop(self):
+        async def run():
+            first, second = get_http_client(), get_http_client()
+            await close_http_clients()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertIs(first, second)
+        self.assertTrue(first.is_closed)
+
+    def test_each_loop_gets_its_own_client(self):
+        async def run():
+            client = get_http_client()
+            await close_http_clients()
+            return client
+
+        self.assertIsNot(asyncio.run(run()), asyncio.run(run()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.app.core.bm25 import BM25Index
+from src.app.ingestion import content_id, ingest_directory, split_text
+
+
+class FakeCollection:
+    def __init__(self, existing_ids=()):
+        self.ids = set(existing_ids)
+        self.upserts = []
+
+    def get(self, ids, include):
+        return {"ids": [chunk_id for chunk_id in ids if chunk_id in self.ids]}
+
+    def upsert(self, ids, documents, metadatas, embeddings):
+        self.upserts.append(ids)
+        self.ids.update(ids)
+
+
+def fake_embed(texts):
+    return [[float(len(text))] for text in texts]
+
+
+class TestSplitText(unittest.TestCase):
+    def test_chunks_overlap_and_cover_text(self):
+        text = " ".join(f"palavra{i}" for i in range(300))
+        chunks = split_text(text, chunk_size=200, overlap=40)
+
+        self.assertTrue(all(len(chunk) <= 200 for chunk in chunks))
+        self.assertTrue(chunks[0].startswith("palavra0 "))
+        self.assertTrue(chunks[-1].endswith("palavra299"))
+        # O fim de cada trecho reaparece no início do seguinte.
+        for first, second in zip(chunks, chunks[1:]):
+            self.assertIn(first.split()[-1], second)
+
+    def test_short_text_is_single_chunk(self):
+        self.assertEqual(split_text("  texto curto \n", chunk_size=100, overlap=10), ["texto curto"])
+
+    def test_overlap_must_be_smaller_than_chunk(self):
+        with self.assertRaises(ValueError):
+            split_text("abc", chunk_size=10, overlap=10)
+
+
+class TestIngestDirectory(unittest.IsolatedAsyncioTestCase):
+    async def test_ingests_and_skips_duplicates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, "a.txt").write_text("Primeiro documento.", encoding="utf-8")
+            Path(directory, "b.md").write_text("Primeiro documento.", encoding="utf-8")
+            Path(directory, "c.txt").write_text("Já indexado.", encoding="utf-8")
+            Path(directory, "ignored.bin").write_bytes(b"\x00")
+            collection = FakeCollection(existing_ids=[content_id("Já indexado.")])
+            progress = []
+            bm25_index = BM25Index()
+            bm25_index.revision = 4
+
+            with patch('src.app.ingestion.get_collection', return_value=collection), \
+                    patch('src.app.ingestion.get_embedding_function', return_value=fake_embed), \
+                    patch('src.app.ingestion.load_bm25_index', return_value=bm25_index), \
+                    patch('src.app.ingestion.save_bm25_index') as mock_save, \
+                    patch('src.app.ingestion.bump_collection_revision', return_value=5) as mock_bump:
+                stats = await ingest_directory(Path(directory), on_progress=lambda s: progress.append(s.upserted))
+
+        self.assertEqual(stats.documents, 3)
+        self.assertEqual(stats.chunks, 3)
+        self.assertEqual(stats.duplicates, 2)
+        self.assertEqual(stats.upserted, 1)
+        self.assertEqual(collection.upserts, [[content_id("Primeiro documento.")]])
+        self.assertEqual(progress, [1])
+        self.assertIn(content_id("Primeiro documento."), bm25_index)
+        mock_save.assert_called_once()
+        mock_bump.assert_called_once()
+        self.assertEqual(bm25_index.revision, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from src.app.agents.memory_agent import MemoryAgent
+
+
+@patch('src.app.agents.memory_agent.get_shared_neo4j_driver')
+class TestMemoryAgent(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        MemoryAgent._cache = None
+        MemoryAgent._negative_cache = None
+        MemoryAgent._pending = {}
+        MemoryAgent._flush_task = None
+
+    async def test_recall_many_uses_single_query_and_caches(self, mock_driver):
+        with patch('src.app.agents.memory_agent.execute_query', new_callable=AsyncMock) as mock_query:
+            mock_query.return_value = [{"key": "a", "value": "1"}]
+            memory = MemoryAgent(agent_id="test_agent")
+
+            values = await memory.recall_many(["a", "b", "a"])
+            self.assertEqual(values, {"a": "1", "b": None})
+            self.assertEqual(mock_query.await_count, 1)
+
+            # Tanto o valor encontrado quanto a ausência são servidos pelo cache.
+            self.assertEqual(await memory.recall("a"), "1")
+            self.assertIsNone(await memory.recall("b"))
+            self.assertEqual(mock_query.await_count, 1)
+
+    async def test_misses_expire_after_negative_ttl(self, mock_driver):
+        with patch('src.app.agents.memory_agent.execute_query', new_callable=AsyncMock) as mock_query, \
+                patch('time.time') as mock_time:
+            mock_time.return_value = 1000.0
+            mock_query.return_value = []
+            memory = MemoryAgent(agent_id="test_agent")
+            self.assertIsNone(await memory.recall("b"))
+
+            # Outro processo grava a memória; a ausência em cache expira bem antes do TTL principal.
+            mock_query.return_value = [{"key": "b", "value": "2"}]
+            mock_time.return_value = 1000.0 + MemoryAgent._negative_cache.ttl_seconds + 1
+            self.assertEqual(await memory.recall("b"), "2")
+            self.assertEqual(mock_query.await_count, 2)
+
+    async def test_remember_is_buffered_until_flush(self, mock_driver):
+        with patch('src.app.agents.memory_agent.execute_query', new_callable=AsyncMock) as mock_query:
+            mock_query.return_value = []
+            first, second = MemoryAgent(agent_id="agent_1"), MemoryAgent(agent_id="agent_2")
+
+            await first.remember("k1", "v1")
+            await second.remember("k2", "v2")
+            self.assertEqual(mock_query.await_count, 0)
+            self.assertEqual(await first.recall("k1"), "v1")
+
+            self.assertEqual(await MemoryAgent.flush_all(), 2)
+            self.assertEqual(mock_query.await_count, 1)
+            memories = mock_query.await_args.args[3]["memories"]
+            self.assertEqual({(m["agent_id"], m["key"]) for m in memories}, {("agent_1", "k1"), ("agent_2", "k2")})
+
+    async def test_failed_flush_keeps_memories_pending(self, mock_driver):
+        with patch('src.app.agents.memory_agent.execute_query', new_callable=AsyncMock) as mock_query:
+            mock_query.side_effect = RuntimeError("neo4j indisponível")
+            memory = MemoryAgent(agent_id="test_agent")
+
+            await memory.remember("k", "v")
+            self.assertEqual(await MemoryAgent.flush_all(), 0)
+            self.assertIn(("test_agent", "k"), MemoryAgent._pending)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import os
+import unittest
+
+from src.app.tools.pubmed_parser import iter_pubmed_articles, parse_pubmed_articles
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "pubmed_efetch_sample.xml")
+
+
+class TestPubMedParser(unittest.TestCase):
+    def setUp(self):
+        self.records = list(iter_pubmed_articles(FIXTURE))
+
+    def test_extracts_used_fields(self):
+        first = self.records[0]
+        self.assertEqual(first["pmid"], "31000001")
+        self.assertEqual(first["title"], "Long-term outcomes of sleeve gastrectomy versus Roux-en-Y gastric bypass.")
+        self.assertEqual(
+            first["abstract"],
+            "Sleeve gastrectomy is now the most performed bariatric procedure. "
+            "Excess weight loss at 5 years was 58% after sleeve gastrectomy and 65% after bypass.",
+        )
+        self.assertEqual(first["authors"], ["Silva Ana", "Souza Bruno"])
+        self.assertEqual(first["journal"], "Obesity surgery")
+        self.assertEqual(first["pub_date"], "2019 Apr")
+        self.assertEqual(first["url"], "https://pubmed.ncbi.nlm.nih.gov/31000001/")
+
+    def test_handles_inline_markup_and_collective_authors(self):
+        second = self.records[1]
+        self.assertEqual(second["title"], "Effect of GLP-1 receptor agonists on weight regain after bariatric surgery.")
+        self.assertEqual(second["authors"], ["Bariatric Outcomes Study Group"])
+        self.assertEqual(second["pub_date"], "2020")
+
+    def test_missing_fields_default_to_na(self):
+        third = self.records[2]
+        self.assertEqual(third["abstract"], "N/A")
+        self.assertEqual(third["authors"], [])
+        self.assertEqual(third["pub_date"], "N/A")
+
+    def test_parses_binary_streams(self):
+        with open(FIXTURE, "rb") as f:
+            parsed = parse_pubmed_articles(io.BytesIO(f.read()))
+        self.assertEqual([r["pmid"] for r in parsed["PubmedArticle"]], ["31000001", "31000002", "31000003"])
+
+
+if __name__ == '__main__':
+    unittest.main()
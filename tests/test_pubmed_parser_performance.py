@@ -0,0 +1,78 @@
+import io
+import os
+import re
+import time
+import tracemalloc
+import unittest
+
+from src.app.tools.pubmed_parser import iter_pubmed_articles
+
+try:
+    from Bio import Entrez
+except ImportError:  # Biopython é opcional para este benchmark
+    Entrez = None
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "pubmed_efetch_sample.xml")
+
+
+def _build_payload(num_articles):
+    """Repete os artigos do fixture até `num_articles`, com PMIDs distintos, simulando um lote de efetch."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        document = f.read()
+    header, rest = document.split("<PubmedArticleSet>", 1)
+    articles = re.findall(r"<PubmedArticle>.*?</PubmedArticle>", rest, flags=re.S)
+    body = [
+        re.sub(r"3100000\d", str(40000000 + i), articles[i % len(articles)])
+        for i in range(num_articles)
+    ]
+    return (header + "<PubmedArticleSet>\n" + "\n".join(body) + "\n</PubmedArticleSet>\n").encode("utf-8")
+
+
+def _measure(parse, payload):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = parse(io.BytesIO(payload))
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _drain(f):
+    count = 0
+    for _ in iter_pubmed_articles(f):
+        count += 1
+    return count
+
+
+class TestPubMedParserMemory(unittest.TestCase):
+    def test_peak_memory_does_not_grow_with_batch_size(self):
+        # Os elementos já processados são liberados, então o pico independe do tamanho do lote.
+        small_count, _, small_peak = _measure(_drain, _build_payload(200))
+        large_count, _, large_peak = _measure(_drain, _build_payload(3200))
+
+        self.assertEqual((small_count, large_count), (200, 3200))
+        self.assertLess(large_peak, small_peak * 2)
+
+
+@unittest.skipIf(Entrez is None, "Biopython não instalado.")
+class TestPubMedParserPerformance(unittest.TestCase):
+    batch_size = 500
+
+    def test_streaming_parser_vs_entrez_read(self):
+        payload = _build_payload(self.batch_size)
+
+        entrez_result, entrez_time, entrez_peak = _measure(Entrez.read, payload)
+        stream_result, stream_time, stream_peak = _measure(lambda f: list(iter_pubmed_articles(f)), payload)
+
+        print(f"PubMed Parser Benchmark Report ({self.batch_size} articles):")
+        print(f"  Entrez.read:        {entrez_time * 1000:.1f} ms, peak {entrez_peak / 1024:.0f} KiB")
+        print(f"  iter_pubmed_articles: {stream_time * 1000:.1f} ms, peak {stream_peak / 1024:.0f} KiB")
+
+        # Os tempos são apenas informativos: comparações de relógio oscilam em máquinas carregadas.
+        self.assertEqual(len(stream_result), len(entrez_result["PubmedArticle"]))
+        self.assertLess(stream_peak, entrez_peak)
+
+
+if __name__ == '__main__':
+    unittest.main()
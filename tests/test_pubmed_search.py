@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.app.core.cache import SQLiteCache
+from src.app.tools.pubmed_search import PubMedSearch
+from src.app.tools.search_cache import SearchCache
+
+
+def _article(pmid):
+    return {"pmid": pmid, "title": f"Title {pmid}", "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"}
+
+
+@patch.dict('os.environ', {"ENTREZ_API_KEY": "key", "ENTREZ_EMAIL": "test@example.com"})
+class TestPubMedBulkRetrieval(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Por padrão os testes não usam o cache de respostas configurado.
+        patcher = patch('src.app.tools.pubmed_search.get_search_cache', return_value=None)
+        self.get_search_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _use_cache(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        store = SQLiteCache(os.path.join(tmpdir.name, "search.sqlite"), max_entries=100)
+        self.addCleanup(store.close)
+        self.get_search_cache.return_value = SearchCache(store, ttl_seconds={}, default_ttl_seconds=3600)
+
+    async def test_iter_articles_pages_through_history_server(self):
+        calls = []
+
+        async def fake_entrez_read(request, **params):
+            calls.append(params)
+            if "usehistory" in params:
+                return {"Count": "5", "WebEnv": "env", "QueryKey": "1"}
+            start = params["retstart"]
+            return {"PubmedArticle": [_article(str(pmid)) for pmid in range(start, start + params["retmax"])]}
+
+        search = PubMedSearch()
+        with patch.object(search, "_entrez_read", side_effect=fake_entrez_read):
+            articles = [article async for article in search.iter_articles("obesity", max_results=5, batch_size=2, max_concurrency=2)]
+
+        self.assertEqual([article["pmid"] for article in articles], ["0", "1", "2", "3", "4"])
+        fetches = [params for params in calls if "usehistory" not in params]
+        self.assertEqual([(params["retstart"], params["retmax"]) for params in fetches], [(0, 2), (2, 2), (4, 1)])
+        self.assertTrue(all(params["webenv"] == "env" and params["query_key"] == "1" for params in fetches))
+
+    async def test_iter_articles_respects_max_results(self):
+        async def fake_entrez_read(request, **params):
+            if "usehistory" in params:
+                return {"Count": "1000", "WebEnv": "env", "QueryKey": "1"}
+            return {"PubmedArticle": [_article(str(params["retstart"] + i)) for i in range(params["retmax"])]}
+
+        search = PubMedSearch()
+        with patch.object(search, "_entrez_read", side_effect=fake_entrez_read):
+            articles = [article async for article in search.iter_articles("obesity", max_results=3, batch_size=2)]
+
+        self.assertEqual(len(articles), 3)
+
+    async def test_search_and_pages_are_served_from_the_search_cache(self):
+        self._use_cache()
+        calls = []
+
+        async def fake_entrez_read(request, **params):
+            calls.append(params)
+            if "usehistory" in params:
+                return {"Count": "3", "WebEnv": f"env{len(calls)}", "QueryKey": "1"}
+            if "term" in params:
+                return {"IdList": ["1"]}
+            start = params.get("retstart", 0)
+            return {"PubmedArticle": [_article(str(pmid)) for pmid in range(start, start + params.get("retmax", 1))]}
+
+        search = PubMedSearch()
+        with patch.object(search, "_entrez_read", side_effect=fake_entrez_read):
+            first = await search.search("obesity", count=1)
+            self.assertEqual(await search.search("Obesity", count=1), first)
+            self.assertEqual(len(calls), 2)
+
+            calls.clear()
+            for _ in range(2):
+                articles = [article async for article in search.iter_articles("obesity", max_results=3, batch_size=2)]
+                self.assertEqual([article["pmid"] for article in articles], ["0", "1", "2"])
+
+        # A segunda leitura refaz apenas o esearch; as páginas vêm do cache.
+        self.assertEqual(["usehistory" in params for params in calls], [True, False, False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
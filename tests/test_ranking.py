@@ -0,0 +1,25 @@
+import unittest
+
+from src.app.core.ranking import reciprocal_rank_fusion
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+    def test_items_in_several_lists_rank_first(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60)
+        self.assertEqual([item for item, _ in fused], ["c", "a", "b", "d"])
+        self.assertAlmostEqual(fused[0][1], 1 / 63 + 1 / 61)
+
+    def test_ties_keep_first_appearance_order(self):
+        fused = reciprocal_rank_fusion([["a"], ["b"]])
+        self.assertEqual([item for item, _ in fused], ["a", "b"])
+
+    def test_weights_and_repeated_items(self):
+        fused = reciprocal_rank_fusion([["a", "a", "b"], ["b"]], k=1, weights=[1.0, 3.0])
+        self.assertEqual(dict(fused), {"a": 0.5, "b": 1 / 3 + 1.5})
+
+    def test_empty_rankings(self):
+        self.assertEqual(reciprocal_rank_fusion([[], []]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import time
+import unittest
+
+from src.app.core.rate_limiting import (
+    AsyncTokenBucket,
+    Priority,
+    PriorityRateLimiter,
+    parse_retry_after,
+    request_priority,
+    with_priority,
+)
+
+
+class TestAsyncTokenBucket(unittest.TestCase):
+    def test_acquire_within_capacity_does_not_wait(self):
+        async def run():
+            bucket = AsyncTokenBucket(rate_per_minute=600)
+            return [await bucket.acquire() for _ in range(5)]
+
+        waits = asyncio.run(run())
+        self.assertTrue(all(wait < 0.05 for wait in waits))
+
+    def test_callers_queue_instead_of_failing(self):
+        async def run():
+            # 600 req/min = 10/s, capacity 1: the third call waits ~0.2s.
+            bucket = AsyncTokenBucket(rate_per_minute=600, capacity=1)
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(run())
+        self.assertGreaterEqual(elapsed, 0.18)
+
+    def test_consume_allows_debt(self):
+        async def run():
+            bucket = AsyncTokenBucket(rate_per_minute=6000, capacity=10)
+            bucket.consume(15)
+            return await bucket.acquire(1)
+
+        waited = asyncio.run(run())
+        self.assertGreater(waited, 0.05)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            AsyncTokenBucket(rate_per_minute=0)
+
+
+class TestPriorityRateLimiter(unittest.TestCase):
+    def test_interactive_requests_overtake_background(self):
+        async def run():
+            # 1200 req/min = 20/s, capacity 1: the bucket is empty after the first call.
+            limiter = PriorityRateLimiter(rate_per_minute=1200, capacity=1)
+            await limiter.acquire(Priority.BACKGROUND)
+            order = []
+
+            async def request(name, priority):
+                await limiter.acquire(priority)
+                order.append(name)
+
+            background = [asyncio.create_task(request(f"bg{i}", Priority.BACKGROUND)) for i in range(3)]
+            await asyncio.sleep(0)
+            interactive = asyncio.create_task(request("interactive", Priority.INTERACTIVE))
+            await asyncio.gather(*background, interactive)
+            return order
+
+        self.assertEqual(asyncio.run(run())[0], "interactive")
+
+    def test_priority_defaults_to_context(self):
+        @with_priority(Priority.BACKGROUND)
+        async def job():
+            return request_priority.get()
+
+        self.assertEqual(asyncio.run(job()), Priority.BACKGROUND)
+        self.assertEqual(request_priority.get(), Priority.INTERACTIVE)
+
+    def test_penalize_blocks_acquire(self):
+        async def run():
+            limiter = PriorityRateLimiter(rate_per_minute=6000)
+            limiter.penalize(0.2)
+            return await limiter.acquire()
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.18)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == '__main__':
+    unittest.main()
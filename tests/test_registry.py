@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.app.core import registry
+from src.app.core.registry import ResourceRegistry, close_resources, get_agent, get_registry
+
+
+class _Agent:
+    instances = 0
+
+    def __init__(self, name="default"):
+        _Agent.instances += 1
+        self.name = name
+
+
+class TestResourceRegistry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        registry._registries.clear()
+        _Agent.instances = 0
+
+    async def test_get_creates_once(self):
+        resources = ResourceRegistry()
+        factory = MagicMock(side_effect=lambda: object())
+        first = resources.get("key", factory)
+        second = resources.get("key", factory)
+        self.assertIs(first, second)
+        factory.assert_called_once()
+
+    async def test_aclose_closes_in_reverse_order(self):
+        resources = ResourceRegistry()
+        closed = []
+        resources.get("driver", lambda: "driver", close=lambda value: closed.append(value))
+        async_close = AsyncMock(side_effect=lambda value: closed.append(value))
+        resources.get("agent", lambda: "agent", close=async_close)
+
+        await resources.aclose()
+
+        self.assertEqual(closed, ["agent", "driver"])
+        self.assertEqual(len(resources), 0)
+
+    async def test_aclose_continues_after_failure(self):
+        resources = ResourceRegistry()
+        closed = []
+        resources.get("first", lambda: 1, close=lambda value: closed.append(value))
+        resources.get("second", lambda: 2, close=MagicMock(side_effect=RuntimeError("boom")))
+
+        await resources.aclose()
+
+        self.assertEqual(closed, [1])
+
+    async def test_get_agent_is_shared_per_arguments(self):
+        self.assertIs(get_agent(_Agent), get_agent(_Agent))
+        self.assertIsNot(get_agent(_Agent, "a"), get_agent(_Agent, "b"))
+        self.assertEqual(_Agent.instances, 3)
+
+    async def test_close_resources_resets_registry(self):
+        first = get_agent(_Agent)
+        await close_resources()
+        self.assertIsNot(get_agent(_Agent), first)
+        self.assertIs(get_registry(), get_registry())
+
+
+if __name__ == '__main__':
+    unittest.main()
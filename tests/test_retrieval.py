@@ -0,0 +1,144 @@
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.app.core import retrieval
+
+CHUNKS = {
+    "c1": "Resultados do bypass gástrico em cinco anos.",
+    "c2": "Perda de peso após cirurgia bariátrica.",
+    "c3": "Comparação entre RYGB e SG em adolescentes.",
+}
+
+
+class FakeCollection:
+    def __init__(self, vector_ids):
+        self.vector_ids = vector_ids
+
+    def count(self):
+        return len(CHUNKS)
+
+    def query(self, query_embeddings, n_results):
+        ids = self.vector_ids[:n_results]
+        return {"ids": [ids], "documents": [[CHUNKS[i] for i in ids]], "metadatas": [[{"source": i} for i in ids]]}
+
+    def get(self, ids=None, include=None, limit=None, offset=0):
+        selected = ids if ids is not None else list(CHUNKS)[offset:offset + limit]
+        return {"ids": selected, "documents": [CHUNKS[i] for i in selected], "metadatas": [{"source": i} for i in selected]}
+
+
+class TestHybridSearch(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        retrieval._indexes.clear()
+        self.addCleanup(retrieval._indexes.clear)
+        settings_overrides = {
+            "bm25_path": directory.name, "candidates": 2, "rerank_enabled": False, "hybrid_enabled": True,
+            "rebuild_in_background": False,
+        }
+        for name, value in settings_overrides.items():
+            patcher = patch.object(retrieval.settings.retrieval, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch('src.app.core.retrieval.get_collection_revision', return_value=0)
+        self.get_revision = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lexical_hits_missed_by_vectors_are_fused_in(self):
+        collection = FakeCollection(["c2", "c1"])
+        results = retrieval.hybrid_search(collection, "docs", "RYGB vs SG", [0.1], n_results=2)
+
+        self.assertIn("c3", results["ids"])
+        self.assertEqual(len(results["ids"]), 2)
+        position = results["ids"].index("c3")
+        self.assertEqual(results["documents"][position], CHUNKS["c3"])
+        self.assertEqual(results["metadatas"][position], {"source": "c3"})
+
+    def test_index_is_rebuilt_when_collection_changes(self):
+        collection = FakeCollection(["c1"])
+        index = retrieval.get_bm25_index("docs", collection)
+        self.assertEqual(len(index), 3)
+        self.assertIs(retrieval.get_bm25_index("docs", collection), index)
+
+        retrieval._indexes["docs"].lengths.pop("c1")
+        self.assertEqual(len(retrieval.get_bm25_index("docs", collection)), 3)
+
+    def test_index_is_rebuilt_when_revision_changes_with_the_same_count(self):
+        collection = FakeCollection(["c1"])
+        index = retrieval.get_bm25_index("docs", collection)
+
+        self.get_revision.return_value = 1
+        rebuilt = retrieval.get_bm25_index("docs", collection)
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.revision, 1)
+
+        # O índice gravado em disco carrega a revisão e é reaproveitado sem reconstrução.
+        retrieval._indexes.clear()
+        collection.get = None
+        self.assertEqual(retrieval.get_bm25_index("docs", collection).revision, 1)
+
+    def test_index_is_saved_outside_the_global_lock(self):
+        locked_during_save = []
+        save = retrieval.BM25Index.save
+
+        def checked_save(index, path):
+            locked_during_save.append(retrieval._lock.locked())
+            save(index, path)
+
+        with patch.object(retrieval.BM25Index, "save", checked_save):
+            retrieval.get_bm25_index("docs", FakeCollection(["c1"]))
+            retrieval.save_bm25_index("docs")
+
+        self.assertEqual(locked_during_save, [False, False])
+
+    def test_chunks_without_text_are_indexed_without_terms(self):
+        collection = FakeCollection(["c1"])
+        collection.get = lambda **kwargs: {"ids": ["c1", "c2"], "documents": ["bypass gástrico", None]}
+        collection.count = lambda: 2
+
+        index = retrieval.get_bm25_index("docs", collection)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual([chunk_id for chunk_id, _ in index.search("bypass")], ["c1"])
+
+    def test_background_rebuild_runs_once_and_falls_back_to_vectors(self):
+        release = threading.Event()
+        pages = []
+        collection = FakeCollection(["c2", "c1"])
+        get_page = collection.get
+
+        def slow_get(**kwargs):
+            if kwargs.get("ids") is None:
+                pages.append(kwargs["offset"])
+                release.wait(5)
+            return get_page(**kwargs)
+
+        collection.get = slow_get
+        with patch.object(retrieval.settings.retrieval, "rebuild_in_background", True):
+            first = retrieval.hybrid_search(collection, "docs", "RYGB vs SG", [0.1], n_results=2)
+            self.assertIsNone(retrieval.get_bm25_index("docs", collection))
+            rebuild = retrieval._rebuilds["docs"]
+            release.set()
+            rebuild.join(5)
+
+        self.assertEqual(first["ids"], ["c2", "c1"])
+        self.assertEqual(pages, [0])
+        self.assertEqual(len(retrieval._indexes["docs"]), 3)
+
+    def test_rerank_reorders_candidates(self):
+        cross_encoder = MagicMock()
+        cross_encoder.predict.side_effect = lambda pairs: [1.0 if "adolescentes" in text else 0.0 for _, text in pairs]
+        collection = FakeCollection(["c1", "c2", "c3"])
+        with patch.object(retrieval.settings.retrieval, "rerank_enabled", True), \
+                patch.object(retrieval.settings.retrieval, "candidates", 3), \
+                patch.object(retrieval.settings.retrieval, "rerank_candidates", 3), \
+                patch('src.app.core.retrieval.get_cross_encoder', return_value=cross_encoder):
+            results = retrieval.hybrid_search(collection, "docs", "bypass", [0.1], n_results=1)
+
+        self.assertEqual(results["ids"], ["c3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
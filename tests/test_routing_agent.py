@@ -0,0 +1,83 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.app.agents import routing_agent
+from src.app.agents.routing_agent import KeywordRouter, RoutingAgent
+from src.app.tools.brave_search import BRAVE_KEYWORDS
+from src.app.tools.pubmed_search import PUBMED_KEYWORDS
+
+TOOLS = [
+    {"name": "brave_search", "description": "Busca geral.", "keywords": BRAVE_KEYWORDS},
+    {"name": "pubmed_search", "description": "Busca biomédica.", "keywords": PUBMED_KEYWORDS},
+]
+
+
+class TestKeywordRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = KeywordRouter(TOOLS)
+
+    def test_biomedical_query_goes_to_pubmed(self):
+        tool, confidence = self.router.classify("Ensaios clínicos randomizados sobre sleeve vs bypass gástrico")
+        self.assertEqual(tool, "pubmed_search")
+        self.assertEqual(confidence, 1.0)
+
+    def test_news_query_goes_to_brave(self):
+        tool, _ = self.router.classify("Últimas notícias sobre o preço de medicamentos hoje")
+        self.assertEqual(tool, "brave_search")
+
+    def test_year_in_query_goes_to_brave(self):
+        self.assertEqual(self.router.classify("Diretrizes publicadas em 2031"), ("brave_search", 1.0))
+
+    def test_unknown_query_has_no_confidence(self):
+        self.assertEqual(self.router.classify("What is the capital of France"), (None, 0.0))
+
+
+@patch('src.app.agents.routing_agent.llm_provider')
+class TestRoutingAgent(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        RoutingAgent._decisions = None
+        test_settings = SimpleNamespace(models=SimpleNamespace(routing_agent="routing-model"), routing=routing_agent.settings.routing)
+        patcher = patch.object(routing_agent, "settings", test_settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_confident_queries_skip_the_llm(self, mock_llm_provider):
+        model = MagicMock()
+        model.generate_content_async = AsyncMock()
+        mock_llm_provider.get_model.return_value = model
+        agent = RoutingAgent(TOOLS)
+
+        tool = await agent.choose_tool("Meta-análise de ensaios clínicos sobre cirurgia bariátrica")
+
+        self.assertEqual(tool, "pubmed_search")
+        model.generate_content_async.assert_not_awaited()
+
+    async def test_ambiguous_queries_escalate_once_then_hit_cache(self, mock_llm_provider):
+        model = MagicMock()
+        model.generate_content_async = AsyncMock(return_value=MagicMock(text="brave_search\n"))
+        mock_llm_provider.get_model.return_value = model
+        agent = RoutingAgent(TOOLS)
+
+        first = await agent.choose_tool("What is the capital of France")
+        second = await agent.choose_tool("  what is the CAPITAL of france ")
+
+        self.assertEqual((first, second), ("brave_search", "brave_search"))
+        model.generate_content_async.assert_awaited_once()
+        self.assertEqual(agent.stats["cache"], 1)
+
+    async def test_unknown_llm_answer_is_not_cached(self, mock_llm_provider):
+        model = MagicMock()
+        model.generate_content_async = AsyncMock(return_value=MagicMock(text="A ferramenta ideal é brave_search"))
+        mock_llm_provider.get_model.return_value = model
+        agent = RoutingAgent(TOOLS)
+
+        first = await agent.choose_tool("What is the capital of France")
+        second = await agent.choose_tool("What is the capital of France")
+
+        self.assertEqual((first, second), ("default_search", "default_search"))
+        self.assertEqual(model.generate_content_async.await_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from src.app.core.cache import SQLiteCache
+from src.app.tools.search_cache import SearchCache
+
+
+class TestSearchCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = SQLiteCache(os.path.join(self.tmpdir.name, "search.sqlite"), max_entries=10)
+        self.cache = SearchCache(self.store, ttl_seconds={"brave": 60, "pubmed": 3600}, default_ttl_seconds=60, stale_seconds=60)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    async def test_fresh_entry_is_served_for_normalised_query(self):
+        search = AsyncMock(return_value=[{"title": "A"}])
+        await self.cache.fetch("brave", "Bariatric  Surgery", 5, search)
+        result = await self.cache.fetch("brave", " bariatric surgery ", 5, search)
+
+        self.assertEqual(result, [{"title": "A"}])
+        self.assertEqual(search.await_count, 1)
+
+    async def test_key_includes_provider_and_count(self):
+        search = AsyncMock(return_value=[{"title": "A"}])
+        await self.cache.fetch("brave", "obesity", 5, search)
+        await self.cache.fetch("brave", "obesity", 10, search)
+        await self.cache.fetch("pubmed", "obesity", 5, search)
+
+        self.assertEqual(search.await_count, 3)
+
+    async def test_stale_entry_is_served_and_refreshed(self):
+        await self.cache.fetch("brave", "obesity", 5, AsyncMock(return_value=[{"title": "old"}]))
+        refresh = AsyncMock(return_value=[{"title": "new"}])
+
+        with patch("time.time", return_value=self._stored_at() + 90):
+            result = await self.cache.fetch("brave", "obesity", 5, refresh)
+            self.assertEqual(result, [{"title": "old"}])
+            for task in list(self.cache._background):
+                await task
+
+        refresh.assert_awaited_once()
+        self.assertEqual(await self.cache.fetch("brave", "obesity", 5, AsyncMock()), [{"title": "new"}])
+
+    async def test_expired_entry_is_fetched_again(self):
+        await self.cache.fetch("brave", "obesity", 5, AsyncMock(return_value=[{"title": "old"}]))
+        search = AsyncMock(return_value=[{"title": "new"}])
+
+        with patch("time.time", return_value=self._stored_at() + 600):
+            result = await self.cache.fetch("brave", "obesity", 5, search)
+
+        self.assertEqual(result, [{"title": "new"}])
+
+    async def test_errors_are_not_cached(self):
+        search = AsyncMock(return_value={"error": "timeout"})
+        await self.cache.fetch("brave", "obesity", 5, search)
+        await self.cache.fetch("brave", "obesity", 5, search)
+
+        self.assertEqual(search.await_count, 2)
+
+    def _stored_at(self):
+        (created_at,) = self.store._conn.execute("SELECT created_at FROM cache_entries").fetchone()
+        return created_at
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import asyncio
+import unittest
+
+from src.app.tools import search_rate_limiter
+# A curadoria importa o decorador pelo pacote `app`; o limitador de busca precisa ver a mesma ContextVar.
+from app.core.rate_limiting import Priority, with_priority
+
+
+class TestSearchRateLimiterPriority(unittest.IsolatedAsyncioTestCase):
+    async def test_background_priority_set_by_curation_reaches_the_search_limiter(self):
+        limiter = search_rate_limiter.PriorityRateLimiter(600, capacity=1)
+        await limiter.acquire()  # Esgota o balde para que a próxima chamada fique na fila.
+        searches = search_rate_limiter.SearchRateLimiter(
+            {"pubmed": limiter}, max_retries=0, default_retry_after_seconds=1
+        )
+
+        @with_priority(Priority.BACKGROUND)
+        async def curate():
+            return await searches.run("pubmed", lambda: asyncio.sleep(0, result="ok"))
+
+        task = asyncio.ensure_future(curate())
+        await asyncio.sleep(0)
+        self.assertEqual([priority for priority, _ in limiter._waiters], [Priority.BACKGROUND])
+        self.assertEqual(await task, "ok")
+
+
+if __name__ == '__main__':
+    unittest.main()
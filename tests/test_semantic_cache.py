@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+
+from src.app.core.semantic_cache import SemanticAnswerCache
+
+
+class TestSemanticAnswerCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SemanticAnswerCache(similarity_threshold=0.9, max_entries=2)
+        self.cache.sync_version(10)
+
+    def test_similar_question_with_same_sources_hits(self):
+        self.cache.store([1.0, 0.0], "padrao", ["c1", "c2"], "resposta")
+        self.assertEqual(self.cache.lookup([0.98, 0.05], "padrao", ["c2", "c1"]), "resposta")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_dissimilar_question_misses(self):
+        self.cache.store([1.0, 0.0], "padrao", ["c1"], "resposta")
+        self.assertIsNone(self.cache.lookup([0.0, 1.0], "padrao", ["c1"]))
+
+    def test_changed_sources_or_detail_level_miss(self):
+        self.cache.store([1.0, 0.0], "padrao", ["c1"], "resposta")
+        self.assertIsNone(self.cache.lookup([1.0, 0.0], "padrao", ["c1", "c3"]))
+        self.assertIsNone(self.cache.lookup([1.0, 0.0], "detalhado", ["c1"]))
+
+    def test_collection_change_clears_cache(self):
+        self.cache.store([1.0, 0.0], "padrao", ["c1"], "resposta")
+        self.cache.sync_version(10)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.sync_version(11)
+        self.assertIsNone(self.cache.lookup([1.0, 0.0], "padrao", ["c1"]))
+
+    def test_oldest_entries_are_evicted(self):
+        for index in range(3):
+            self.cache.store([1.0, float(index)], "padrao", [f"c{index}"], index)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.lookup([1.0, 0.0], "padrao", ["c0"]))
+
+    def test_expired_entries_are_ignored(self):
+        cache = SemanticAnswerCache(similarity_threshold=0.9, ttl_seconds=60)
+        with patch('src.app.core.semantic_cache.time.monotonic', return_value=0.0):
+            cache.store([1.0, 0.0], "padrao", ["c1"], "resposta")
+        with patch('src.app.core.semantic_cache.time.monotonic', return_value=61.0):
+            self.assertIsNone(cache.lookup([1.0, 0.0], "padrao", ["c1"]))
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
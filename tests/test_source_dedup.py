@@ -0,0 +1,85 @@
+import unittest
+from types import SimpleNamespace
+
+from src.app.core.source_dedup import (
+    SourceDeduplicator,
+    canonical_key,
+    canonicalize_url,
+    deduplicate,
+    extract_doi,
+    extract_pmid,
+)
+
+
+def _item(source_identifier, content="", question="q1"):
+    return SimpleNamespace(source_identifier=source_identifier, content=content, questions=[question])
+
+
+class TestCanonicalization(unittest.TestCase):
+    def test_canonicalize_url(self):
+        self.assertEqual(
+            canonicalize_url("HTTPS://www.Example.com:443/a//b/?utm_source=x&b=2&a=1#section"),
+            "https://example.com/a/b?a=1&b=2",
+        )
+        self.assertEqual(canonicalize_url("http://example.com"), "http://example.com/")
+
+    def test_extract_pmid(self):
+        self.assertEqual(extract_pmid("https://pubmed.ncbi.nlm.nih.gov/31000001/"), "31000001")
+        self.assertEqual(extract_pmid("https://www.ncbi.nlm.nih.gov/pubmed/123"), "123")
+        self.assertEqual(extract_pmid("Ver PMID: 456 para detalhes"), "456")
+        self.assertIsNone(extract_pmid("https://example.com/article/789"))
+
+    def test_extract_doi(self):
+        self.assertEqual(extract_doi("https://doi.org/10.1007/S11695-019-00001-1."), "10.1007/s11695-019-00001-1")
+
+    def test_canonical_key_prefers_pmid_then_doi(self):
+        self.assertEqual(canonical_key("https://pubmed.ncbi.nlm.nih.gov/31000001/?from=search"), "pmid:31000001")
+        self.assertEqual(canonical_key("https://link.springer.com/10.1007/s11695-019-00001-1"), "doi:10.1007/s11695-019-00001-1")
+
+
+class TestSourceDeduplicator(unittest.TestCase):
+    def test_merges_duplicates_and_keeps_questions(self):
+        items = [
+            _item("https://pubmed.ncbi.nlm.nih.gov/1/", "short", "q1"),
+            _item("https://example.com/page?utm_campaign=a", "page", "q1"),
+            _item("https://www.ncbi.nlm.nih.gov/pubmed/1", "longer abstract", "q2"),
+            _item("https://example.com/page/", "page", "q3"),
+        ]
+        unique = deduplicate(items)
+
+        self.assertEqual(len(unique), 2)
+        self.assertEqual(unique[0].source_identifier, "https://pubmed.ncbi.nlm.nih.gov/1/")
+        self.assertEqual(unique[0].questions, ["q1", "q2"])
+        self.assertEqual(unique[0].content, "longer abstract")
+        self.assertEqual(unique[1].source_identifier, "https://example.com/page")
+        self.assertEqual(unique[1].questions, ["q1", "q3"])
+
+    def test_pmid_cited_in_content_does_not_merge_sources(self):
+        items = [
+            _item("https://pubmed.ncbi.nlm.nih.gov/123/", "abstract", "q1"),
+            _item("https://news.example.com/obesidade", "Estudo (PMID: 123) mostra...", "q2"),
+        ]
+        self.assertEqual(len(deduplicate(items)), 2)
+
+    def test_add_returns_none_for_duplicates(self):
+        deduplicator = SourceDeduplicator()
+        self.assertIsNotNone(deduplicator.add(_item("https://example.com/a")))
+        self.assertIsNone(deduplicator.add(_item("https://EXAMPLE.com/a#top")))
+        self.assertEqual(deduplicator.duplicates, 1)
+
+    def test_near_duplicates_with_minhash(self):
+        text = " ".join(f"palavra{i}" for i in range(120))
+        near = text.replace("palavra60", "outra")
+        different = " ".join(f"termo{i}" for i in range(120))
+        deduplicator = SourceDeduplicator(near_duplicates=True, similarity_threshold=0.8, min_content_chars=50)
+
+        deduplicator.add(_item("https://a.com/1", text, "q1"))
+        deduplicator.add(_item("https://b.com/2", near, "q2"))
+        deduplicator.add(_item("https://c.com/3", different, "q3"))
+
+        self.assertEqual([item.source_identifier for item in deduplicator.items], ["https://a.com/1", "https://c.com/3"])
+        self.assertEqual(deduplicator.items[0].questions, ["q1", "q2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.app.core import vector_db
+
+
+@patch('src.app.core.vector_db.chromadb')
+@patch('src.app.core.vector_db.embedding_functions')
+class TestVectorDBFacade(unittest.TestCase):
+    def setUp(self):
+        vector_db.reset_vector_db()
+        for patcher in (
+            patch.object(vector_db.settings.embedding_cache, 'enabled', False),
+            patch.object(vector_db.settings.database.chroma, 'client', 'persistent'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        vector_db.reset_vector_db()
+
+    def test_embedding_model_loaded_once(self, mock_embedding_functions, mock_chromadb):
+        first = vector_db.get_embedding_function("model-a")
+        second = vector_db.get_embedding_function("model-a")
+        self.assertIs(first, second)
+        mock_embedding_functions.SentenceTransformerEmbeddingFunction.assert_called_once_with(model_name="model-a")
+
+    def test_client_and_collection_reused_across_calls(self, mock_embedding_functions, mock_chromadb):
+        mock_chromadb.PersistentClient.return_value.get_collection.return_value.metadata = {}
+        vector_db.add_documents("docs", ["text"], [{}], ["1"])
+        vector_db.search_documents("docs", ["query"])
+        vector_db.search_documents("docs", ["query"])
+
+        mock_chromadb.PersistentClient.assert_called_once()
+        mock_chromadb.PersistentClient.return_value.get_or_create_collection.assert_called_once()
+        mock_embedding_functions.SentenceTransformerEmbeddingFunction.assert_called_once()
+
+    def test_http_client_selected_by_settings(self, mock_embedding_functions, mock_chromadb):
+        with patch.object(vector_db.settings.database.chroma, 'client', 'http'):
+            first = vector_db.get_collection("docs")
+            second = vector_db.get_collection("docs")
+
+        self.assertIs(first, second)
+        mock_chromadb.HttpClient.assert_called_once_with(
+            host=vector_db.settings.database.chroma.host, port=vector_db.settings.database.chroma.port
+        )
+        mock_chromadb.PersistentClient.assert_not_called()
+
+    def test_collection_revision_is_bumped_in_metadata(self, mock_embedding_functions, mock_chromadb):
+        stored = MagicMock(metadata={"hnsw:space": "cosine", "owner": "provida"})
+        mock_chromadb.PersistentClient.return_value.get_collection.return_value = stored
+
+        self.assertEqual(vector_db.get_collection_revision("docs"), 0)
+        self.assertEqual(vector_db.bump_collection_revision("docs"), 1)
+        stored.modify.assert_called_once_with(metadata={"owner": "provida", vector_db.REVISION_KEY: 1})
+
+    def test_concurrent_first_use_loads_model_once(self, mock_embedding_functions, mock_chromadb):
+        mock_embedding_functions.SentenceTransformerEmbeddingFunction.side_effect = lambda model_name: MagicMock()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(vector_db.get_embedding_function("model-b"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(result) for result in results}), 1)
+        mock_embedding_functions.SentenceTransformerEmbeddingFunction.assert_called_once()
+
+    def test_embedding_cache_wraps_model_when_enabled(self, mock_embedding_functions, mock_chromadb):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(vector_db.settings.embedding_cache, 'enabled', True), \
+                patch.object(vector_db.settings.embedding_cache, 'path', directory):
+            embedding_function = vector_db.get_embedding_function("model-d")
+            query_function = vector_db.get_embedding_function("model-d", cached=False)
+            vector_db.reset_vector_db()
+        self.assertIsInstance(embedding_function, vector_db.CachedEmbeddingFunction)
+        self.assertIs(query_function, mock_embedding_functions.SentenceTransformerEmbeddingFunction.return_value)
+        mock_embedding_functions.SentenceTransformerEmbeddingFunction.assert_called_once()
+
+    def test_warm_up_runs_one_embedding(self, mock_embedding_functions, mock_chromadb):
+        vector_db.warm_up("model-c")
+        mock_embedding_functions.SentenceTransformerEmbeddingFunction.return_value.assert_called_once_with(["warm-up"])
+
+
+if __name__ == '__main__':
+    unittest.main()